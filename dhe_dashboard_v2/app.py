@@ -47,6 +47,9 @@ except Exception:
 # Core Imports
 from core.data_loader import load_data, prepare_crm_data, load_holidays
 from core.bellis_loader import load_bellis_data, load_sehirler_data
+from core.customer_analytics import build_customer_analytics
+from core.query import enable_copy_on_write
+from core.memo import memoize_view
 
 # View Imports
 from views import (
@@ -78,6 +81,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Copy-on-Write: görünümlerin paket tablolarından aldığı dilimler yazılana kadar veri paylaşır
+enable_copy_on_write()
+
 # =============================================================================
 # SAYFA KONFİGÜRASYONU
 # =============================================================================
@@ -141,6 +147,7 @@ def main():
 
     # Veri Yükleme
     # Not: Progress callback kullanmıyoruz - Streamlit rerun'da closure sorunu yaratıyordu
+    # load_data arka plan yenileyicinin son paketini döndürür; spinner sadece ilk açılışta görünür
     with st.spinner("Veriler yükleniyor..."):
         try:
             data_packet = load_data(_progress_callback=None)
@@ -235,17 +242,22 @@ def main():
             landing_page.render_landing_page(df_teklif, df_siparis, df_musteri, df_all_quotes, data_packet=data_packet)
             
         elif page == "SERVİS PERFORMANSI":
-            integrated_dashboard.render_integrated_dashboard(df_teklif, df_siparis, df_all_quotes)
+            integrated_dashboard.render_integrated_dashboard(df_teklif, df_siparis, df_all_quotes, data_packet=data_packet)
             
         elif page == "MÜŞTERİ YÖNETİMİ":
             df_urun = data_packet.get("urun", pd.DataFrame())
             customers.render_musteri(df_musteri, df_all_quotes, df_urun)
             
         elif page == "CRM ANALİZİ":
-            df_crm = data_packet.get("crm", pd.DataFrame())
-            if df_crm.empty and not df_siparis.empty:
-                df_crm = prepare_crm_data(df_teklif, df_siparis, df_musteri)
-            crm.render_crm_page(df_crm, df_teklif, df_siparis)
+            df_analiz = data_packet.get("musteri_analiz")
+            if df_analiz is None:  # Analitik tablosu olmayan eski snapshot (paket sürümü başına bir kez)
+                def build_analiz():
+                    df_crm = data_packet.get("crm", pd.DataFrame())
+                    if df_crm.empty and not df_siparis.empty:
+                        df_crm = prepare_crm_data(df_teklif, df_siparis, df_musteri)
+                    return build_customer_analytics(df_crm, df_all_quotes, df_siparis)
+                df_analiz = memoize_view(data_packet, "crm_analiz", (), build_analiz)
+            crm.render_crm_page(df_analiz, df_teklif, df_siparis, data_packet=data_packet)
             
         elif page == "SAHA EKİBİ":
             field_ops.render_saha(holidays=data_packet.get("holidays"), data_packet=data_packet)
@@ -0,0 +1,228 @@
+"""
+DHE Dashboard - Veri Hattı Benchmark'ı
+======================================
+load_data hattını aşama aşama, farklı veri hacimlerinde ölçer ve sonuçları
+JSON olarak kaydeder. Veri core.synthetic ile seed'li üretilir (ağ erişimi yok);
+"fetch" aşaması bellek içi handle'dan okuma + sekme eşleme maliyetidir.
+
+Kullanım (dhe_dashboard_v2 dizininden):
+    python -m benchmarks.bench_pipeline --scales 1 10 --repeat 3
+    python -m benchmarks.bench_pipeline --scales 1 --compare benchmarks/results/onceki.json
+
+Aşamalar:
+    fetch              DHE_Data toplu okuma (+ sekme şemaları) + Servis Programı yıl sekmeleri
+    kurlar             parse_kurlar
+    finance_dataframe  process_finance_dataframe (teklif + sipariş)
+    latest_revisions   filter_latest_revisions (tüm teklifler)
+    crm                prepare_crm_data
+    saha_cleanup       clean_saha (birleştirme, tarih, teknisyen adları)
+    saha_status        determine_saha_status_series (vektörize durum)
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from config.constants import PERSONEL_MAP
+from core.data_sources import SyntheticSource
+from core.gsheets import batch_read_gsheets, fetch_sheet_data
+from core.data_loader import DHE_TASKS, SAHA_YEARS, GOOGLE_SHEETS_NAME, SAHA_SHEETS_NAME, parse_kurlar, clean_saha
+from core.schema import enforce_schema
+from core.transforms import process_finance_dataframe, filter_latest_revisions, prepare_crm_data, determine_saha_status_series
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+STAGES = ["fetch", "kurlar", "finance_dataframe", "latest_revisions", "crm", "saha_cleanup", "saha_status"]
+
+
+def _time_stage(func: Callable, repeat: int):
+    """func'ı repeat kez çalıştırır; (son sonuç, süreler) döndürür."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def _summary(timings: List[float], rows: int) -> Dict[str, float]:
+    best = min(timings)
+    return {
+        "rows": rows,
+        "min_s": round(best, 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.fmean(timings), 6),
+        "rows_per_s": round(rows / best, 1) if best > 0 else None,
+    }
+
+
+def _read_saha(spreadsheet) -> List[pd.DataFrame]:
+    """Servis Programı yıl sekmelerini tam okur (başlık 2. satırda)."""
+    frames = []
+    for year in SAHA_YEARS:
+        data = fetch_sheet_data(spreadsheet, year)
+        if len(data) > 2:
+            frames.append(pd.DataFrame(data[2:], columns=data[1]))
+    return frames
+
+
+def run_scale(scale: float, repeat: int = 3, seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """Tek bir veri hacmi için tüm aşamaları ölçer."""
+    source = SyntheticSource(seed=seed, scale=scale)
+    spreadsheet_dhe = source.open(GOOGLE_SHEETS_NAME)
+    spreadsheet_saha = source.open(SAHA_SHEETS_NAME)
+    stages = {}
+
+    def fetch():
+        tabs = batch_read_gsheets(spreadsheet_dhe, DHE_TASKS)
+        return {key: enforce_schema(df, key) for key, df in tabs.items()}, _read_saha(spreadsheet_saha)
+    (tabs, saha_dfs), t = _time_stage(fetch, repeat)
+    stages["fetch"] = _summary(t, sum(len(df) for df in tabs.values()) + sum(len(df) for df in saha_dfs))
+
+    rates, t = _time_stage(lambda: parse_kurlar(tabs["kurlar"]), repeat)
+    stages["kurlar"] = _summary(t, len(tabs["kurlar"]))
+
+    def finance():
+        teklif = process_finance_dataframe(tabs["teklif"].copy(), "Teklif_No", rates, PERSONEL_MAP)
+        siparis = process_finance_dataframe(tabs["siparis"].copy(), "Siparis_No", rates, PERSONEL_MAP)
+        return teklif, siparis
+    (df_teklif, df_siparis), t = _time_stage(finance, repeat)
+    stages["finance_dataframe"] = _summary(t, len(tabs["teklif"]) + len(tabs["siparis"]))
+
+    _, t = _time_stage(lambda: filter_latest_revisions(df_teklif, "Teklif_No"), repeat)
+    stages["latest_revisions"] = _summary(t, len(df_teklif))
+
+    # process_finance ile aynı girdiler
+    df_siparis = df_siparis.copy()
+    df_siparis["Teklif_No"] = df_siparis["Siparis_No"]
+    df_musteri = tabs["musteri"].copy()
+    df_musteri["Sorumlu_Clean"] = df_musteri["Sorumlu"].astype(str).str.strip().str.upper()
+    _, t = _time_stage(lambda: prepare_crm_data(df_teklif, df_siparis, df_musteri), repeat)
+    stages["crm"] = _summary(t, len(df_teklif) + len(df_siparis))
+
+    df_saha, t = _time_stage(lambda: clean_saha(saha_dfs), repeat)
+    stages["saha_cleanup"] = _summary(t, sum(len(df) for df in saha_dfs))
+
+    _, t = _time_stage(lambda: determine_saha_status_series(df_saha), repeat)
+    stages["saha_status"] = _summary(t, len(df_saha))
+
+    return stages
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(scales: Sequence[float] = (1, 10), repeat: int = 3, seed: int = 42) -> dict:
+    """Tüm hacimler için ölçüm yapar; JSON'a yazılabilir sonuç döndürür."""
+    results = {}
+    for scale in scales:
+        logger.info(f"[Bench] scale={scale} ölçülüyor...")
+        results[str(scale)] = run_scale(scale, repeat=repeat, seed=seed)
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def save_results(report: dict, path: Optional[str] = None) -> str:
+    """Sonucu JSON olarak kaydeder (varsayılan: benchmarks/results/bench_<zaman>_<git>.json)."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"bench_{stamp}_{report['meta'].get('git') or 'local'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.2) -> List[dict]:
+    """
+    İki rapordaki ortak hacim/aşamaları karşılaştırır (min süre oranı).
+    ratio > threshold olan satırlar regression olarak işaretlenir.
+    """
+    rows = []
+    for scale, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(scale, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if not base or not base.get("min_s"):
+                continue
+            ratio = stats["min_s"] / base["min_s"]
+            rows.append({
+                "scale": scale, "stage": stage,
+                "baseline_s": base["min_s"], "current_s": stats["min_s"],
+                "ratio": round(ratio, 3), "regression": ratio > threshold,
+            })
+    return rows
+
+
+def _print_report(report: dict):
+    for scale, stages in report["results"].items():
+        print(f"\nscale={scale}")
+        for stage in STAGES:
+            s = stages.get(stage)
+            if s:
+                print(f"  {stage:<18} {s['rows']:>9} satır  min {s['min_s'] * 1000:>9.1f} ms  median {s['median_s'] * 1000:>9.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DHE veri hattı benchmark'ı")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10], help="Veri hacmi çarpanları")
+    parser.add_argument("--repeat", type=int, default=3, help="Aşama başına tekrar sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="JSON çıktı yolu")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki JSON sonucu")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Regression eşiği (süre oranı)")
+    args = parser.parse_args(argv)
+
+    # Yükleyici logları ölçüm çıktısını boğmasın
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    report = run_benchmarks(args.scales, repeat=args.repeat, seed=args.seed)
+    _print_report(report)
+    print(f"\nKaydedildi: {save_results(report, args.out)}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report, args.threshold)
+        print("\nKarşılaştırma (current / baseline):")
+        for row in rows:
+            flag = "  << REGRESSION" if row["regression"] else ""
+            print(f"  scale={row['scale']:<6} {row['stage']:<18} x{row['ratio']:.2f}{flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+DHE Dashboard - Revizyon Filtresi Benchmark'ı
+=============================================
+filter_latest_revisions'ın vektörize halini önceki (apply + sort + drop_duplicates)
+uygulamasıyla karşılaştırır. Önceki uygulama burada referans olarak tutulur
+(parite testleri de bunu kullanır).
+
+Kullanım (dhe_dashboard_v2 dizininden):
+    python -m benchmarks.bench_revisions --scales 10 40 --repeat 3
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from typing import List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from core.synthetic import generate_workbooks, DHE_FILE_NAME
+from core.transforms import filter_latest_revisions
+
+
+def legacy_filter_latest_revisions(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd.DataFrame:
+    """Önceki satır bazlı uygulama (referans)."""
+    if df.empty or col_name not in df.columns:
+        return df
+
+    df_temp = df.copy()
+    df_temp["_temp_no"] = df_temp[col_name].astype(str).str.strip().str.upper()
+
+    def parse_revision(val):
+        if not val:
+            return (val, -1)
+        match = re.search(r'^(.*?)[\s\-]*(?:R|REV)(\d+)$', val)
+        if match:
+            root = match.group(1).strip()
+            rev = int(match.group(2))
+            if not root:
+                return (val, 0)
+            return (root, rev)
+        return (val, 0)
+
+    parsed_data = df_temp["_temp_no"].apply(parse_revision)
+    df_temp["_root_no"] = [x[0] for x in parsed_data]
+    df_temp["_rev_no"] = [x[1] for x in parsed_data]
+    df_temp = df_temp.sort_values(by=["_root_no", "_rev_no"], ascending=[True, False])
+    df_filtered = df_temp.drop_duplicates(subset=["_root_no"], keep="first")
+    df_filtered = df_filtered.drop(columns=["_temp_no", "_root_no", "_rev_no"])
+    return df.loc[df_filtered.index].copy()
+
+
+def quotes_frame(scale: float, seed: int = 42) -> pd.DataFrame:
+    """Sentetik teklif sekmesini (ham metin) DataFrame olarak döndürür."""
+    grid = generate_workbooks(seed=seed, scale=scale)[DHE_FILE_NAME]["teklif"]
+    return pd.DataFrame(grid[1:], columns=grid[0]).rename(columns={"Teklif No": "Teklif_No"})
+
+
+def _best(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="filter_latest_revisions benchmark'ı")
+    parser.add_argument("--scales", type=float, nargs="+", default=[10, 40])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for scale in args.scales:
+        df = quotes_frame(scale)
+        legacy = _best(lambda: legacy_filter_latest_revisions(df), args.repeat)
+        current = _best(lambda: filter_latest_revisions(df), args.repeat)
+        same = legacy_filter_latest_revisions(df).equals(filter_latest_revisions(df))
+        print(f"scale={scale:<6} {len(df):>9} teklif  önceki {legacy * 1000:>8.1f} ms  "
+              f"vektörize {current * 1000:>8.1f} ms  x{legacy / current:.1f}  aynı sonuç: {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ import pandas as pd
 from components.cards import premium_card, render_kpi_card
 from components.charts import render_chartjs
 from components.layout import spacer, section_title
+from core.query import query
 
 def render_summary_tab(df_musteri, theme="light"):
     """Müşteri Portföy Özeti Tab'ı"""
@@ -39,9 +40,9 @@ def render_summary_tab(df_musteri, theme="light"):
     # Personel Müşteri Dağılımı Grafiği
     section_title("PERSONEL MÜŞTERİ DAĞILIMI", margin_top="2rem")
     
-    df_chart = df_musteri[df_musteri["Sorumlu_Clean"] != "BOŞ / SAHİPSİZ"].copy()
+    df_chart = df_musteri[df_musteri["Sorumlu_Clean"] != "BOŞ / SAHİPSİZ"]
     
-    pers_dist = df_chart.groupby("Sorumlu_Clean")["Kisa_Ad"].count().reset_index()
+    pers_dist = df_chart.groupby("Sorumlu_Clean", observed=True)["Kisa_Ad"].count().reset_index()
     pers_dist.columns = ["Sorumlu", "Musteri_Sayisi"]
     pers_dist = pers_dist.sort_values("Musteri_Sayisi", ascending=True)
     
@@ -134,13 +135,8 @@ def render_details_tab(df_musteri, theme="light"):
             key="portfoy_personel_sec"
         )
     
-    # Seçime göre filtreleme
-    if secilen_personel == "TÜMÜ":
-        df_filtered = df_musteri.copy()
-    elif secilen_personel == "BOŞ / SAHİPSİZ":
-        df_filtered = df_musteri[df_musteri["Sorumlu_Clean"] == "BOŞ / SAHİPSİZ"].copy()
-    else:
-        df_filtered = df_musteri[df_musteri["Sorumlu_Clean"] == secilen_personel].copy()
+    # Seçime göre filtreleme ("TÜMÜ" -> paket tablosunun kendisi, kopya yok)
+    df_filtered = query(df_musteri, {"Sorumlu_Clean": secilen_personel})
     
     # Arama kutuları
     spacer(16)
@@ -167,25 +163,20 @@ def render_details_tab(df_musteri, theme="light"):
         uzun_ad_arama = st.text_input("Firma Ünvanı Ara", placeholder="Ara...", label_visibility="collapsed", key="uzun_ad_arama")
     
     # Arama filtreleri
-    from core.utils import tr_upper
+    from core.utils import tr_upper, tr_upper_series
     
     if kisa_ad_arama:
-        # Vektörize değil apply kullanıyoruz çünkü tr_upper özel map gerektirir
-        # Ancak performans için str.upper() çok daha hızlıdır.
-        # Yine de doğruluk için apply(tr_upper) şart.
-        # Büyük veri setlerinde performans düşebilir ama müşteri sayısı sınırlı.
-        
         # Arama terimini çevir
         term = tr_upper(kisa_ad_arama)
         
-        # Kolon üzerinde arama
+        # Kolon üzerinde arama (Türkçe uyumlu vektörize büyük harf)
         # Not: Kaynak veri mixed case ise önce çevirmeliyiz
-        mask = df_filtered["Kisa_Ad"].astype(str).apply(tr_upper).str.contains(term, na=False)
+        mask = tr_upper_series(df_filtered["Kisa_Ad"]).str.contains(term, na=False)
         df_filtered = df_filtered[mask]
     
     if uzun_ad_arama:
         term_uzun = tr_upper(uzun_ad_arama)
-        mask_uzun = df_filtered["Uzun_Ad"].astype(str).apply(tr_upper).str.contains(term_uzun, na=False)
+        mask_uzun = tr_upper_series(df_filtered["Uzun_Ad"]).str.contains(term_uzun, na=False)
         df_filtered = df_filtered[mask_uzun]
     
     kayit_sayisi = len(df_filtered)
@@ -202,7 +193,7 @@ def render_details_tab(df_musteri, theme="light"):
     
     if kayit_sayisi > 0:
         if secilen_personel == "TÜMÜ":
-            df_display = df_filtered[["Kisa_Ad", "Uzun_Ad", "Sorumlu_Clean"]].copy()
+            df_display = df_filtered[["Kisa_Ad", "Uzun_Ad", "Sorumlu_Clean"]]
             st.dataframe(
                 df_display,
                 column_config={
@@ -213,7 +204,7 @@ def render_details_tab(df_musteri, theme="light"):
                 height=500, width="stretch", hide_index=True
             )
         else:
-            df_display = df_filtered[["Kisa_Ad", "Uzun_Ad"]].copy()
+            df_display = df_filtered[["Kisa_Ad", "Uzun_Ad"]]
             st.dataframe(
                 df_display,
                 column_config={
@@ -263,10 +254,7 @@ def render_orphaned_analysis_tab(df_musteri, df_all_quotes, bos_musteriler):
                 spacer(12)
                 
                 if selected_years:
-                    df_base = df_all_quotes[
-                        (df_all_quotes["Yil"].isin(selected_years)) & 
-                        (df_all_quotes["Musteri"].isin(sahipsiz_musteriler))
-                    ].copy()
+                    df_base = query(df_all_quotes, {"Yil": selected_years, "Musteri": sahipsiz_musteriler})
                     
                     if not df_base.empty:
                         mevcut_personeller = sorted(df_base["Personel_Adi"].dropna().unique().tolist())
@@ -287,18 +275,11 @@ def render_orphaned_analysis_tab(df_musteri, df_all_quotes, bos_musteriler):
             
             with col_table:
                 if selected_years:
-                    df_base = df_all_quotes[
-                        (df_all_quotes["Yil"].isin(selected_years)) & 
-                        (df_all_quotes["Musteri"].isin(sahipsiz_musteriler))
-                    ].copy()
-                    
-                    if selected_personnel_val != "TÜMÜ":
-                        df_orphan_quotes = df_base[df_base["Personel_Adi"] == selected_personnel_val].copy()
-                    else:
-                        df_orphan_quotes = df_base.copy()
+                    # df_base filtre sütununda aynı yıllar için süzüldü; personel seçimi maske olarak eklenir
+                    df_orphan_quotes = query(df_base, {"Personel_Adi": selected_personnel_val})
                     
                     if not df_orphan_quotes.empty:
-                        df_grouped = df_orphan_quotes.groupby("Musteri").agg(
+                        df_grouped = df_orphan_quotes.groupby("Musteri", observed=True).agg(
                             Teklif_Adedi=("Teklif_No", "nunique"),
                             Son_Tarih=("Tarih", "max"),
                             Personeller=("Personel_Adi", lambda x: ", ".join(sorted(list(set(x.dropna())))))
@@ -365,7 +346,7 @@ def render_products_tab(df_urun):
         spacer(24)
         # st.markdown("---") # Removed
         
-        df_musteri_cihaz = df_urun.groupby("Musteri").agg(
+        df_musteri_cihaz = df_urun.groupby("Musteri", observed=True).agg(
             Cihaz_Sayisi=("Seri_No", "count"),
             Ilk_Tarih=("Tarih", "min"),
             Son_Tarih=("Tarih", "max")
@@ -394,11 +375,9 @@ def render_products_tab(df_urun):
         with col_detay:
             if selected_firm:
                 section_title(f"{selected_firm} — CİHAZ LİSTESİ", margin_top="0", show_border=False)
-                df_cihazlar = df_urun[df_urun["Musteri"] == selected_firm].copy()
+                df_cihazlar = query(df_urun, {"Musteri": selected_firm})
                 if not df_cihazlar.empty:
-                    # Tarih sütunu string gelebilir, datetime'a çevir
-                    df_cihazlar["Tarih"] = pd.to_datetime(df_cihazlar["Tarih"], dayfirst=True, errors='coerce')
-                    df_cihazlar["Tarih_Str"] = df_cihazlar["Tarih"].dt.strftime("%d.%m.%Y").fillna("-")
+                    df_cihazlar = df_cihazlar.assign(Tarih_Str=df_cihazlar["Tarih"].dt.strftime("%d.%m.%Y").fillna("-"))
                     st.dataframe(
                         df_cihazlar[["Seri_No", "Cihaz_No", "Tarih_Str"]],
                         column_config={
@@ -1,29 +1,13 @@
-
 import streamlit as st
 import pandas as pd
 from config.constants import AY_KISA
 from components.layout import  section_title
 from components.charts import render_chartjs
+from core.sales_cube import monthly_totals
+from core.memo import memoize_view
 
-def render_yearly_performance_chart(df_siparis, all_available_years, conversion_factor=1.0, sym="€"):
-    """Yıllık Satış Performansı Grafiğini Render Eder."""
-    
-    # Başlık
-    section_title("YILLIK SATIŞ PERFORMANSI", margin_top="2rem", show_border=False)
-    
-    st.markdown('''
-    <div style="font-size: 0.9rem; color: var(--text-secondary); margin-bottom: 0.5rem;">Yılları açmak/kapatmak için yılların üzerine tıklayın</div>
-    ''', unsafe_allow_html=True)
-    
-    # Metrik seçici (sağ tarafa hizalı)
-    _, col_spacer, col_metric = st.columns([4, 1, 1])
-    with col_metric:
-        selected_metric = st.radio("METRİK", ["Ciro", "Kar"], index=1, horizontal=True, key="chart_metric_selector", label_visibility="collapsed")
-    
-    # Seçilen metriğe göre veri sütunu
-    data_column = "Tutar_EUR" if selected_metric == "Ciro" else "Kar_EUR"
-    
-    theme = st.session_state.get("theme", "light")
+def _yearly_chart_payload(cube, all_available_years, data_column, conversion_factor, theme):
+    """Yıllık grafik veri + seçenekleri (line_data, line_options); veri yoksa None."""
     tick_color = "#9CA3AF" if theme == "dark" else "#4B5563"
     grid_color = "rgba(255, 255, 255, 0.05)" if theme == "dark" else "rgba(0, 0, 0, 0.05)"
 
@@ -41,12 +25,14 @@ def render_yearly_performance_chart(df_siparis, all_available_years, conversion_
     chart_labels = [AY_KISA.get(m, str(m)) for m in all_months]
     default_visible_years = [2024, 2025, 2026]
     
+    # Yil x Ay tablosu tek seferde (yıl başına yeniden gruplama yok)
+    monthly = monthly_totals(cube, "siparis", data_column).reindex(
+        index=sorted(all_available_years), columns=all_months, fill_value=0)
+    
     for idx, year in enumerate(sorted(all_available_years)):
         color_set = year_colors[idx % len(year_colors)]
         
-        df_year = df_siparis[df_siparis["Yil"] == year].copy()
-        year_monthly = df_year.groupby("Ay")[data_column].sum()
-        year_values = [(year_monthly.get(m, 0) * conversion_factor) for m in all_months]
+        year_values = [(value * conversion_factor) for value in monthly.loc[year].tolist()]
         
         if sum(year_values) == 0:
             continue
@@ -66,42 +52,76 @@ def render_yearly_performance_chart(df_siparis, all_available_years, conversion_
             "hidden": is_hidden
         })
     
-    if datasets:
-        line_data = {"labels": chart_labels, "datasets": datasets}
-        line_options = {
-            "maintainAspectRatio": False,
-            "plugins": {
-                "legend": {
-                    "display": True,
-                    "position": "top",
-                    "labels": {
-                        "color": tick_color,
-                        "usePointStyle": True,
-                        "padding": 20,
-                        "font": {"family": "'Inter', 'Roboto', sans-serif", "size": 12}
-                    }
-                },
-                "tooltip": {
-                    "backgroundColor": "#1F2937" if theme == "dark" else "#FFFFFF",
-                    "titleColor": "#F9FAFB" if theme == "dark" else "#111827",
-                    "bodyColor": "#F9FAFB" if theme == "dark" else "#6B7280",
-                    "borderColor": "rgba(255,255,255,0.1)" if theme == "dark" else "#E5E7EB",
-                    "borderWidth": 1,
-                    "padding": 10
+    if not datasets:
+        return None
+    
+    line_data = {"labels": chart_labels, "datasets": datasets}
+    line_options = {
+        "maintainAspectRatio": False,
+        "plugins": {
+            "legend": {
+                "display": True,
+                "position": "top",
+                "labels": {
+                    "color": tick_color,
+                    "usePointStyle": True,
+                    "padding": 20,
+                    "font": {"family": "'Inter', 'Roboto', sans-serif", "size": 12}
                 }
             },
-            "scales": {
-                "x": {
-                    "ticks": {"color": tick_color, "font": {"family": "'Inter', 'Roboto', sans-serif"}},
-                    "grid": {"color": grid_color}
-                },
-                "y": {
-                    "ticks": {"color": tick_color, "font": {"family": "'Inter', 'Roboto', sans-serif"}},
-                    "grid": {"color": grid_color},
-                    "beginAtZero": True
-                }
+            "tooltip": {
+                "backgroundColor": "#1F2937" if theme == "dark" else "#FFFFFF",
+                "titleColor": "#F9FAFB" if theme == "dark" else "#111827",
+                "bodyColor": "#F9FAFB" if theme == "dark" else "#6B7280",
+                "borderColor": "rgba(255,255,255,0.1)" if theme == "dark" else "#E5E7EB",
+                "borderWidth": 1,
+                "padding": 10
+            }
+        },
+        "scales": {
+            "x": {
+                "ticks": {"color": tick_color, "font": {"family": "'Inter', 'Roboto', sans-serif"}},
+                "grid": {"color": grid_color}
+            },
+            "y": {
+                "ticks": {"color": tick_color, "font": {"family": "'Inter', 'Roboto', sans-serif"}},
+                "grid": {"color": grid_color},
+                "beginAtZero": True
             }
         }
+    }
+    return line_data, line_options
+
+def render_yearly_performance_chart(cube, all_available_years, conversion_factor=1.0, sym="€", data_packet=None):
+    """
+    Yıllık Satış Performansı Grafiğini Render Eder.
+    cube: Satış küpü (core.sales_cube); aylık toplamlar tüm geçmişe göre net siparişlerden okunur.
+    Grafik verisi (metrik, yıllar, kur, tema) anahtarıyla önbellekten gelir; metrik geçişleri yeniden hesaplamaz.
+    """
+    
+    # Başlık
+    section_title("YILLIK SATIŞ PERFORMANSI", margin_top="2rem", show_border=False)
+    
+    st.markdown('''
+    <div style="font-size: 0.9rem; color: var(--text-secondary); margin-bottom: 0.5rem;">Yılları açmak/kapatmak için yılların üzerine tıklayın</div>
+    ''', unsafe_allow_html=True)
+    
+    # Metrik seçici (sağ tarafa hizalı)
+    _, col_spacer, col_metric = st.columns([4, 1, 1])
+    with col_metric:
+        selected_metric = st.radio("METRİK", ["Ciro", "Kar"], index=1, horizontal=True, key="chart_metric_selector", label_visibility="collapsed")
+    
+    # Seçilen metriğe göre veri sütunu
+    data_column = "Tutar_EUR" if selected_metric == "Ciro" else "Kar_EUR"
+    
+    theme = st.session_state.get("theme", "light")
+    
+    payload = memoize_view(
+        data_packet, "servis_trend", (data_column, tuple(all_available_years), conversion_factor, theme),
+        lambda: _yearly_chart_payload(cube, all_available_years, data_column, conversion_factor, theme))
+    
+    if payload is not None:
+        line_data, line_options = payload
         render_chartjs("line", line_data, line_options, height=350, currency_symbol=sym)
     else:
         st.info("Trend verisi yok.")
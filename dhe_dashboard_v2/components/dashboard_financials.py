@@ -1,26 +1,28 @@
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 from components.layout import spacer, section_title
 from components.cards import render_kpi_card, render_perf_card, render_conversion_card
 from config.constants import PERSONEL_MAP
 from core.utils import calculate_delta
 
-def render_financial_summary_tab(df_sip_filtered, df_tek_filtered, selected_years, selected_period, sym, conversion_factor, previous_values=None, df_all_filtered=None):
-    """Finansal Özet Tab'ını render eder."""
+def render_financial_summary_tab(siparis_totals, teklif_totals, personel_perf, sym, conversion_factor, previous_values=None):
+    """
+    Finansal Özet Tab'ını render eder.
+    siparis_totals / teklif_totals: core.sales_cube.period_totals (sipariş / tüm teklifler)
+    personel_perf: core.sales_cube.personnel_totals (sipariş, Personel_Adi indeksli)
+    """
     
     spacer(10)
     
     # 1. KPI KARTLARI
-    total_ciro = df_sip_filtered["Tutar_EUR"].sum()
-    total_kar = df_sip_filtered["Kar_EUR"].sum()
-    total_siparis = len(df_sip_filtered)
+    total_ciro = siparis_totals["Tutar_EUR"]
+    total_kar = siparis_totals["Kar_EUR"]
+    total_siparis = siparis_totals["Adet"]
     
-    # Use all quotes (open + ordered) if available, otherwise fallback to open quotes
-    if df_all_filtered is not None:
-        total_teklif = len(df_all_filtered)
-    else:
-        total_teklif = len(df_tek_filtered)
+    # Tüm teklifler (açık + siparişe dönen)
+    total_teklif = teklif_totals["Adet"]
     
     def format_curr(val):
         converted = val * conversion_factor
@@ -73,10 +75,9 @@ def render_financial_summary_tab(df_sip_filtered, df_tek_filtered, selected_year
     # 2. PERSONEL PERFORMANSI (AVATAR & PROGRESS)
     section_title("PERSONEL PERFORMANSI", margin_top="2.5rem", show_border=False)
     
-    perf = df_sip_filtered.groupby("Personel_Adi")[["Tutar_EUR", "Kar_EUR"]].sum()
-    perf = perf.sort_values("Tutar_EUR", ascending=False).reset_index()
+    all_personel_perf = personel_perf[["Tutar_EUR", "Kar_EUR"]].sort_values("Tutar_EUR", ascending=False).reset_index()
     aktif_personel_isimleri = list(set(PERSONEL_MAP.values()))
-    perf = perf[perf["Personel_Adi"].isin(aktif_personel_isimleri)] 
+    perf = all_personel_perf[all_personel_perf["Personel_Adi"].isin(aktif_personel_isimleri)] 
     
     if not perf.empty:
         max_val = perf["Tutar_EUR"].max()
@@ -104,10 +105,7 @@ def render_financial_summary_tab(df_sip_filtered, df_tek_filtered, selected_year
     # Not: Eski çalışanlar için tüm dataya ihtiyaç var mı? Hayır, filtrelenmiş data yeterli.
     # Ancak filtrelenmiş data içinde 'eski çalışan' varsa gösterir.
     
-    all_personel_perf = df_sip_filtered.groupby("Personel_Adi")[["Tutar_EUR", "Kar_EUR"]].sum()
-    all_personel_perf = all_personel_perf.sort_values("Tutar_EUR", ascending=False).reset_index()
-    
-    eski_calisanlar = all_personel_perf[~all_personel_perf["Personel_Adi"].isin(aktif_personel_isimleri)].copy()
+    eski_calisanlar = all_personel_perf[~all_personel_perf["Personel_Adi"].isin(aktif_personel_isimleri)]
     
     eski_calisanlar = eski_calisanlar[
         (eski_calisanlar["Tutar_EUR"] > 0) & 
@@ -138,23 +136,20 @@ def render_financial_summary_tab(df_sip_filtered, df_tek_filtered, selected_year
                              progress_pct
                          ), unsafe_allow_html=True)
 
-def render_conversion_analysis_tab(df_sip_filtered, df_tek_filtered, filter_label, df_all_filtered=None):
-    """Teklif/Sipariş Analizi Tab'ını render eder."""
+def render_conversion_analysis_tab(siparis_totals, teklif_totals, siparis_perf, teklif_perf, filter_label):
+    """
+    Teklif/Sipariş Analizi Tab'ını render eder.
+    Toplamlar ve personel tabloları core.sales_cube dilimleridir (period_totals / personnel_totals).
+    """
     
     spacer(10)
     
     # Özet KPI Satırı
     # section_title("GENEL BAKIŞ", margin_top="0.5rem") - REMOVED per request
     
-    teklif_donem = len(df_tek_filtered)
-    siparis_donem = len(df_sip_filtered)
-    
-    if df_all_filtered is not None:
-        toplam_teklif = len(df_all_filtered)
-    else:
-        toplam_teklif = teklif_donem + siparis_donem
-    
-    musteri_siparis = df_sip_filtered["Musteri"].nunique() if not df_sip_filtered.empty else 0
+    siparis_donem = siparis_totals["Adet"]
+    toplam_teklif = teklif_totals["Adet"]
+    musteri_siparis = siparis_totals["Musteri"]
     overall_conversion = (siparis_donem / toplam_teklif * 100) if toplam_teklif > 0 else 0
     
     k1, k2, k3, k4 = st.columns(4)
@@ -170,25 +165,11 @@ def render_conversion_analysis_tab(df_sip_filtered, df_tek_filtered, filter_labe
     # Personel Bazlı
     section_title("PERSONEL PERFORMANSI", margin_top="3rem", show_border=False)
     
-    # 1. Toplam Teklif Sayısı (Tüm Teklifler üzerinden)
-    if df_all_filtered is not None and not df_all_filtered.empty:
-        teklif_per_personel = df_all_filtered.groupby("Personel_Adi").agg(
-            Teklif_Sayisi=("Teklif_No", "count"), 
-            Teklif_Musteri=("Musteri", "nunique")
-        ).reset_index()
-
-    else:
-        # Fallback: df_all_filtered yoksa boş dön, RISKLI TOPLAMA MANTIGINI KALDIRIYORUZ
-        teklif_per_personel = pd.DataFrame(columns=["Personel_Adi", "Teklif_Sayisi", "Teklif_Musteri"])
-    
-    # 2. Sipariş Sayısı
-    if not df_sip_filtered.empty:
-        siparis_per_personel = df_sip_filtered.groupby("Personel_Adi").agg(
-            Siparis_Sayisi=("Siparis_No", "count"), 
-            Siparis_Musteri=("Musteri", "nunique")
-        ).reset_index()
-    else:
-        siparis_per_personel = pd.DataFrame(columns=["Personel_Adi", "Siparis_Sayisi", "Siparis_Musteri"])
+    # 1. Toplam Teklif Sayısı (Tüm Teklifler) / 2. Sipariş Sayısı - personel bazlı küp dilimleri
+    teklif_per_personel = teklif_perf[["Adet", "Musteri"]].rename(
+        columns={"Adet": "Teklif_Sayisi", "Musteri": "Teklif_Musteri"}).reset_index()
+    siparis_per_personel = siparis_perf[["Adet", "Musteri"]].rename(
+        columns={"Adet": "Siparis_Sayisi", "Musteri": "Siparis_Musteri"}).reset_index()
     
     # 3. Birleştirme
     perf_df = pd.merge(teklif_per_personel, siparis_per_personel, on="Personel_Adi", how="outer").fillna(0)
@@ -197,12 +178,14 @@ def render_conversion_analysis_tab(df_sip_filtered, df_tek_filtered, filter_labe
     # if "Acik_Teklif_Sayisi" in perf_df.columns:
     #     perf_df["Teklif_Sayisi"] = perf_df["Acik_Teklif_Sayisi"] + perf_df["Siparis_Sayisi"]
     
-    perf_df["Donusum_Orani"] = perf_df.apply(lambda r: (r["Siparis_Sayisi"] / r["Teklif_Sayisi"] * 100) if r["Teklif_Sayisi"] > 0 else 0, axis=1)
+    teklif_sayisi = perf_df["Teklif_Sayisi"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        perf_df["Donusum_Orani"] = np.where(teklif_sayisi > 0, perf_df["Siparis_Sayisi"].to_numpy(dtype=float) / teklif_sayisi * 100, 0.0)
     perf_df["Musteri_Sayisi"] = perf_df[["Teklif_Musteri", "Siparis_Musteri"]].max(axis=1)
     
     # Aktif Personel Filtresi
     aktif_personel_isimleri = list(set(PERSONEL_MAP.values()))
-    perf_df_aktif = perf_df[perf_df["Personel_Adi"].isin(aktif_personel_isimleri)].copy()
+    perf_df_aktif = perf_df[perf_df["Personel_Adi"].isin(aktif_personel_isimleri)]
     perf_df_aktif = perf_df_aktif[perf_df_aktif["Teklif_Sayisi"] > 0].sort_values("Donusum_Orani", ascending=False).reset_index(drop=True)
     
     if not perf_df_aktif.empty:
@@ -224,7 +207,7 @@ def render_conversion_analysis_tab(df_sip_filtered, df_tek_filtered, filter_labe
         st.info("Bu kriterlere uygun personel verisi bulunamadı.")
 
     # --- ESKİ ÇALIŞANLAR BÖLÜMÜ ---
-    perf_df_eski = perf_df[~perf_df["Personel_Adi"].isin(aktif_personel_isimleri)].copy()
+    perf_df_eski = perf_df[~perf_df["Personel_Adi"].isin(aktif_personel_isimleri)]
     
     # Filtreleme: Teklifi olan ve ismi geçerli olanlar
     perf_df_eski = perf_df_eski[
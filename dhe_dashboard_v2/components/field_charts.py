@@ -4,14 +4,15 @@ import streamlit as st
 from collections import Counter
 from components.charts import render_chartjs, get_themed_chart_options
 from config.constants import AY_MAP, COLORS
+from core.field_facts import monthly_technician_days
 
-def render_field_charts(df_monthly: pd.DataFrame, df_cities: pd.DataFrame, year: int, selected_person: str = "Tümü", allowed_personnel: list = None):
+def render_field_charts(df_facts_year: pd.DataFrame, year: int, month: int = None, selected_person: str = "Tümü", allowed_personnel: list = None):
     """
     Saha operasyonları için grafik setini render eder.
     Args:
-        df_monthly: Aylık dağılım grafiği için
-        df_cities: Şehir analizi için
+        df_facts_year: Seçili yılın teknisyen-gün olguları (core.field_facts)
         year: Seçili yıl
+        month: Şehir analizi için seçili ay (None ise tüm yıl)
         selected_person: Seçili teknisyen ismi (veya "Tümü")
         allowed_personnel: Sadece bu listedeki kişilerin günlerini say (None ise hepsini say)
     """
@@ -26,37 +27,19 @@ def render_field_charts(df_monthly: pd.DataFrame, df_cities: pd.DataFrame, year:
     with col1:
         st.markdown(f"**{year} Yılı Aylık Servis Günü Dağılımı**", unsafe_allow_html=True)
         
-        if df_monthly.empty or 'Ay' not in df_monthly.columns:
+        # Teknisyen filtresi: saha ekibi + (varsa) seçili kişi. Her olgu satırı tek teknisyene ait
+        # olduğundan seçili kişinin yanındaki ekip arkadaşı ayrıca sayılmaz.
+        df_team = df_facts_year
+        if allowed_personnel:
+            df_team = df_team[df_team['Teknisyen'].isin(allowed_personnel)]
+        if selected_person and selected_person != "Tümü":
+            df_team = df_team[df_team['Teknisyen'] == selected_person]
+        
+        if df_facts_year.empty or 'Ay' not in df_facts_year.columns:
             st.info("Veri bulunamadı.")
         else:
-            # Sadece AKTİF kayıtları ve Tarih verisi olanları baz al
-            df_active = df_monthly[df_monthly['Durum'] == 'AKTİF'].copy() if 'Durum' in df_monthly.columns else df_monthly.copy()
-            
-            # Aylara göre "Adam-Gün" sayısını hesapla
-            if 'Tarih' in df_active.columns and not df_active.empty:
-                # 1. Teknisyen 1 için veriler
-                t1_data = df_active[['Ay', 'Tarih', 'Teknisyen 1']].rename(columns={'Teknisyen 1': 'Teknisyen'})
-                
-                # 2. Teknisyen 2 için veriler (varsa)
-                combined = t1_data
-                if 'Teknisyen 2' in df_active.columns:
-                    t2_data = df_active[['Ay', 'Tarih', 'Teknisyen 2']].rename(columns={'Teknisyen 2': 'Teknisyen'})
-                    t2_data = t2_data[t2_data['Teknisyen'].notna() & (t2_data['Teknisyen'] != '')]
-                    combined = pd.concat([t1_data, t2_data], ignore_index=True)
-                
-                # PERSONEL LİSTESİ FİLTRESİ (Saha Ekibi Kontrolü)
-                if allowed_personnel:
-                    combined = combined[combined['Teknisyen'].isin(allowed_personnel)]
-
-                # KRİTİK DÜZELTME: Eğer tek bir kişi seçildiyse, SADECE onun günlerini saymalıyız.
-                # Aksi takdirde yanındaki kişiyi de sayar (Örn: Enes seçiliyken, Enes+Ali işini 2 gün sayar).
-                if selected_person and selected_person != "Tümü":
-                    combined = combined[combined['Teknisyen'] == selected_person]
-
-                # Her teknisyen-ay kombinasyonu için benzersiz tarih sayısını bul
-                monthly_counts = combined.groupby(['Ay', 'Teknisyen'])['Tarih'].nunique().groupby('Ay').sum().sort_index()
-            else:
-                monthly_counts = pd.Series()
+            # Aylara göre "Adam-Gün" sayısı (teknisyen-ay başına benzersiz tarih)
+            monthly_counts = monthly_technician_days(df_team)
             
             # Tüm ayları (1-12) doldur
             labels = []
@@ -84,13 +67,26 @@ def render_field_charts(df_monthly: pd.DataFrame, df_cities: pd.DataFrame, year:
     with col2:
         st.markdown(f"**En Çok Gidilen Şehirler**", unsafe_allow_html=True)
         
+        # "Tümü": saha ekibinin her teknisyeninin gittiği yer ayrı sayılır (Adam-Şehir)
+        # Tek kişi: sadece o kişinin işleri
+        if selected_person and selected_person != "Tümü":
+            df_cities = df_facts_year[df_facts_year['Teknisyen'] == selected_person]
+        elif allowed_personnel:
+            df_cities = df_facts_year[df_facts_year['Teknisyen'].isin(allowed_personnel)]
+        else:
+            df_cities = df_facts_year
+        
         if df_cities.empty or 'Şehir' not in df_cities.columns:
             st.info("Şehir verisi bulunamadı.")
         else:
-            # Şehirleri temizle ve say
-            cities_raw = df_cities['Şehir'].dropna().astype(str).tolist()
+            # Seçili dönemin AKTİF işleri
+            df_cities = df_cities[df_cities['Durum'] == 'AKTİF']
+            if month is not None:
+                df_cities = df_cities[df_cities['Ay'] == month]
+            
             # Basit temizlik (boşlukları al, büyük harf)
-            cities = [c.strip().upper() for c in cities_raw if c.strip() != '']
+            cities = df_cities['Şehir'].dropna().astype(str).str.strip().str.upper()
+            cities = cities[cities != ''].tolist()
             
             if not cities:
                 st.info("Şehir verisi mevcut değil.")
@@ -6,18 +6,19 @@ from components.cards import render_kpi_card
 from components.layout import spacer, section_title
 from config.constants import FIELD_TECHNICIANS
 
-def render_daily_tracking(df_raw, df_personel, all_technicians):
-    """Günlük takip bölümünü (KPI Kartları + 3'lü Tablo) render eder."""
+def render_daily_tracking(df_facts, df_personel, all_technicians):
+    """
+    Günlük takip bölümünü (KPI Kartları + 3'lü Tablo) render eder.
+    df_facts: teknisyen-gün olgu tablosu (core.field_facts); Rol 1 = Teknisyen 1.
+    """
     
     today = datetime.now().date()
     
-    if 'Tarih' in df_raw.columns:
-        df_bugun = df_raw[df_raw['Tarih'].dt.date == today].copy()
+    if 'Tarih' in df_facts.columns:
+        df_bugun = df_facts[df_facts['Tarih'] == pd.Timestamp(today)]
     else:
         df_bugun = pd.DataFrame()
     
-
-    
     if df_bugun.empty:
         # Bugün için veri yoksa, herkes atölyede varsayımı (veya veri girilmemiş)
         # Ancak burada mantık biraz karışık, orijinal koddaki mantığı koruyalım:
@@ -28,25 +29,21 @@ def render_daily_tracking(df_raw, df_personel, all_technicians):
         izinli_set = set()
         atolye_set = all_technicians.copy()
     else:
-        # Sahada: Aktif olan satırlardaki Teknisyen 1 + Teknisyen 2
-        df_aktif_bugun = df_bugun[df_bugun['Durum'] == 'AKTİF'].copy()
-        sahada_tek1 = set(df_aktif_bugun['Teknisyen 1'].dropna().str.strip().str.upper().unique()) if 'Teknisyen 1' in df_aktif_bugun.columns else set()
-        sahada_tek2 = set(df_aktif_bugun['Teknisyen 2'].dropna().str.strip().str.upper().unique()) if 'Teknisyen 2' in df_aktif_bugun.columns else set()
-        sahada_tek2 = {t for t in sahada_tek2 if t != ''}
-        sahada_toplam = sahada_tek1.union(sahada_tek2)
+        # Sahada: Aktif olan satırlardaki Teknisyen 1 + Teknisyen 2 (adlar yüklemede normalize edildi)
+        durum = df_bugun['Durum']
+        birinci = df_bugun['Rol'] == 1
+        df_aktif_bugun = df_bugun[durum == 'AKTİF']
+        sahada_toplam = set(df_aktif_bugun['Teknisyen'].astype(str))
         
-        # İzinli
-        df_izinli_bugun = df_bugun[df_bugun['Durum'] == 'İZİNLİ'].copy()
-        izinli_tek1 = set(df_izinli_bugun['Teknisyen 1'].dropna().str.strip().str.upper().unique()) if 'Teknisyen 1' in df_izinli_bugun.columns else set()
-        izinli_set = izinli_tek1
+        # İzinli (sadece Teknisyen 1)
+        izinli_set = set(df_bugun[(durum == 'İZİNLİ') & birinci]['Teknisyen'].astype(str))
         
         # Hesaplanan Atölye
         excelde_gorulenler = sahada_toplam.union(izinli_set)
         atolye_set = all_technicians - excelde_gorulenler
         
-        # Manuel Atölye
-        df_atolye_bugun = df_bugun[df_bugun['Durum'] == 'ATÖLYE'].copy()
-        atolye_excel = set(df_atolye_bugun['Teknisyen 1'].dropna().str.strip().str.upper().unique()) if 'Teknisyen 1' in df_atolye_bugun.columns else set()
+        # Manuel Atölye (sadece Teknisyen 1)
+        atolye_excel = set(df_bugun[(durum == 'ATÖLYE') & birinci]['Teknisyen'].astype(str))
         atolye_set = atolye_set.union(atolye_excel)
         
         bugun_sahada = len(sahada_toplam)
@@ -65,17 +62,16 @@ def render_daily_tracking(df_raw, df_personel, all_technicians):
     spacer(25)
     
     # === YAN YANA TABLOLAR ===
-    # Teknik Ofis Tespiti
-    teknik_ofis_set = set()
+    # Bugünkü aktif kayıtlar (kayıt sırasıyla T1, T2) -> Teknisyen / Firma
+    df_aktif_goster = pd.DataFrame(columns=["Teknisyen", "Firma"])
     if not df_bugun.empty:
-        df_aktif_bugun_temp = df_bugun[df_bugun['Durum'] == 'AKTİF'].copy()
-        for _, row in df_aktif_bugun_temp.iterrows():
-            tek1 = str(row.get('Teknisyen 1', '')).strip().upper()
-            tek2 = str(row.get('Teknisyen 2', '')).strip().upper()
-            if tek1 and tek1 not in all_technicians:
-                teknik_ofis_set.add(tek1)
-            if tek2 and tek2 not in all_technicians:
-                teknik_ofis_set.add(tek2)
+        aktif = df_bugun[df_bugun['Durum'] == 'AKTİF']
+        firma = aktif['Müşteri'].astype(object) if 'Müşteri' in aktif.columns else '-'
+        df_aktif_goster = pd.DataFrame({"Teknisyen": aktif['Teknisyen'].astype(str), "Firma": firma})
+    is_saha = df_aktif_goster["Teknisyen"].isin(list(all_technicians))
+    
+    # Teknik Ofis Tespiti (saha ekibinde olmayıp sahaya çıkanlar)
+    teknik_ofis_set = set(df_aktif_goster.loc[~is_saha, "Teknisyen"])
     
     col_sahada, col_atolye, col_ofis = st.columns(3, gap="medium")
     
@@ -84,21 +80,8 @@ def render_daily_tracking(df_raw, df_personel, all_technicians):
         if df_bugun.empty or sahada_toplam == set():
             st.info("Bugün sahada kimse yok.")
         else:
-            df_aktif_bugun = df_bugun[df_bugun['Durum'] == 'AKTİF'].copy()
-            sahada_list = []
-            for _, row in df_aktif_bugun.iterrows():
-                tek1 = str(row.get('Teknisyen 1', '')).strip()
-                tek1_upper = tek1.upper()
-                musteri = row.get('Müşteri', '-')
-                if tek1 and tek1_upper in all_technicians:
-                    sahada_list.append({"Teknisyen": tek1, "Firma": musteri})
-                tek2 = str(row.get('Teknisyen 2', '')).strip()
-                tek2_upper = tek2.upper()
-                if tek2 and tek2_upper in all_technicians:
-                    sahada_list.append({"Teknisyen": tek2, "Firma": musteri})
-            
-            if sahada_list:
-                df_sahada = pd.DataFrame(sahada_list).drop_duplicates()
+            df_sahada = df_aktif_goster[is_saha].drop_duplicates()
+            if not df_sahada.empty:
                 st.dataframe(df_sahada, width=500, hide_index=True, height=(len(df_sahada) + 1) * 35 + 3)
             else:
                 st.info("Bugün sahada teknisyen yok.")
@@ -127,19 +110,7 @@ def render_daily_tracking(df_raw, df_personel, all_technicians):
     with col_ofis:
         section_title("TEKNİK OFİS", margin_top="1.5rem", show_border=False)
         if teknik_ofis_set:
-            ofis_list = []
-            df_aktif_bugun = df_bugun[df_bugun['Durum'] == 'AKTİF'].copy()
-            for _, row in df_aktif_bugun.iterrows():
-                tek1 = str(row.get('Teknisyen 1', '')).strip()
-                tek2 = str(row.get('Teknisyen 2', '')).strip()
-                musteri = row.get('Müşteri', '-')
-                
-                if tek1.upper() in teknik_ofis_set:
-                    ofis_list.append({"Kişi": tek1, "Firma": musteri})
-                if tek2.upper() in teknik_ofis_set:
-                    ofis_list.append({"Kişi": tek2, "Firma": musteri})
-            
-            df_ofis = pd.DataFrame(ofis_list).drop_duplicates()
+            df_ofis = df_aktif_goster[~is_saha].rename(columns={"Teknisyen": "Kişi"}).drop_duplicates()
             st.dataframe(df_ofis, width=500, hide_index=True, height=(len(df_ofis) + 1) * 35 + 3)
         else:
             st.info("Bugün teknik ofisten sahaya çıkan yok.")
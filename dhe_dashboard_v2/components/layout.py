@@ -3,6 +3,11 @@ from datetime import datetime
 import os
 import pandas as pd
 
+from config.constants import REFRESH_CONFIG
+from core.data_loader import get_data_refresher, load_holidays
+from core.bellis_loader import load_bellis_data, load_sehirler_data
+from core.quota import get_quota_limiter
+
 def render_header():
     tarih = datetime.now().strftime("%d.%m.%Y")
     st.markdown(f"""<div class="main-header">
@@ -16,10 +21,23 @@ def render_sidebar_header():
 
 import textwrap
 
+def _format_duration(seconds) -> str:
+    """Saniyeyi kısa Türkçe süre metnine çevirir (örn: 45 sn, 12 dk, 2 sa)."""
+    if seconds is None:
+        return "-"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} sn"
+    if seconds < 3600:
+        return f"{seconds // 60} dk"
+    return f"{seconds // 3600} sa {(seconds % 3600) // 60} dk"
+
+
 def render_sidebar_footer(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame):
     """
     Renders the sidebar footer with developer options.
     """
+    refresher = get_data_refresher()
     st.sidebar.markdown("<hr style='margin: 0.5rem 0;'>", unsafe_allow_html=True)
     
     # Sabit tema renkleri (her zaman light mode)
@@ -46,13 +64,45 @@ def render_sidebar_footer(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame):
         """, unsafe_allow_html=True)
         
         # Yenile Butonu
+        # Sayfa önbellekleri paket sürümüyle anahtarlı (core.memo); yalnız paket dışı okuyucular temizlenir.
+        # Yeni paket beklenir; süre dolarsa yenileme arka planda sürer ve durum satırında gösterilir.
         if st.button("Verileri Yenile", key="refresh_data_btn_inner", type="primary", width="stretch", help="Google Sheets'ten verileri tekrar çeker"):
-            st.cache_data.clear()
+            with st.spinner("Veriler yenileniyor..."):
+                refreshed = refresher.request_refresh(timeout=REFRESH_CONFIG.get("MANUAL_WAIT_SECONDS", 45))
+            for loader in (load_holidays, load_sehirler_data, load_bellis_data):
+                loader.clear()
+            st.session_state["refresh_pending_version"] = None if refreshed else refresher.version
             st.rerun()
-            
+
+        status = refresher.status()
+        pending_version = st.session_state.get("refresh_pending_version")
+        if pending_version is not None and (status["version"] != pending_version or status["last_error"]):
+            st.session_state["refresh_pending_version"] = pending_version = None
+        if pending_version is not None:
+            refresh_text = "Yenileme sırada, veriler hazır olunca yansıyacak"
+        elif status["background"]:
+            refresh_text = f"Sonraki yenileme: {_format_duration(status['next_refresh_seconds'])}"
+        else:
+            refresh_text = "Manuel Kontrol (Oto-Yenileme Kapalı)"
+        source_text = " (snapshot)" if status["source"] == "snapshot" else ""
+        error_html = ""
+        if status["last_error"]:
+            error_html = '<div style="color: #DC2626;">Son yenileme başarısız</div>'
+
+        st.markdown(f"""
+        <div style="font-size: 0.68rem; color: {muted_color}; text-align: center; margin-top: 0.4rem;">
+            Veri yaşı: {_format_duration(status['age_seconds'])}{source_text}<br>
+            {refresh_text}
+            {error_html}
+        </div>
+        """, unsafe_allow_html=True)
+
+        # API Kota Metrikleri
+        quota = get_quota_limiter().metrics()
         st.markdown(f"""
         <div style="font-size: 0.68rem; color: {muted_color}; text-align: center; margin-top: 0.4rem;">
-            Manuel Kontrol (Oto-Yenileme Kapalı)
+            API: {quota['calls']} çağrı · Bekleme: {quota['wait_seconds']:.1f} sn<br>
+            Kota aşımı: {quota['throttled']} · Reddedilen: {quota['rejected']}
         </div>
         """, unsafe_allow_html=True)
             
@@ -201,3 +201,170 @@ SHEETS_CONFIG = {
 
 # Geriye dönük uyumluluk için alias
 EXCEL_CONFIG = SHEETS_CONFIG
+
+# =============================================================================
+# VERİ SNAPSHOT (SOĞUK BAŞLANGIÇ) AYARLARI
+# =============================================================================
+# İşlenmiş data_packet diske Arrow (IPC) formatında yazılır.
+# Uygulama yeniden başladığında son snapshot memory-map ile anında açılır,
+# Google Sheets'ten güncel veri arka planda çekilir.
+# Her veri kaynağı kendi alt klasörünü kullanır (DIR/<kaynak>/).
+SNAPSHOT_CONFIG = {
+    "ENABLED": True,
+    "DIR": "data/snapshots",   # Proje köküne göre
+    "KEEP_LAST": 3,            # Diskte tutulacak snapshot sayısı
+}
+
+# =============================================================================
+# ARKA PLAN YENİLEME AYARLARI
+# =============================================================================
+# data_packet arka plandaki bir thread tarafından periyodik olarak yeniden oluşturulur.
+# Kullanıcılar her zaman son geçerli paketi okur, istek sırasında veri çekilmez.
+REFRESH_CONFIG = {
+    "ENABLED": True,
+    "INTERVAL_SECONDS": 15 * 60,     # Tam yenileme periyodu
+    "CHANGE_POLL_SECONDS": 60,       # Sheet değişiklik kontrolü (Drive lastUpdateTime)
+    "MANUAL_WAIT_SECONDS": 45,       # "Verileri Yenile": yeni paket için en fazla bekleme
+}
+
+# =============================================================================
+# SERVİS PROGRAMI ÇEKME AYARLARI
+# =============================================================================
+# Geçmiş yıl sekmeleri bir kez çekilip yerel arşive dondurulur (tekrar indirilmez).
+# Yıl, ertesi yılın ilk ARCHIVE_GRACE_MONTHS ayı bitene kadar dondurulmaz (geç girilen
+# Aralık kayıtları); boş okunan sekme arşivlenmez.
+# Arşiv veri kaynağına göre ayrılır (data/archive/<kaynak>/, bkz. DataSource.storage_key).
+# Arşivi yenilemek için ilgili dosyayı data/archive/<kaynak>/ altından silmeniz yeterli.
+# Cari yıl sekmesinde sadece son WINDOW_MONTHS ay + bu ayın satırları yeniden okunur;
+# önceki satırlar son senkronizasyondan alınır. FULL_REFRESH_HOURS'ta bir tam okuma yapılır.
+# Pencere üstündeki sınır satırı veya başlık önbellekle uyuşmazsa sekme hemen tam okunur.
+SAHA_FETCH_CONFIG = {
+    "ARCHIVE_PAST_YEARS": True,
+    "ARCHIVE_DIR": "data/archive",
+    "ARCHIVE_GRACE_MONTHS": 1,
+    "WINDOW_MONTHS": 1,
+    "FULL_REFRESH_HOURS": 24,
+}
+
+# =============================================================================
+# GOOGLE API KOTA AYARLARI
+# =============================================================================
+# Sheets API okuma kotası: kullanıcı başına dakikada 60 istek.
+# Tüm oturumlar ve thread'ler aynı token bucket'ı paylaşır.
+QUOTA_CONFIG = {
+    "REQUESTS_PER_MINUTE": 60,
+    "BURST": 10,                 # Aynı anda harcanabilecek maksimum token
+    "ACQUIRE_TIMEOUT": 120,      # Token için en fazla bekleme (saniye), sonra çağrı reddedilir
+    "MAX_RETRIES": 5,
+    "BACKOFF_BASE": 1.0,         # Üstel bekleme: BASE * 2^deneme (+ jitter)
+    "BACKOFF_MAX": 32.0,
+}
+
+# =============================================================================
+# VERİ KAYNAĞI (BACKEND) AYARLARI
+# =============================================================================
+# "gspread"   : Canlı Google Sheets (varsayılan)
+# "local"     : LOCAL_DIR altındaki CSV/XLSX/Parquet dışa aktarımları (çevrimdışı)
+# "synthetic" : Seed'li sentetik veri üretici (benchmark/test)
+# DHE_DATA_SOURCE ortam değişkeni BACKEND ayarını ezer.
+DATA_SOURCE_CONFIG = {
+    "BACKEND": "gspread",
+    "LOCAL_DIR": "data/local_sheets",
+    "SYNTHETIC_SEED": 42,
+    "SYNTHETIC_SCALE": 1.0,
+}
+
+# =============================================================================
+# VERİ TİPİ (DTYPE) AYARLARI
+# =============================================================================
+# data_packet'teki düşük kardinaliteli metin sütunları yüklemeden sonra pandas
+# Categorical'a çevrilir: her değer bir kez saklanır, ==/isin/groupby/nunique
+# tamsayı kodlar üzerinden çalışır. Snapshot'ta Arrow dictionary olarak yazılır.
+# Benzersiz değer oranı MAX_UNIQUE_RATIO'yu aşan sütunlar metin olarak kalır.
+DTYPE_CONFIG = {
+    "CATEGORICAL_ENABLED": True,
+    "MAX_UNIQUE_RATIO": 0.5,
+    "CATEGORICAL_COLUMNS": {
+        "teklif": ["Para_Birimi", "Personel", "Personel_Kodu", "Personel_Adi", "Musteri", "Durum"],
+        "siparis": ["Para_Birimi", "Personel", "Personel_Kodu", "Personel_Adi", "Musteri", "Durum"],
+        "all_quotes": ["Para_Birimi", "Personel", "Personel_Kodu", "Personel_Adi", "Musteri"],
+        "musteri": ["Sorumlu", "Sorumlu_Clean"],
+        "crm": ["Sorumlu_Clean", "Segment"],
+        "musteri_analiz": ["Sorumlu_Clean", "Segment", "Segment_Etiket"],
+        "satis_kupu": ["Kaynak", "Personel_Adi", "Musteri", "Para_Birimi"],
+        "urun": ["Musteri"],
+        "saha": ["Teknisyen 1", "Teknisyen 2", "Müşteri", "Servis Ürünü", "İşlem", "Şehir", "Sorumlu", "Durum"],
+        "saha_gun": ["Teknisyen", "Durum", "Müşteri", "Şehir", "İşlem", "Islem_Kategori"],
+        "bellis": ["Sehir", "Servisci", "Bolge_Ad"],
+    },
+}
+
+# =============================================================================
+# SEKME ŞEMALARI (DTYPE SÖZLEŞMESİ)
+# =============================================================================
+# Her sekme çekildiği anda (core.schema.enforce_schema) bir kez bu tiplere çevrilir;
+# işleme aşamaları ve görünümler tarih/tutar sütunlarını tekrar ayrıştırmaz.
+# Tipler:
+#   "string"   : Arrow tabanlı metin (değerler olduğu gibi, eksikler NaN)
+#   "date"     : Gün önce tarih (dayfirst, format ilk değerden çıkarılır), hatalı -> NaT
+#   "date_dmy" : Katı GG.AA.YYYY tarih, hatalı -> NaT
+#   "money"    : TR/US para metni -> float (boş -> 0.0)
+#   "int"      : Tamsayı (hatalı/boş -> 0)
+SHEET_SCHEMAS = {
+    "teklif": {
+        "Teklif_No": "string", "Musteri": "string", "Personel": "string", "Tarih": "date_dmy",
+        "Tutar_Ham": "money", "Maliyet_Ham": "money", "Isaret": "string", "Para_Birimi": "string",
+    },
+    "siparis": {
+        "Siparis_No": "string", "Musteri": "string", "Personel": "string", "Tarih": "date_dmy",
+        "Tutar_Ham": "money", "Maliyet_Ham": "money", "Para_Birimi": "string",
+    },
+    "musteri": {"Musteri_No": "string", "Kisa_Ad": "string", "Uzun_Ad": "string", "Sorumlu": "string"},
+    "urun": {"Kayit_No": "string", "Seri_No": "string", "Cihaz_No": "string", "Musteri": "string", "Tarih": "date"},
+    "personel": {"Ad_Soyad": "string", "Departman": "string", "Ise_Giris": "date", "Isten_Cikis": "date"},
+    "tatiller": {"Tarih": "date", "Aciklama": "string"},
+    "sehirler": {"Sehir_Ad": "string", "Bolge_Id": "int", "Bolge_Ad": "string"},
+    "saha": {
+        "Tarih": "date", "Teknisyen 1": "string", "Teknisyen 2": "string", "Müşteri": "string",
+        "Servis Ürünü": "string", "İşlem": "string", "Şehir": "string", "Sorumlu": "string",
+    },
+}
+
+# =============================================================================
+# CRM SKORLAMA AYARLARI
+# =============================================================================
+# Pareto segmentasyonu: teklif hacmine göre sıralı kümülatif pay eşikleri.
+# Riskli: VIP olup son teklifinden bu yana RISK_RECENCY_DAYS günden fazla geçen müşteri.
+CRM_SCORING_CONFIG = {
+    "VIP_SHARE": 0.80,
+    "GOLD_SHARE": 0.95,
+    "RISK_RECENCY_DAYS": 90,
+    "NO_QUOTE_RECENCY_DAYS": 9999,  # Hiç teklifi olmayan müşterinin Recency değeri
+    "INCREMENTAL": True,            # Sadece teklif/siparişi değişen müşterileri yeniden topla
+}
+
+# =============================================================================
+# MÜŞTERİ ANALİTİĞİ (RFM / CLV) AYARLARI
+# =============================================================================
+# Recency grupları: son tekliften bu yana gün sınırları (CRM sekmeleri).
+# CLV: ortalama sipariş tutarı x yıllık sipariş hızı x CLV_YEARS x aktiflik olasılığı;
+# aktiflik olasılığı son işlemden CHURN_DAYS güne kadar doğrusal azalır.
+CUSTOMER_ANALYTICS_CONFIG = {
+    "RFM_BINS": 5,
+    "RECENCY_BUCKETS": [0, 180, 365, 730],
+    "RECENCY_LABELS": ["0-6 AY", "6-12 AY", "12-24 AY", "24+ AY"],
+    "CLV_YEARS": 3,
+    "CHURN_DAYS": 730,
+}
+
+# =============================================================================
+# GÖRÜNÜM ÖNBELLEĞİ (MEMO) AYARLARI
+# =============================================================================
+# Sayfaların filtreye bağlı ara tabloları ve grafik verileri (paket sürümü, sayfa, filtre)
+# anahtarıyla bellekte tutulur (LRU). Yeni paket yayınlanınca eski sürümün kayıtları silinir.
+# MAX_MB toplam tahmini bellek sınırıdır; tek başına sınırı aşan sonuç önbelleğe alınmaz.
+VIEW_MEMO_CONFIG = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 256,
+    "MAX_MB": 256,
+}
@@ -10,10 +10,11 @@ from typing import Dict, Tuple
 import os
 
 # Core Imports
-from config.constants import EXCEL_CONFIG
+from config.constants import EXCEL_CONFIG, DTYPE_CONFIG
 from config.city_coordinates import CITY_COORDINATES
 from core.gsheets import get_gspread_client, open_spreadsheet, safe_read_gsheet
-from core.utils import tr_upper
+from core.utils import tr_upper, tr_upper_series
+from core.schema import to_categorical, enforce_schema
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,27 @@ logger = logging.getLogger(__name__)
 GOOGLE_SHEETS_NAME = "DHE_Data"
 
 
+# Yaygın yazım düzeltmeleri (Türkçe karaktersiz girilen şehirler)
+CITY_NAME_CORRECTIONS = {
+    "KOCAELI": "KOCAELİ",
+    "IZMIR": "İZMİR",
+    "ISTANBUL": "İSTANBUL",
+    "MERSIN": "MERSİN",
+    "ELAZIG": "ELAZIĞ",
+    "OSMANIYE": "OSMANİYE",
+    "RIZE": "RİZE",
+    "DIYARBAKIR": "DİYARBAKIR",
+    "GAZIANTEP": "GAZİANTEP",
+    "SANLIURFA": "ŞANLIURFA",
+    "KAHRAMANMARAS": "KAHRAMANMARAŞ",
+    "TEKIRDAG": "TEKİRDAĞ",
+    "ESKISEHIR": "ESKİŞEHİR",
+    "NEVSEHIR": "NEVŞEHİR",
+    "KIRSEHIR": "KIRŞEHİR",
+    "AFYON": "AFYONKARAHISAR",
+}
+
+
 def normalize_city_name(city: str) -> str:
     """
     Şehir adını normalize eder (büyük harf, Türkçe karakter uyumlu).
@@ -35,27 +57,12 @@ def normalize_city_name(city: str) -> str:
     # Türkçe büyük harfe çevir
     city = tr_upper(city)
     
-    # Bazı yaygın düzeltmeler
-    corrections = {
-        "KOCAELI": "KOCAELİ",
-        "IZMIR": "İZMİR",
-        "ISTANBUL": "İSTANBUL",
-        "MERSIN": "MERSİN",
-        "ELAZIG": "ELAZIĞ",
-        "OSMANIYE": "OSMANİYE",
-        "RIZE": "RİZE",
-        "DIYARBAKIR": "DİYARBAKIR",
-        "GAZIANTEP": "GAZİANTEP",
-        "SANLIURFA": "ŞANLIURFA",
-        "KAHRAMANMARAS": "KAHRAMANMARAŞ",
-        "TEKIRDAG": "TEKİRDAĞ",
-        "ESKISEHIR": "ESKİŞEHİR",
-        "NEVSEHIR": "NEVŞEHİR",
-        "KIRSEHIR": "KIRŞEHİR",
-        "AFYON": "AFYONKARAHISAR",
-    }
-    
-    return corrections.get(city, city)
+    return CITY_NAME_CORRECTIONS.get(city, city)
+
+
+def normalize_city_names(cities: pd.Series) -> pd.Series:
+    """normalize_city_name'in vektörize hali (tüm sütun için)."""
+    return tr_upper_series(cities).str.strip().replace(CITY_NAME_CORRECTIONS)
 
 
 @st.cache_data(show_spinner="Şehir verileri yükleniyor...")
@@ -76,10 +83,9 @@ def load_sehirler_data() -> pd.DataFrame:
         )
         
         if not df.empty:
-            # Şehir adını normalize et
-            df["Sehir_Ad"] = df["Sehir_Ad"].apply(normalize_city_name)
-            # Bölge ID'sini integer yap
-            df["Bolge_Id"] = pd.to_numeric(df["Bolge_Id"], errors='coerce').fillna(0).astype(int)
+            # Şema tipleri (Bolge_Id -> int) + şehir adı normalizasyonu
+            df = enforce_schema(df, "sehirler")
+            df["Sehir_Ad"] = normalize_city_names(df["Sehir_Ad"])
             
             logger.info(f"[GSheets] sehirler: {len(df)} satır")
         
@@ -132,7 +138,7 @@ def load_bellis_data() -> pd.DataFrame:
         df = df.dropna(subset=["Musteri", "Sehir"], how="all")
         
         # Şehir normalizasyonu
-        df["Sehir"] = df["Sehir"].apply(normalize_city_name)
+        df["Sehir"] = normalize_city_names(df["Sehir"])
         
         # Servisci normalizasyonu
         df["Servisci"] = df["Servisci"].fillna("No information").astype(str).str.strip()
@@ -168,12 +174,10 @@ def prepare_bellis_summary(df_bellis: pd.DataFrame, df_sehirler: pd.DataFrame) -
     if not df_sehirler.empty:
         # Gelen veri normalize edilmemiş olabilir (load_data'dan geliyorsa),
         # bu yüzden burada tekrar garantiye alıyoruz.
-        df_sehirler = df_sehirler.copy()
+        # Bolge_Id tipi şemadan gelir (load_data ile çekildiyse zaten int)
+        df_sehirler = enforce_schema(df_sehirler, "sehirler").copy()
         if "Sehir_Ad" in df_sehirler.columns:
-            df_sehirler["Sehir_Ad"] = df_sehirler["Sehir_Ad"].apply(normalize_city_name)
-        
-        if "Bolge_Id" in df_sehirler.columns:
-            df_sehirler["Bolge_Id"] = pd.to_numeric(df_sehirler["Bolge_Id"], errors='coerce').fillna(0).astype(int)
+            df_sehirler["Sehir_Ad"] = normalize_city_names(df_sehirler["Sehir_Ad"])
 
         sehir_bolge_map = df_sehirler.set_index("Sehir_Ad")[["Bolge_Id", "Bolge_Ad"]].to_dict("index")
         
@@ -192,6 +196,9 @@ def prepare_bellis_summary(df_bellis: pd.DataFrame, df_sehirler: pd.DataFrame) -
     # df_sehirler 81 ili içerdiği için, orada olmayanlar (Yurt Dışı) ID=0 olur.
     df_bellis["Is_Turkey"] = df_bellis["Bolge_Id"] > 0
 
+    # Şehir / Servisci / Bölge -> Categorical (filtre ve gruplamalar kod üzerinden)
+    df_bellis = to_categorical(df_bellis, DTYPE_CONFIG["CATEGORICAL_COLUMNS"].get("bellis", []))
+
     # KPI Hesaplamaları
     total_machines = len(df_bellis)
     dhe_machines = (df_bellis["Servisci"] == "DHE").sum()
@@ -204,12 +211,12 @@ def prepare_bellis_summary(df_bellis: pd.DataFrame, df_sehirler: pd.DataFrame) -
     service_dist = df_bellis["Servisci"].value_counts().to_dict()
     
     # Bölge dağılımı
-    region_dist = df_bellis.groupby("Bolge_Ad").size().to_dict()
+    region_dist = df_bellis.groupby("Bolge_Ad", observed=True).size().to_dict()
     
     # Şehir bazlı özet (harita için)
     # DİKKAT: Haritada görünmesi için koordinatı olması yeterli ("Turkiye_Ici" flag'i coordinates.py'dan geliyor)
     # Yani Irak, Kıbrıs da burada olacak.
-    city_summary = df_bellis[df_bellis["Turkiye_Ici"]].groupby("Sehir").agg(
+    city_summary = df_bellis[df_bellis["Turkiye_Ici"]].groupby("Sehir", observed=True).agg(
         Toplam=("Musteri", "count"),
         DHE=("Servisci", lambda x: (x == "DHE").sum()),
         Enlem=("Enlem", "first"),
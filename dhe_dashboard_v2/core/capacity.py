@@ -0,0 +1,66 @@
+"""
+DHE Dashboard - Teknisyen Kapasite ve Verimlilik (Core)
+=======================================================
+Saha görünümündeki kişi bazlı kapasite hesabını tek vektörize adımda yapar:
+- Personel giriş / çıkış tarihleri bir kez ada göre indekslenir (satır döngüsü yok)
+- Kapasite: dönem iş günleri, kişinin çalışma aralığına kırpılmış (core.workdays)
+- Sahada / İzin / işlem sayıları: çalışma aralığına kırpılmış olgu tablosu üzerinde tek groupby
+- Atölye = Kapasite - hafta içi sahada - hafta içi izin; Verimlilik = Sahada / Kapasite
+KPI kartları ve teknisyen performans tablosu aynı sonuç tablosundan okunur.
+"""
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.field_facts import clip_to_employment, summarize_technicians
+from core.utils import tr_upper_series
+from core.workdays import get_workday_calendar
+
+logger = logging.getLogger(__name__)
+
+CAPACITY_COLUMNS = ["Kapasite", "Sahada", "Izin", "Atolye", "Verimlilik",
+                    "Sahada_HI", "Izin_HI", "Bakım", "Arıza", "Devreye Alma", "Diğer"]
+
+
+def personnel_dates(df_personel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Personel tablosundan ad (Türkçe büyük harf) indeksli Ise_Giris / Isten_Cikis tablosu.
+    Aynı ad birden fazla kez geçerse ilk kayıt kullanılır; eksik sütunlar NaT'dir.
+    """
+    if df_personel is None or df_personel.empty or "Ad_Soyad" not in df_personel.columns:
+        return pd.DataFrame({"Ise_Giris": pd.Series(dtype="datetime64[us]"),
+                             "Isten_Cikis": pd.Series(dtype="datetime64[us]")})
+    dates = pd.DataFrame({
+        col: df_personel[col] if col in df_personel.columns else pd.NaT
+        for col in ("Ise_Giris", "Isten_Cikis")
+    }, index=df_personel.index)
+    dates.index = tr_upper_series(df_personel["Ad_Soyad"]).to_numpy()
+    return dates[~dates.index.duplicated()]
+
+
+def technician_capacity(facts: pd.DataFrame, df_personel: pd.DataFrame, technicians: Iterable[str],
+                        year: int, month: Optional[int] = None, holidays: Optional[set] = None) -> pd.DataFrame:
+    """
+    Teknisyen indeksli kapasite / gün / verimlilik tablosu (CAPACITY_COLUMNS).
+
+    Args:
+        facts: Dönemin teknisyen-gün olguları (core.field_facts.filter_period çıktısı)
+        df_personel: Personel tablosu (Ad_Soyad, Ise_Giris, Isten_Cikis)
+        technicians: Hesaplanacak teknisyenler (kaydı olmayanlar 0 gün ile döner)
+        year, month: Dönem (month None = tüm yıl); dönem bugünle sınırlanır
+        holidays: Tatil seti
+    """
+    technicians = list(dict.fromkeys(technicians))
+    dates = personnel_dates(df_personel).reindex(technicians)
+    starts, ends = dates["Ise_Giris"], dates["Isten_Cikis"]
+
+    calendar = get_workday_calendar(holidays)
+    kapasite = calendar.effective_workdays(year, month, starts, ends)
+
+    result = summarize_technicians(clip_to_employment(facts, starts, ends), technicians)
+    result["Kapasite"] = kapasite
+    result["Atolye"] = np.maximum(0, kapasite - result["Sahada_HI"] - result["Izin_HI"])
+    result["Verimlilik"] = (result["Sahada"] / result["Kapasite"].where(result["Kapasite"] > 0) * 100).fillna(0.0)
+    return result[CAPACITY_COLUMNS]
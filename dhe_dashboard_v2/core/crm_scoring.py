@@ -0,0 +1,220 @@
+"""
+DHE Dashboard - CRM Skorlama Motoru (Core)
+==========================================
+CRM tablosunu (müşteri bazlı ciro / teklif metrikleri + segment + risk) sütun bazlı üretir.
+- Müşteri toplamları tek groupby üzerinde doğrudan indirgemelerle; satır bazlı apply yok
+- Pareto kümülatif payı tek argsort + cumsum; Segment np.select, Riskli np.where ile
+- Artımlı: CrmScorer müşteri başına teklif/sipariş imzası tutar; yeni yüklemede sadece
+  imzası değişen müşterilerin toplamları yeniden hesaplanır, skorlama tüm dizide vektörel
+Eşikler config/constants.py -> CRM_SCORING_CONFIG.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CRM_SCORING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SIPARIS_COLUMNS = ["Total_Ciro_EUR", "Siparis_Adedi", "Son_Siparis_Tarihi", "Ilk_Siparis_Tarihi",
+                   "Gun_Farki", "Purchase_Frequency"]
+TEKLIF_COLUMNS = ["Total_Teklif_EUR", "Teklif_Sayisi", "Son_Teklif_Tarihi", "Ilk_Teklif_Tarihi",
+                  "Son_Teklif_No", "Son_Teklif_Tutar"]
+
+SEGMENT_PASIF = "Pasif"
+SEGMENT_VIP = "🥇 VIP"
+SEGMENT_GOLD = "🥈 Gold"
+SEGMENT_STANDART = "🥉 Standart"
+
+
+# =============================================================================
+# MÜŞTERİ TOPLAMLARI
+# =============================================================================
+def order_aggregates(df_siparis: pd.DataFrame) -> pd.DataFrame:
+    """Müşteri indeksli sipariş özeti (ciro, adet, ilk/son tarih, sipariş sıklığı)."""
+    if df_siparis.empty:
+        return pd.DataFrame(columns=SIPARIS_COLUMNS, index=pd.Index([], name="Musteri"))
+    g = df_siparis.groupby("Musteri", sort=True, observed=True)
+    agg = pd.DataFrame({
+        "Total_Ciro_EUR": g["Tutar_EUR"].sum(),
+        "Siparis_Adedi": g["Siparis_No"].nunique(),
+        "Son_Siparis_Tarihi": g["Tarih"].max(),
+        "Ilk_Siparis_Tarihi": g["Tarih"].min(),
+    })
+    agg["Gun_Farki"] = (agg["Son_Siparis_Tarihi"] - agg["Ilk_Siparis_Tarihi"]).dt.days
+    # Birden fazla sipariş varsa (Son - İlk) / (Adet - 1), yoksa 0
+    adet = agg["Siparis_Adedi"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        freq = agg["Gun_Farki"].to_numpy() / (adet - 1)
+    agg["Purchase_Frequency"] = np.where(adet > 1, freq, 0.0)
+    return agg
+
+
+def quote_aggregates(df_teklif: pd.DataFrame) -> pd.DataFrame:
+    """Müşteri indeksli teklif özeti (hacim, adet, ilk/son tarih, son teklif no / tutar)."""
+    if df_teklif.empty:
+        return pd.DataFrame(columns=TEKLIF_COLUMNS, index=pd.Index([], name="Musteri"))
+    g = df_teklif.groupby("Musteri", sort=True, observed=True)
+    agg = pd.DataFrame({
+        "Total_Teklif_EUR": g["Tutar_EUR"].sum(),
+        "Teklif_Sayisi": g["Teklif_No"].nunique(),
+        "Son_Teklif_Tarihi": g["Tarih"].max(),
+        "Ilk_Teklif_Tarihi": g["Tarih"].min(),
+    })
+    # Son teklif: tarihe göre (kararlı) sıralamada müşterinin son satırı
+    last = df_teklif.sort_values("Tarih", kind="stable").drop_duplicates("Musteri", keep="last")
+    last = last.set_index("Musteri")
+    agg["Son_Teklif_No"] = last["Teklif_No"]
+    agg["Son_Teklif_Tutar"] = last["Tutar_EUR"]
+    return agg
+
+
+def customer_signatures(df: pd.DataFrame, columns) -> pd.Series:
+    """
+    Müşteri başına satır içeriği imzası (satır hash'lerinin toplamı, sıra bağımsız).
+    İmzası değişmeyen müşterinin toplamları yeniden hesaplanmaz.
+    """
+    if df.empty:
+        return pd.Series(dtype="uint64")
+    cols = [c for c in columns if c in df.columns]
+    # categorize=False: teklif/sipariş no gibi tekil değerli sütunlarda kategorileştirme maliyetsiz kalsın
+    hashes = pd.util.hash_pandas_object(df[cols], index=False, categorize=False)
+    return hashes.groupby(df["Musteri"], observed=True).sum()
+
+
+# =============================================================================
+# SKORLAMA
+# =============================================================================
+def score_customers(df_crm: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Pareto payı, segment, recency ve risk sütunlarını ekler; teklif hacmine göre azalan sıralı döner.
+    Eşikler: CRM_SCORING_CONFIG (VIP_SHARE, GOLD_SHARE, RISK_RECENCY_DAYS).
+    """
+    hacim = df_crm["Total_Teklif_EUR"].to_numpy(dtype=float)
+    order = np.argsort(-hacim, kind="stable")
+    df_crm = df_crm.take(order)
+    hacim = hacim[order]
+
+    cum_quote = np.cumsum(hacim)
+    total = hacim.sum()
+    share = cum_quote / total if total > 0 else np.zeros(len(hacim))
+    df_crm["Cum_Quote"] = cum_quote
+    df_crm["Revenue_Share"] = share
+
+    segment = np.select(
+        [hacim == 0, share <= CRM_SCORING_CONFIG["VIP_SHARE"], share <= CRM_SCORING_CONFIG["GOLD_SHARE"]],
+        [SEGMENT_PASIF, SEGMENT_VIP, SEGMENT_GOLD],
+        default=SEGMENT_STANDART,
+    )
+    df_crm["Segment"] = segment
+
+    now = now or datetime.now()
+    recency = (pd.Timestamp(now) - df_crm["Son_Teklif_Tarihi"]).dt.days
+    df_crm["Recency_Days"] = recency.fillna(CRM_SCORING_CONFIG["NO_QUOTE_RECENCY_DAYS"]).astype(int)
+    df_crm["Riskli"] = np.where(
+        segment == SEGMENT_VIP, df_crm["Recency_Days"].to_numpy() > CRM_SCORING_CONFIG["RISK_RECENCY_DAYS"], False
+    )
+    return df_crm
+
+
+def assemble_crm(aggregates: pd.DataFrame, df_musteri: pd.DataFrame,
+                 now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Müşteri listesine (Musteri / Uzun_Ad / Sorumlu_Clean) toplamları ekler ve skorlar.
+    Müşteri listesi boşsa siparişi olan müşteriler kullanılır.
+    """
+    if df_musteri.empty:
+        musteriler = aggregates.index[aggregates["Siparis_Adedi"].notna()]
+        all_customers = pd.DataFrame({"Musteri": musteriler, "Uzun_Ad": musteriler, "Sorumlu_Clean": "Genel"})
+    else:
+        all_customers = df_musteri[["Kisa_Ad", "Uzun_Ad", "Sorumlu_Clean"]].rename(columns={"Kisa_Ad": "Musteri"})
+
+    df_crm = all_customers.join(aggregates, on="Musteri")
+    df_crm.index = pd.RangeIndex(len(df_crm))
+    for col in ("Total_Teklif_EUR", "Total_Ciro_EUR", "Siparis_Adedi", "Teklif_Sayisi"):
+        df_crm[col] = df_crm[col].fillna(0)
+    return score_customers(df_crm, now)
+
+
+def build_aggregates(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame) -> pd.DataFrame:
+    """Teklif ve sipariş toplamlarını tek müşteri indeksli tabloda birleştirir."""
+    sip, tek = order_aggregates(df_siparis), quote_aggregates(df_teklif)
+    return pd.concat([sip, tek], axis=1)[SIPARIS_COLUMNS + TEKLIF_COLUMNS].sort_index()
+
+
+# =============================================================================
+# ARTIMLI SKORLAYICI
+# =============================================================================
+class CrmScorer:
+    """
+    Müşteri toplamlarını yüklemeler arasında saklayan artımlı CRM motoru.
+    update() sadece teklif/sipariş satırları değişen (eklenen, silinen, düzenlenen)
+    müşterilerin toplamlarını yeniden hesaplar; skorlama her seferinde tüm müşterilerde
+    vektörel yapılır (Pareto payı küresel olduğu için).
+    """
+
+    # Musteri imzaya girmez: hash'ler zaten müşteri bazında toplanır
+    SIGNATURE_COLUMNS = ["Tarih", "Tutar_EUR", "Teklif_No", "Siparis_No"]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aggregates: Optional[pd.DataFrame] = None
+        self._signatures: Optional[pd.DataFrame] = None
+        self.last_touched = 0
+
+    def reset(self):
+        with self._lock:
+            self._aggregates = None
+            self._signatures = None
+
+    def _signature_frame(self, df_teklif, df_siparis) -> pd.DataFrame:
+        teklif = customer_signatures(df_teklif, self.SIGNATURE_COLUMNS)
+        siparis = customer_signatures(df_siparis, self.SIGNATURE_COLUMNS)
+        index = teklif.index.union(siparis.index)
+        # fill_value ile hizalama: NaN -> float dönüşümü hash hassasiyetini bozmasın
+        return pd.DataFrame({
+            "teklif": teklif.reindex(index, fill_value=0).astype("uint64"),
+            "siparis": siparis.reindex(index, fill_value=0).astype("uint64"),
+        })
+
+    def update(self, df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_musteri: pd.DataFrame,
+               now: Optional[datetime] = None) -> pd.DataFrame:
+        """Net (son revizyon) teklif / sipariş tablolarından CRM tablosunu üretir."""
+        signatures = self._signature_frame(df_teklif, df_siparis)
+        with self._lock:
+            prev_aggs, prev_sigs = self._aggregates, self._signatures
+
+        if prev_aggs is None or not CRM_SCORING_CONFIG.get("INCREMENTAL", True):
+            aggregates = build_aggregates(df_teklif, df_siparis)
+            self.last_touched = len(signatures)
+        else:
+            aligned_prev = prev_sigs.reindex(signatures.index, fill_value=0)
+            changed = (aligned_prev != signatures).any(axis=1) | ~signatures.index.isin(prev_sigs.index)
+            removed = prev_sigs.index.difference(signatures.index)
+            touched = signatures.index[changed.to_numpy()]
+            self.last_touched = len(touched) + len(removed)
+
+            if self.last_touched == 0:
+                aggregates = prev_aggs
+            else:
+                fresh = build_aggregates(df_teklif[df_teklif["Musteri"].isin(touched)],
+                                         df_siparis[df_siparis["Musteri"].isin(touched)])
+                kept = prev_aggs.drop(index=touched.union(removed), errors="ignore")
+                aggregates = pd.concat([kept, fresh]).sort_index()
+            logger.info(f"[CRM] Artımlı skorlama: {self.last_touched}/{len(signatures)} müşteri yeniden toplandı")
+
+        with self._lock:
+            self._aggregates, self._signatures = aggregates, signatures
+        return assemble_crm(aggregates, df_musteri, now)
+
+
+_SCORER = CrmScorer()
+
+
+def get_crm_scorer() -> CrmScorer:
+    """Süreç genelindeki tekil artımlı CRM skorlayıcısını döndürür."""
+    return _SCORER
@@ -0,0 +1,145 @@
+"""
+DHE Dashboard - Müşteri Analitiği (RFM / CLV)
+=============================================
+CRM tablosunu (core.crm_scoring çıktısı) müşteri yaşam döngüsü metrikleriyle genişletir:
+- R / F / M skorları (1-5 dilim; işlemi olmayan müşteri 0)
+- Teklif -> sipariş dönüşüm oranı (net teklifler üzerinden)
+- Ortalama sipariş aralığı, yıllık sipariş hızı, basit CLV projeksiyonu
+- Recency grubu (CRM sekmeleri) ve sade segment etiketi önceden hesaplanır
+Tüm hesaplar müşteri dizileri üzerinde vektöreldir; tablo data_packet ile birlikte
+("musteri_analiz") önbelleğe alınır, CRM sayfası her yeniden çizimde sadece filtreler.
+Ayarlar config/constants.py -> CUSTOMER_ANALYTICS_CONFIG.
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CUSTOMER_ANALYTICS_CONFIG
+from core.crm_scoring import SEGMENT_GOLD, SEGMENT_PASIF, SEGMENT_STANDART, SEGMENT_VIP
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_LABELS = {
+    SEGMENT_VIP: "Öncelikli",
+    SEGMENT_GOLD: "Düzenli",
+    SEGMENT_STANDART: "Ara Sıra",
+    SEGMENT_PASIF: "Uyuyan",
+}
+
+ANALYTICS_COLUMNS = ["Segment_Etiket", "Son_Islem_Tarihi", "Recency_Grubu", "R_Skor", "F_Skor", "M_Skor",
+                     "RFM_Kod", "RFM_Toplam", "Donusum_Orani", "Ort_Siparis_Araligi", "Ort_Siparis_Tutari",
+                     "Yillik_Siparis_Hizi", "Aktif_Olasilik", "CLV_Tahmini"]
+
+
+# =============================================================================
+# YARDIMCI HESAPLAR
+# =============================================================================
+def quantile_scores(values: pd.Series, mask: np.ndarray, bins: int, ascending: bool = True) -> np.ndarray:
+    """
+    Yüzdelik sıraya göre 1..bins dilim skoru (eşit değerler aynı skoru alır).
+    mask dışındaki satırlar 0 alır; ascending=False büyük değere düşük skor verir.
+    """
+    scores = np.zeros(len(values), dtype="int8")
+    if mask.any():
+        pct = values[mask].rank(pct=True, method="average", ascending=ascending).to_numpy()
+        scores[mask] = np.clip(np.ceil(pct * bins), 1, bins).astype("int8")
+    return scores
+
+
+def recency_groups(recency_days: pd.Series, mask: np.ndarray) -> pd.Categorical:
+    """Recency gününü RECENCY_BUCKETS sınırlarına göre gruplar (mask dışı NaN)."""
+    labels = CUSTOMER_ANALYTICS_CONFIG["RECENCY_LABELS"]
+    bounds = np.asarray(CUSTOMER_ANALYTICS_CONFIG["RECENCY_BUCKETS"][1:])
+    codes = np.searchsorted(bounds, recency_days.to_numpy(), side="right")
+    codes = np.where(mask, codes, -1)
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def quote_conversion(df_all_quotes: pd.DataFrame, df_siparis: pd.DataFrame) -> pd.Series:
+    """
+    Müşteri bazında net tekliflerin (son revizyon) siparişe dönüşen oranı.
+    Teklif, aynı numarayla sipariş sekmesinde varsa dönüşmüş sayılır (process_finance ile aynı kural).
+    """
+    if df_all_quotes is None or df_all_quotes.empty:
+        return pd.Series(dtype=float)
+    quotes = df_all_quotes
+    if "Is_Latest_Rev" in quotes.columns:
+        quotes = quotes[quotes["Is_Latest_Rev"].to_numpy(dtype=bool)]
+    siparis_ids = df_siparis["Siparis_No"].unique() if not df_siparis.empty else []
+    converted = quotes["Teklif_No"].isin(siparis_ids).to_numpy()
+    g = pd.Series(converted, index=quotes.index).groupby(quotes["Musteri"], observed=True)
+    return g.mean()
+
+
+# =============================================================================
+# MÜŞTERİ ANALİTİK TABLOSU
+# =============================================================================
+def build_customer_analytics(df_crm: pd.DataFrame, df_all_quotes: pd.DataFrame, df_siparis: pd.DataFrame,
+                             now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    CRM tablosunun (aynı sıra) ANALYTICS_COLUMNS ile genişletilmiş kopyası.
+
+    Args:
+        df_crm: core.crm_scoring çıktısı (müşteri başına bir satır)
+        df_all_quotes: Tüm teklifler (revizyon sütunlarıyla)
+        df_siparis: Siparişler
+        now: Referans tarih (varsayılan: şimdi)
+    """
+    if df_crm is None or df_crm.empty:
+        return pd.DataFrame(columns=list(getattr(df_crm, "columns", [])) + ANALYTICS_COLUMNS)
+
+    cfg = CUSTOMER_ANALYTICS_CONFIG
+    now = pd.Timestamp(now or datetime.now())
+    df = df_crm.copy()
+    # Hiç sipariş yoksa tarih sütunları tipsiz (object) gelebilir
+    for col in ("Son_Teklif_Tarihi", "Son_Siparis_Tarihi", "Ilk_Siparis_Tarihi"):
+        df[col] = pd.to_datetime(df[col])
+
+    teklif_sayisi = df["Teklif_Sayisi"].to_numpy(dtype=float)
+    siparis_adedi = df["Siparis_Adedi"].to_numpy(dtype=float)
+    ciro = df["Total_Ciro_EUR"].to_numpy(dtype=float)
+    has_quote = df["Total_Teklif_EUR"].to_numpy(dtype=float) > 0
+    has_order = siparis_adedi > 0
+    active = (teklif_sayisi > 0) | has_order
+
+    labels = df["Segment"].astype(object).map(SEGMENT_LABELS)
+    df["Segment_Etiket"] = labels.fillna("Diğer").to_numpy()
+
+    # Recency grubu (CRM sekmeleri): son tekliften bu yana, teklif hacmi olan müşteriler
+    df["Recency_Grubu"] = recency_groups(df["Recency_Days"], has_quote)
+
+    # RFM: son işlem (teklif veya sipariş), sipariş adedi, ciro
+    son_islem = df[["Son_Teklif_Tarihi", "Son_Siparis_Tarihi"]].max(axis=1)
+    df["Son_Islem_Tarihi"] = son_islem
+    islem_recency = (now - son_islem).dt.days
+    bins = cfg["RFM_BINS"]
+    r = quantile_scores(islem_recency, active, bins, ascending=False)
+    f = quantile_scores(df["Siparis_Adedi"], active, bins)
+    m = quantile_scores(df["Total_Ciro_EUR"], active, bins)
+    df["R_Skor"], df["F_Skor"], df["M_Skor"] = r, f, m
+    rfm = r.astype(int) * 100 + f.astype(int) * 10 + m.astype(int)
+    df["RFM_Kod"] = np.where(active, rfm.astype(str), "-")
+    df["RFM_Toplam"] = (r.astype(int) + f + m).astype("int8")
+
+    # Teklif -> sipariş dönüşümü
+    conversion = quote_conversion(df_all_quotes, df_siparis)
+    df["Donusum_Orani"] = conversion.reindex(df["Musteri"]).fillna(0.0).to_numpy()
+
+    # Sipariş aralığı ve CLV
+    df["Ort_Siparis_Araligi"] = np.where(siparis_adedi > 1, df["Purchase_Frequency"].to_numpy(dtype=float), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aov = np.where(has_order, ciro / siparis_adedi, 0.0)
+        tenure = (now - df["Ilk_Siparis_Tarihi"]).dt.days.to_numpy(dtype=float)
+        yearly = np.where(has_order, siparis_adedi * 365.0 / np.fmax(tenure, 365.0), 0.0)
+    siparis_recency = (now - df["Son_Siparis_Tarihi"]).dt.days.to_numpy(dtype=float)
+    aktif = np.where(has_order, np.clip(1.0 - siparis_recency / cfg["CHURN_DAYS"], 0.0, 1.0), 0.0)
+    df["Ort_Siparis_Tutari"] = aov
+    df["Yillik_Siparis_Hizi"] = yearly
+    df["Aktif_Olasilik"] = aktif
+    df["CLV_Tahmini"] = aov * yearly * cfg["CLV_YEARS"] * aktif
+
+    logger.info(f"[CRM] Müşteri analitiği: {int(active.sum())}/{len(df)} aktif müşteri skorlandı")
+    return df
@@ -3,24 +3,48 @@ DHE Dashboard - Data Loader (Core)
 ==================================
 Google Sheets veri kaynağı ile uygulama arasındaki köprü.
 Verileri Google Sheets API üzerinden çeker -> core.gsheets ile
+Veri kaynağını (gspread / local / synthetic) seçer -> core.data_sources ile
 Verileri İşler -> core.transforms ile
-Önbelleğe alır ve dağıtır -> load_data ile
+Değişiklikleri takip eder -> core.sync ile (sadece değişen sekmeler yeniden işlenir)
+Diske yazar / soğuk başlangıçta okur -> core.snapshot ile
+Arka planda yeniler ve dağıtır -> core.refresher + load_data ile
 """
+import os
+import numpy as np
 import pandas as pd
 import streamlit as st
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import threading
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
 
 # Google Sheets API
 import gspread
 
 # Core Imports
-from config.constants import PERSONEL_MAP, EXCEL_CONFIG, YEARS_TO_FETCH
-from core.gsheets import get_gspread_client, open_spreadsheet, fetch_sheet_data, safe_read_gsheet
-from core.transforms import process_finance_dataframe, prepare_crm_data, normalize_personel_name, determine_saha_status
-from core.utils import tr_upper, clean_money_text, retry_on_exception
+from config.constants import PERSONEL_MAP, EXCEL_CONFIG, YEARS_TO_FETCH, REFRESH_CONFIG, SAHA_FETCH_CONFIG
+from core.gsheets import (
+    get_gspread_client, open_spreadsheet, fetch_sheet_data, fetch_sheet_ranges,
+    column_letter, safe_read_gsheet, batch_read_gsheets
+)
+from core.transforms import (
+    process_finance_dataframe, prepare_crm_data, determine_saha_status_series,
+    add_revision_columns, add_period_revision_columns
+)
+from core.utils import (
+    tr_upper_series, normalize_name_series, clean_money_text, retry_on_exception, parse_rate_table
+)
 from core.validator import validate_dataframe
+from core.sync import get_sync_state
+from core.data_sources import get_data_source
+from core.snapshot import save_snapshot, load_latest_snapshot, save_frozen_tab, load_frozen_tab
+from core.refresher import DataRefresher
+from core.schema import enforce_schema, apply_packet_schema, packet_memory_usage
+from core.field_facts import build_technician_days
+from core.workdays import get_workday_calendar
+from core.crm_scoring import get_crm_scorer
+from core.customer_analytics import build_customer_analytics
+from core.sales_cube import build_sales_cube
 
 # Logger Yapılandırması
 logger = logging.getLogger(__name__)
@@ -77,13 +101,13 @@ def load_saha_data() -> pd.DataFrame:
         # Teknisyen İsimleri Normalize
         for col in ['Teknisyen 1', 'Teknisyen 2']:
             if col in df.columns:
-                df[col] = df[col].apply(normalize_personel_name)
+                df[col] = normalize_name_series(df[col])
 
         if 'Teknisyen 1' in df.columns:
             df = df[df['Teknisyen 1'] != ''].copy()
         
         # Durum Belirleme
-        df['Durum'] = df.apply(determine_saha_status, axis=1)
+        df['Durum'] = determine_saha_status_series(df)
         
         logger.info(f"[Saha] Toplam: {len(df)} satır")
         
@@ -100,7 +124,7 @@ def load_saha_data() -> pd.DataFrame:
             )
             
             if not df_personel.empty:
-                df_personel["Ad_Soyad"] = df_personel["Ad_Soyad"].apply(normalize_personel_name)
+                df_personel["Ad_Soyad"] = normalize_name_series(df_personel["Ad_Soyad"])
                 df_personel = df_personel[df_personel["Ad_Soyad"] != ""]
                 
                 for date_col in ["Ise_Giris", "Isten_Cikis"]:
@@ -123,269 +147,526 @@ def load_saha_data() -> pd.DataFrame:
 
 def get_monthly_rates_map_gsheet(spreadsheet) -> Dict[tuple, float]:
     """Google Sheets'ten aylık kur tablosunu okur."""
-    rates_map = {}
     try:
         sheet_name = EXCEL_CONFIG["SHEETS"]["KURLAR"]
         data = fetch_sheet_data(spreadsheet, sheet_name)
         
         if len(data) < 2:
-            return rates_map
+            return {}
             
         logger.info(f"[GSheets] {sheet_name}: {len(data)-1} satır")
-        
-        headers = [str(c).lower().strip() for c in data[0]]
-        rows = data[1:]
-        df_kurlar = pd.DataFrame(rows, columns=headers)
-        
-        # Basit kolon normalizasyonu
-        def normalize_col(col):
-            col = col.lower().strip()
-            col = col.replace('ı', 'i').replace('İ', 'i').replace('ş', 's').replace('ğ', 'g')
-            return col
-        
-        df_kurlar.columns = [normalize_col(c) for c in df_kurlar.columns]
-        df_kurlar = df_kurlar.rename(columns={'year': 'yil', 'month': 'ay'})
-        
-        for _, row in df_kurlar.iterrows():
-            try:
-                # , -> . dönüşümü ve float parsing
-                def parse(v): return float(str(v).replace(',', '.')) if v else 1.0
-                
-                yil = int(parse(row.get('yil', 0)))
-                ay = int(parse(row.get('ay', 0)))
-                
-                if yil > 0 and ay > 0:
-                    rates_map[(yil, ay, 'EUR')] = parse(row.get('eur'))
-                    rates_map[(yil, ay, 'USD')] = parse(row.get('usd'))
-                    rates_map[(yil, ay, 'GBP')] = parse(row.get('gbp'))
-                    rates_map[(yil, ay, 'TL')] = parse(row.get('tl'))
-                    rates_map[(yil, ay, 'TRY')] = parse(row.get('tl'))
-            except:
-                continue
+        return parse_rate_table(pd.DataFrame(data[1:], columns=data[0])).to_dict()
     except Exception as e:
         logger.warning(f"Kurlar okunamadı: {e}")
-    
-    return rates_map
+        return {}
 
 
-@st.cache_data(show_spinner=False)
-def load_data(_progress_callback=None) -> Dict[str, pd.DataFrame]:
-    """Tüm verileri yükleyen ana fonksiyon (İKİ AŞAMALI PARALEL Veri Çekme)."""
+# Servis Programı dosyası ve yıl sekmeleri
+SAHA_SHEETS_NAME = "2025 SERVİS PROGRAMI"
+SAHA_YEARS = ["2024", "2025", "2026"]
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cari yıl sekmesinin son tam okunma zamanı (pencere okumaları arasında periyodik tam okuma)
+_saha_last_full_fetch: Optional[datetime] = None
+
+# DHE_Data sekmeleri: anahtar -> (sekme adı, kolon eşleştirmesi)
+DHE_TASKS = {
+    "teklif": (EXCEL_CONFIG["SHEETS"]["TEKLIF"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["TEKLIF"]),
+    "siparis": (EXCEL_CONFIG["SHEETS"]["SIPARIS"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["SIPARIS"]),
+    "musteri": (EXCEL_CONFIG["SHEETS"]["MUSTERI"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["MUSTERI"]),
+    "urun": (EXCEL_CONFIG["SHEETS"]["URUN"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["URUN"]),
+    "tatiller": (EXCEL_CONFIG["SHEETS"].get("TATILLER", "Tatiller"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("TATILLER")),
+    "kurlar": (EXCEL_CONFIG["SHEETS"].get("KURLAR", "kurlar"), None),
+    "personel": (EXCEL_CONFIG["SHEETS"].get("PERSONEL", "Personel"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("PERSONEL")),
+    "sehirler": (EXCEL_CONFIG["SHEETS"].get("SEHIRLER", "sehirler"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("SEHIRLER")),
+}
+
+
+# =============================================================================
+# İŞLEME AŞAMALARI (Sync katmanı değişmeyen aşamaları atlar)
+# =============================================================================
+def parse_kurlar(df_kurlar: pd.DataFrame) -> pd.Series:
+    """Kurlar sekmesini (Yil, Ay, Para_Birimi) indeksli kur tablosuna çevirir."""
+    return parse_rate_table(df_kurlar)
+
+
+def process_finance(df_raw_teklif: pd.DataFrame, df_raw_siparis: pd.DataFrame,
+                    df_raw_musteri: pd.DataFrame, monthly_rates: pd.Series) -> Dict[str, pd.DataFrame]:
+    """Teklif/Sipariş/Müşteri ham verilerinden finansal tabloları ve CRM'i üretir."""
+    df_teklif_processed = process_finance_dataframe(df_raw_teklif.copy(), "Teklif_No", monthly_rates, PERSONEL_MAP)
+    df_teklif_processed = df_teklif_processed[df_teklif_processed["Tutar_EUR"] != 0]
+
+    df_siparis_processed = process_finance_dataframe(df_raw_siparis.copy(), "Siparis_No", monthly_rates, PERSONEL_MAP)
+    df_siparis_processed = df_siparis_processed[df_siparis_processed["Tutar_EUR"] != 0]
+
+    # Revizyon sütunları (Kok_No, Rev_No, Is_Latest_Rev) - görünümler tekrar ayrıştırmasın
+    df_teklif_processed = add_revision_columns(df_teklif_processed.copy(), "Teklif_No")
+    df_siparis_processed = add_revision_columns(df_siparis_processed.copy(), "Siparis_No")
+
+    # Müşteri Temizliği
+    df_musteri = df_raw_musteri.copy()
+    sorumlu = tr_upper_series(df_musteri["Sorumlu"]).str.strip()
+    df_musteri["Sorumlu_Clean"] = sorumlu.where(sorumlu != "", "BOŞ / SAHİPSİZ")
+
+    # Teklif/Sipariş Ayrımı
+    siparis_ids = set(df_siparis_processed["Siparis_No"].unique())
+    df_teklif_acik = df_teklif_processed[~df_teklif_processed["Teklif_No"].isin(siparis_ids)].copy()
+    df_teklif_acik["Durum"] = "Teklif"
+
+    df_siparis_final = df_siparis_processed.copy()
+    df_siparis_final["Durum"] = "Sipariş"
+    df_siparis_final["Teklif_No"] = df_siparis_final["Siparis_No"]
+
+    # Dönem içi revizyon bayrakları (Servis Performansı "Net" görünümü, her tablo kendi içinde)
+    add_period_revision_columns(df_teklif_processed, "Teklif_No")
+    add_period_revision_columns(df_teklif_acik, "Teklif_No")
+    add_period_revision_columns(df_siparis_final, "Siparis_No")
+
+    # CRM (artımlı: sadece teklif/siparişi değişen müşteriler yeniden toplanır)
+    df_crm = prepare_crm_data(df_teklif_processed, df_siparis_final, df_musteri, scorer=get_crm_scorer())
+
+    return {
+        "teklif": df_teklif_acik,
+        "siparis": df_siparis_final,
+        "musteri": df_musteri,
+        "all_quotes": df_teklif_processed,
+        "crm": df_crm,
+    }
+
+
+def clean_saha(saha_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """Servis Programı yıl sekmelerini birleştirir ve temizler (durum atamadan)."""
+    if not saha_dfs:
+        return pd.DataFrame()
+
+    # Birleştirme ve Temizlik
+    cleaned_dfs = [df.loc[:, ~df.columns.duplicated()] for df in saha_dfs]
+    df_saha = pd.concat(cleaned_dfs, ignore_index=True)
+
+    # Boş sütunları temizle
+    df_saha = df_saha.loc[:, df_saha.columns.str.strip() != '']
+
+    # Tarih temizliği (boş tarihli satırlar atılır, sonra şema tipleri)
+    if 'Tarih' in df_saha.columns:
+        df_saha = df_saha[df_saha['Tarih'].astype(str).str.strip() != '']
+    df_saha = enforce_schema(df_saha, "saha").copy()
+    if 'Tarih' in df_saha.columns:
+        df_saha['Ay'] = df_saha['Tarih'].dt.month
+        df_saha['Yil'] = df_saha['Tarih'].dt.year
+
+    # Teknisyen İsimleri Normalize
+    for col in ['Teknisyen 1', 'Teknisyen 2']:
+        if col in df_saha.columns:
+            df_saha[col] = normalize_name_series(df_saha[col])
+
+    if 'Teknisyen 1' in df_saha.columns:
+        df_saha = df_saha[df_saha['Teknisyen 1'] != ''].copy()
+    return df_saha
+
+
+def process_saha(saha_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """Servis Programı yıl sekmelerini birleştirir, temizler ve durum atar."""
+    df_saha = clean_saha(saha_dfs)
+    if df_saha.empty:
+        return df_saha
+
+    # Durum Belirleme
+    df_saha['Durum'] = determine_saha_status_series(df_saha)
+    return df_saha
+
+
+def parse_holidays(df_holidays: pd.DataFrame) -> set:
+    """Tatiller sekmesini tarih setine çevirir."""
+    if df_holidays.empty or 'Tarih' not in df_holidays.columns:
+        return set()
+    dates = enforce_schema(df_holidays, "tatiller")['Tarih'].dt.date.dropna()
+    return set(dates.tolist())
+
+
+def process_urun(df_urun: pd.DataFrame) -> pd.DataFrame:
+    """Ürün sekmesinde müşteri adlarını normalize eder."""
+    if df_urun.empty:
+        return df_urun
+    df_urun = df_urun.copy()
+    df_urun["Musteri"] = df_urun["Musteri"].astype(str).str.strip().str.upper()
+    return df_urun
+
+
+# =============================================================================
+# SEKME ÇEKME (Değişmeyen dosyalar için önceki senkronizasyon kullanılır)
+# =============================================================================
+def _sync_dhe_tabs(spreadsheet_dhe, sync) -> Dict[str, pd.DataFrame]:
+    """
+    DHE_Data sekmelerini tek toplu istekle çeker; dosya değişmediyse önceki sekmeleri döndürür.
+    İstek başarısız olursa son geçerli sekmeler korunur.
+    """
+    version = sync.fetch_file_version(spreadsheet_dhe)
+    if sync.is_file_unchanged(GOOGLE_SHEETS_NAME, version):
+        logger.info(f"[Sync] {GOOGLE_SHEETS_NAME} değişmedi, çekme atlandı")
+        return sync.cached_tabs(GOOGLE_SHEETS_NAME)
+
     try:
-        import concurrent.futures
-        
-        if _progress_callback: _progress_callback(0.05, "Bağlantı kuruluyor...")
-        
-        client = get_gspread_client()
-        
-        # İki farklı spreadsheet
-        spreadsheet_dhe = open_spreadsheet(client, GOOGLE_SHEETS_NAME)
-        spreadsheet_saha = open_spreadsheet(client, "2025 SERVİS PROGRAMI")
-        
-        results = {}
-        
-        # =====================================================================
-        # AŞAMA 1: DHE_Data Sheetleri (8 adet) - PARALEL
-        # =====================================================================
-        if _progress_callback: _progress_callback(0.10, "DHE_Data okunuyor (8 Sheet Paralel)...")
-        
-        dhe_tasks = {
-            "teklif": (EXCEL_CONFIG["SHEETS"]["TEKLIF"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["TEKLIF"]),
-            "siparis": (EXCEL_CONFIG["SHEETS"]["SIPARIS"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["SIPARIS"]),
-            "musteri": (EXCEL_CONFIG["SHEETS"]["MUSTERI"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["MUSTERI"]),
-            "urun": (EXCEL_CONFIG["SHEETS"]["URUN"], EXCEL_CONFIG["COLUMN_MAPPINGS"]["URUN"]),
-            "tatiller": (EXCEL_CONFIG["SHEETS"].get("TATILLER", "Tatiller"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("TATILLER")),
-            "kurlar": (EXCEL_CONFIG["SHEETS"].get("KURLAR", "kurlar"), None),
-            "personel": (EXCEL_CONFIG["SHEETS"].get("PERSONEL", "Personel"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("PERSONEL")),
-            "sehirler": (EXCEL_CONFIG["SHEETS"].get("SEHIRLER", "sehirler"), EXCEL_CONFIG["COLUMN_MAPPINGS"].get("SEHIRLER")),
-        }
-        
-        def fetch_dhe(key, sheet_name, mapping):
-            try:
-                if mapping:
-                    return key, safe_read_gsheet(client, spreadsheet_dhe, sheet_name, mapping)
+        results = batch_read_gsheets(spreadsheet_dhe, DHE_TASKS)
+    except Exception as e:
+        # Sürümü kaydetme -> bir sonraki yenilemede tekrar denensin
+        logger.warning(f"DHE toplu çekme hatası: {e}")
+        cached = sync.cached_tabs(GOOGLE_SHEETS_NAME)
+        return {key: cached.get(key, pd.DataFrame()) for key in DHE_TASKS}
+
+    # Sekme şemaları: tarih/tutar/metin tipleri burada bir kez uygulanır
+    results = {key: enforce_schema(df, key) for key, df in results.items()}
+    for key, df in results.items():
+        sync.update_tab(GOOGLE_SHEETS_NAME, key, df)
+        logger.info(f"[DHE] {key}: {len(df)} satır")
+
+    sync.mark_file_synced(GOOGLE_SHEETS_NAME, version)
+    return results
+
+
+def _saha_archive_path(year: str) -> str:
+    # Arşiv kaynağa göre ayrılır: sentetik / yerel veri canlı geçmiş yılların yerine geçmez
+    return os.path.join(BASE_PATH, SAHA_FETCH_CONFIG.get("ARCHIVE_DIR", "data/archive"),
+                        get_data_source().storage_key, f"saha_{year}.arrow")
+
+
+def _saha_archivable(year: str, now: Optional[datetime] = None) -> bool:
+    """Geçmiş yıl, ertesi yılın ilk ARCHIVE_GRACE_MONTHS ayı bittikten sonra dondurulabilir."""
+    now = pd.Timestamp(now or datetime.now())
+    grace_end = pd.Timestamp(int(year) + 1, 1, 1) + pd.DateOffset(months=SAHA_FETCH_CONFIG.get("ARCHIVE_GRACE_MONTHS", 1))
+    return now >= grace_end
+
+
+def _saha_window_start(previous: pd.DataFrame) -> Optional[int]:
+    """
+    Cari yıl sekmesinde yeniden okunacak pencerenin ilk satır pozisyonunu bulur.
+    Pencere: WINDOW_MONTHS ay öncesinin ilk günü ve sonrası. Bulunamazsa None.
+    """
+    if previous is None or previous.empty or 'Tarih' not in previous.columns:
+        return None
+    dates = previous['Tarih']
+    if isinstance(dates, pd.DataFrame):  # Tekrar eden başlık
+        dates = dates.iloc[:, 0]
+    dates = pd.to_datetime(dates, dayfirst=True, errors='coerce')
+
+    today = pd.Timestamp.now().normalize()
+    window_start = (today - pd.DateOffset(months=SAHA_FETCH_CONFIG.get("WINDOW_MONTHS", 1))).replace(day=1)
+    positions = np.flatnonzero((dates >= window_start).to_numpy())
+    return int(positions[0]) if len(positions) else len(previous)
+
+
+def _trim_cells(values) -> List[str]:
+    """Satırı API biçimine getirir: hücre metinleri, boşlar '', sondaki boş hücreler kırpılmış."""
+    cells = ['' if pd.isna(v) else str(v) for v in values]
+    while cells and cells[-1] == '':
+        cells.pop()
+    return cells
+
+
+def _fetch_saha_window(spreadsheet_saha, year: str, previous: pd.DataFrame, start_pos: int) -> Optional[pd.DataFrame]:
+    """
+    Sadece pencere satırlarını A1 aralığı ile okur, öncesini önceki senkronizasyondan alır.
+    Sayfa düzeni: 1. satır başlık üstü, 2. satır başlık, veri 3. satırdan başlar.
+    Birleştirmeden önce örtüşme doğrulanır: başlık satırı ve pencerenin hemen üstündeki sınır
+    satırı önbellekle aynı olmalı, pencerede önbellekte olmayan sütun bulunmamalı. Pencere üstüne
+    satır eklenmiş/silinmiş veya sütun eklenmişse None döner (çağıran sekmeyi tam okur).
+    """
+    n_cols = previous.shape[1]
+    first_row = start_pos + 3
+    # Başlık + sınır satırı + pencere tek istekte; fazladan bir sütun yeni eklenen sütunu yakalar
+    header, window = fetch_sheet_ranges(
+        spreadsheet_saha, year, ["2:2", f"A{first_row - 1}:{column_letter(n_cols + 1)}"])
+
+    cached_header = _trim_cells(previous.columns)
+    if _trim_cells(header[0] if header else []) != cached_header:
+        logger.info(f"[Saha] {year}: başlık satırı değişmiş, tam okumaya geçiliyor")
+        return None
+    boundary = _trim_cells(window[0] if window else [])
+    expected = _trim_cells(previous.iloc[start_pos - 1]) if start_pos > 0 else cached_header
+    if boundary != expected:
+        logger.info(f"[Saha] {year}: pencere sınırı ({first_row - 1}. satır) önbellekle uyuşmuyor, tam okumaya geçiliyor")
+        return None
+
+    rows = window[1:]
+    if any(len(row) > n_cols for row in rows):
+        logger.info(f"[Saha] {year}: pencerede yeni sütun var, tam okumaya geçiliyor")
+        return None
+    # API sondaki boş hücreleri kırpar -> sütun sayısına tamamla
+    rows = [row + [''] * (n_cols - len(row)) for row in rows]
+    tail = pd.DataFrame(rows, columns=previous.columns)
+    logger.info(f"[Saha] {year}: pencere okundu ({len(rows)} satır, {first_row}. satırdan itibaren)")
+    return pd.concat([previous.iloc[:start_pos], tail], ignore_index=True)
+
+
+def _sync_saha_tabs(spreadsheet_saha, sync) -> Dict[str, pd.DataFrame]:
+    """
+    Servis Programı yıl sekmelerini çeker; dosya değişmediyse önceki sekmeleri döndürür.
+    - Geçmiş yıllar: yerel arşivden (ilk seferde tam okunup dondurulur)
+    - Cari yıl: son ayların satır penceresi (periyodik olarak tam okuma)
+    - Gelecek yıllar: tam okuma (küçük sekmeler)
+    """
+    import concurrent.futures
+
+    version = sync.fetch_file_version(spreadsheet_saha)
+    if sync.is_file_unchanged(SAHA_SHEETS_NAME, version):
+        logger.info(f"[Sync] {SAHA_SHEETS_NAME} değişmedi, çekme atlandı")
+        return sync.cached_tabs(SAHA_SHEETS_NAME)
+
+    global _saha_last_full_fetch
+    current_year = datetime.now().year
+    previous_tabs = sync.cached_tabs(SAHA_SHEETS_NAME)
+    full_refresh_due = (
+        _saha_last_full_fetch is None
+        or datetime.now() - _saha_last_full_fetch > timedelta(hours=SAHA_FETCH_CONFIG.get("FULL_REFRESH_HOURS", 24))
+    )
+
+    def fetch_full(year):
+        data = fetch_sheet_data(spreadsheet_saha, year)
+        if len(data) > 2:
+            # Saha verileri için header 2. satırda
+            headers = data[1]
+            rows = data[2:]
+            logger.info(f"[Saha] {year}: {len(rows)} satır")
+            return pd.DataFrame(rows, columns=headers)
+        return pd.DataFrame()
+
+    def fetch_saha(year):
+        try:
+            is_past = int(year) < current_year
+            if is_past and SAHA_FETCH_CONFIG.get("ARCHIVE_PAST_YEARS", True) and _saha_archivable(year):
+                archive_path = _saha_archive_path(year)
+                if year in previous_tabs and not previous_tabs[year].empty and os.path.exists(archive_path):
+                    return year, previous_tabs[year], True, False
+                archived = load_frozen_tab(archive_path)
+                if archived is not None and not archived.empty:
+                    logger.info(f"[Saha] {year}: arşivden okundu ({len(archived)} satır)")
+                    return year, archived, True, True
+                df = fetch_full(year)
+                if df.empty:
+                    # Boş okuma (geçici hata, boş sekme) dondurulmaz; sonraki yenilemede tekrar okunur
+                    logger.warning(f"[Saha] {year}: sekme boş okundu, arşivlenmedi")
                 else:
-                    data = fetch_sheet_data(spreadsheet_dhe, sheet_name)
-                    if len(data) > 1:
-                        return key, pd.DataFrame(data[1:], columns=data[0])
-                    return key, pd.DataFrame()
-            except Exception as e:
-                logger.warning(f"DHE çekme hatası ({key}): {e}")
-                return key, pd.DataFrame()
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            futures = {executor.submit(fetch_dhe, k, v[0], v[1]): k for k, v in dhe_tasks.items()}
-            for future in concurrent.futures.as_completed(futures):
-                key, df = future.result()
-                results[key] = df
-                logger.info(f"[DHE] {key}: {len(df)} satır")
-        
-        # =====================================================================
-        # AŞAMA 2: Servis Programı Sheetleri (3 adet) - PARALEL
-        # =====================================================================
-        if _progress_callback: _progress_callback(0.40, "Servis Programı okunuyor (3 Sheet Paralel)...")
-        
-        saha_years = ["2024", "2025", "2026"]
-        
-        def fetch_saha(year):
-            try:
-                data = fetch_sheet_data(spreadsheet_saha, year)
-                if len(data) > 2:
-                    # Saha verileri için header 2. satırda
-                    headers = data[1]
-                    rows = data[2:]
-                    logger.info(f"[Saha] {year}: {len(rows)} satır")
-                    return year, pd.DataFrame(rows, columns=headers)
-                return year, pd.DataFrame()
-            except Exception as e:
-                logger.warning(f"Saha çekme hatası ({year}): {e}")
-                return year, pd.DataFrame()
-
-        saha_results = {}
-        # Rate limit önlemek için sıralı (workers=1) -> Kullanıcı isteği ile PARALEL (3)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {executor.submit(fetch_saha, year): year for year in saha_years}
-            for future in concurrent.futures.as_completed(futures):
-                year, df = future.result()
-                saha_results[year] = df
-        
-        if _progress_callback: _progress_callback(0.60, "Veriler işleniyor...")
-        
-        # =====================================================================
-        # SONUÇLARI AL
-        # =====================================================================
-        df_raw_teklif = results.get("teklif", pd.DataFrame())
-        df_raw_siparis = results.get("siparis", pd.DataFrame())
-        df_raw_musteri = results.get("musteri", pd.DataFrame())
-        df_urun = results.get("urun", pd.DataFrame())
-        df_holidays = results.get("tatiller", pd.DataFrame())
-        df_kurlar = results.get("kurlar", pd.DataFrame())
-        df_personel = results.get("personel", pd.DataFrame())
-        df_sehirler = results.get("sehirler", pd.DataFrame())
-        
-        # Saha verilerini birleştir (saha_results dict'inden)
-        saha_dfs = []
-        for year in ["2024", "2025", "2026"]:
-            df_year = saha_results.get(year, pd.DataFrame())
-            if not df_year.empty:
-                saha_dfs.append(df_year)
-        
-        # =====================================================================
-        # KURLAR İŞLEME (Column name normalization)
-        # =====================================================================
-        monthly_rates = {}
-        if not df_kurlar.empty:
-            # Sütun isimlerini normalize et (küçük harf, boşluk trim)
-            df_kurlar.columns = df_kurlar.columns.str.strip().str.lower()
-            
-            for _, row in df_kurlar.iterrows():
-                try:
-                    def parse(v): return float(str(v).replace(',', '.').replace(' ', '')) if v and str(v).strip() else 1.0
-                    
-                    # Farklı sütun ismi varyasyonlarını dene
-                    yil_val = row.get('yil') or row.get('yıl') or row.get('year') or 0
-                    ay_val = row.get('ay') or row.get('month') or 0
-                    
-                    yil = int(parse(yil_val))
-                    ay = int(parse(ay_val))
-                    
-                    if yil > 0 and ay > 0:
-                        monthly_rates[(yil, ay, 'EUR')] = parse(row.get('eur') or row.get('euro') or 1)
-                        monthly_rates[(yil, ay, 'USD')] = parse(row.get('usd') or row.get('dolar') or 1)
-                        monthly_rates[(yil, ay, 'GBP')] = parse(row.get('gbp') or row.get('sterlin') or 1)
-                        monthly_rates[(yil, ay, 'TL')] = parse(row.get('tl') or row.get('try') or 1)
-                        monthly_rates[(yil, ay, 'TRY')] = parse(row.get('tl') or row.get('try') or 1)
-                except:
-                    continue
-        
-        # Tatiller
-        holidays = set()
-        if not df_holidays.empty and 'Tarih' in df_holidays.columns:
-             dates = pd.to_datetime(df_holidays['Tarih'], dayfirst=True, errors='coerce').dt.date.dropna()
-             holidays = set(dates.tolist())
-        
-        # Ürünler
-        if not df_urun.empty:
-             df_urun["Musteri"] = df_urun["Musteri"].astype(str).str.strip().str.upper()
+                    save_frozen_tab(archive_path, df)
+                return year, df, True, True
 
-        if _progress_callback: _progress_callback(0.80, "Finansal veriler işleniyor...")
+            previous = previous_tabs.get(year)
+            start_pos = _saha_window_start(previous) if int(year) == current_year else None
+            if start_pos is not None and not full_refresh_due:
+                df = _fetch_saha_window(spreadsheet_saha, year, previous, start_pos)
+                if df is not None:
+                    return year, df, True, True
+            return year, fetch_full(year), True, True
+        except Exception as e:
+            # Son geçerli sekme korunur (boş tablo ile ezilmez); sürüm kaydedilmez -> tekrar denenir
+            logger.warning(f"Saha çekme hatası ({year}): {e}")
+            return year, previous_tabs.get(year, pd.DataFrame()), False, False
 
-        # =====================================================================
-        # FİNANSAL İŞLEME
-        # =====================================================================
-        df_teklif_processed = process_finance_dataframe(df_raw_teklif, "Teklif_No", monthly_rates, PERSONEL_MAP)
-        df_teklif_processed = df_teklif_processed[df_teklif_processed["Tutar_EUR"] != 0]
+    saha_results = {}
+    all_ok = True
+    # Rate limit önlemek için sıralı (workers=1) -> Kullanıcı isteği ile PARALEL (3)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {executor.submit(fetch_saha, year): year for year in SAHA_YEARS}
+        for future in concurrent.futures.as_completed(futures):
+            year, df, ok, fetched = future.result()
+            all_ok = all_ok and ok
+            saha_results[year] = df
+            if fetched:
+                sync.update_tab(SAHA_SHEETS_NAME, year, df)
 
-        df_siparis_processed = process_finance_dataframe(df_raw_siparis, "Siparis_No", monthly_rates, PERSONEL_MAP)
-        df_siparis_processed = df_siparis_processed[df_siparis_processed["Tutar_EUR"] != 0]
-        
-        # Müşteri Temizliği
-        df_raw_musteri["Sorumlu_Clean"] = df_raw_musteri["Sorumlu"].apply(
-            lambda x: "BOŞ / SAHİPSİZ" if pd.isna(x) or str(x).strip() == "" else tr_upper(str(x).strip())
+    if all_ok:
+        sync.mark_file_synced(SAHA_SHEETS_NAME, version)
+        if full_refresh_due:
+            _saha_last_full_fetch = datetime.now()
+    return saha_results
+
+
+def build_data_packet(_progress_callback=None) -> Dict[str, Any]:
+    """
+    Tüm verileri Google Sheets'ten çekip işleyen fonksiyon (İKİ AŞAMALI PARALEL Veri Çekme).
+    Artımlı çalışır: değişmeyen dosyalar çekilmez, değişmeyen sekmeler yeniden işlenmez.
+    Önbelleksizdir; hata durumunda exception fırlatır.
+    """
+    if _progress_callback: _progress_callback(0.05, "Bağlantı kuruluyor...")
+
+    source = get_data_source()
+    sync = get_sync_state()
+
+    # İki farklı spreadsheet (backend ayara göre: gspread / local / synthetic)
+    spreadsheet_dhe = source.open(GOOGLE_SHEETS_NAME)
+    spreadsheet_saha = source.open(SAHA_SHEETS_NAME)
+
+    # =====================================================================
+    # AŞAMA 1: DHE_Data Sheetleri (8 adet) - TEK TOPLU İSTEK (batch_get)
+    # =====================================================================
+    if _progress_callback: _progress_callback(0.10, "DHE_Data okunuyor (8 Sheet Toplu)...")
+    results = _sync_dhe_tabs(spreadsheet_dhe, sync)
+
+    # =====================================================================
+    # AŞAMA 2: Servis Programı Sheetleri (3 adet) - PARALEL
+    # =====================================================================
+    if _progress_callback: _progress_callback(0.40, "Servis Programı okunuyor (3 Sheet Paralel)...")
+    saha_results = _sync_saha_tabs(spreadsheet_saha, sync)
+
+    if _progress_callback: _progress_callback(0.60, "Veriler işleniyor...")
+
+    # =====================================================================
+    # SONUÇLARI AL
+    # =====================================================================
+    empty = pd.DataFrame()
+    dhe = lambda key: (GOOGLE_SHEETS_NAME, key)
+
+    # Saha verilerini birleştir (saha_results dict'inden)
+    saha_dfs = [saha_results[y] for y in SAHA_YEARS if not saha_results.get(y, empty).empty]
+
+    # =====================================================================
+    # KURLAR, TATİLLER, ÜRÜNLER
+    # =====================================================================
+    monthly_rates = sync.run_stage(
+        "kurlar", [dhe("kurlar")],
+        lambda: parse_kurlar(results.get("kurlar", empty))
+    )
+    holidays = sync.run_stage(
+        "tatiller", [dhe("tatiller")],
+        lambda: parse_holidays(results.get("tatiller", empty))
+    )
+    df_urun = sync.run_stage(
+        "urun", [dhe("urun")],
+        lambda: process_urun(results.get("urun", empty))
+    )
+
+    if _progress_callback: _progress_callback(0.80, "Finansal veriler işleniyor...")
+
+    # =====================================================================
+    # FİNANSAL İŞLEME + CRM
+    # =====================================================================
+    finance = sync.run_stage(
+        "finans", [dhe("teklif"), dhe("siparis"), dhe("musteri"), dhe("kurlar")],
+        lambda: process_finance(
+            results.get("teklif", empty), results.get("siparis", empty),
+            results.get("musteri", empty), monthly_rates
         )
-        
-        # Teklif/Sipariş Ayrımı
-        siparis_ids = set(df_siparis_processed["Siparis_No"].unique())
-        df_teklif_acik = df_teklif_processed[~df_teklif_processed["Teklif_No"].isin(siparis_ids)].copy()
-        df_teklif_acik["Durum"] = "Teklif"
-        
-        df_siparis_final = df_siparis_processed.copy()
-        df_siparis_final["Durum"] = "Sipariş"
-        df_siparis_final["Teklif_No"] = df_siparis_final["Siparis_No"]
-        
-        # CRM
-        df_crm = prepare_crm_data(df_teklif_processed, df_siparis_final, df_raw_musteri)
-        
-        # =====================================================================
-        # SAHA VERİSİ İŞLEME (Daha önce load_saha_data'daydı)
-        # =====================================================================
-        df_saha = pd.DataFrame()
-        df_saha_personel = pd.DataFrame()
-        
-        if saha_dfs:
-            # Birleştirme ve Temizlik
-            cleaned_dfs = [df.loc[:, ~df.columns.duplicated()] for df in saha_dfs]
-            df_saha = pd.concat(cleaned_dfs, ignore_index=True)
-            
-            # Boş sütunları temizle
-            df_saha = df_saha.loc[:, df_saha.columns.str.strip() != '']
-            
-            # Tarih temizliği
-            if 'Tarih' in df_saha.columns:
-                df_saha = df_saha[df_saha['Tarih'].astype(str).str.strip() != ''].copy()
-                df_saha['Tarih'] = pd.to_datetime(df_saha['Tarih'], dayfirst=True, errors='coerce')
-                df_saha['Ay'] = df_saha['Tarih'].dt.month
-                df_saha['Yil'] = df_saha['Tarih'].dt.year
-
-            # Teknisyen İsimleri Normalize
-            for col in ['Teknisyen 1', 'Teknisyen 2']:
-                if col in df_saha.columns:
-                    df_saha[col] = df_saha[col].apply(normalize_personel_name)
-
-            if 'Teknisyen 1' in df_saha.columns:
-                df_saha = df_saha[df_saha['Teknisyen 1'] != ''].copy()
-            
-            # Durum Belirleme
-            df_saha['Durum'] = df_saha.apply(determine_saha_status, axis=1)
-            
-            # Personel (Paralel çekildi, burada kullanılıyor)
-            df_saha_personel = df_personel
-        
-        logger.info(f"[load_data] Tüm veriler yüklendi - Paralel 11 sheet")
-        
-        return {
-            "teklif": df_teklif_acik,
-            "siparis": df_siparis_final,
-            "musteri": df_raw_musteri,
-            "all_quotes": df_teklif_processed,
-            "crm": df_crm,
-            "urun": df_urun,
-            "holidays": holidays,
-            "saha": df_saha,
-            "saha_personel": df_saha_personel,
-            "sehirler": df_sehirler,
-        }
-        
+    )
+
+    # Müşteri analitiği (RFM / dönüşüm / CLV) - CRM sayfası sadece filtreler
+    df_musteri_analiz = sync.run_stage(
+        "musteri_analiz", [dhe("teklif"), dhe("siparis"), dhe("musteri"), dhe("kurlar")],
+        lambda: build_customer_analytics(finance["crm"], finance["all_quotes"], finance["siparis"])
+    )
+
+    # Satış küpü (Servis Performansı KPI / personel / dönüşüm kartları ve yıllık grafik)
+    df_satis_kupu = sync.run_stage(
+        "satis_kupu", [dhe("teklif"), dhe("siparis"), dhe("kurlar")],
+        lambda: build_sales_cube(finance["siparis"], finance["all_quotes"])
+    )
+
+    # =====================================================================
+    # SAHA VERİSİ İŞLEME (Daha önce load_saha_data'daydı)
+    # =====================================================================
+    df_saha = sync.run_stage(
+        "saha", [(SAHA_SHEETS_NAME, y) for y in SAHA_YEARS],
+        lambda: process_saha(saha_dfs)
+    )
+
+    # İş günü takvimi (tatil duyarlı prefix-sum) saha veri aralığı için önceden kurulur;
+    # görünümlerdeki kapasite / efektif iş günü hesapları bu önbellekten okunur.
+    if not df_saha.empty and 'Tarih' in df_saha.columns:
+        get_workday_calendar(holidays, df_saha['Tarih'].min(), df_saha['Tarih'].max())
+
+    # Teknisyen-gün olgu tablosu (saha KPI'ları için, tatil bayraklarıyla)
+    df_saha_gun = sync.run_stage(
+        "saha_gun", [(SAHA_SHEETS_NAME, y) for y in SAHA_YEARS] + [dhe("tatiller")],
+        lambda: build_technician_days(df_saha, holidays)
+    )
+
+    # Personel (Paralel çekildi, burada kullanılıyor)
+    df_saha_personel = results.get("personel", empty) if not df_saha.empty else empty
+
+    logger.info("[load_data] Tüm veriler yüklendi")
+
+    packet = {
+        "teklif": finance["teklif"],
+        "siparis": finance["siparis"],
+        "musteri": finance["musteri"],
+        "all_quotes": finance["all_quotes"],
+        "crm": finance["crm"],
+        "musteri_analiz": df_musteri_analiz,
+        "satis_kupu": df_satis_kupu,
+        "urun": df_urun,
+        "holidays": holidays,
+        "saha": df_saha,
+        "saha_gun": df_saha_gun,
+        "saha_personel": df_saha_personel,
+        "sehirler": results.get("sehirler", empty),
+    }
+
+    # Tip sözleşmesi + düşük kardinaliteli metin sütunları -> Categorical (önbellekteki paket küçülür)
+    packet = apply_packet_schema(packet)
+    total_mb = sum(packet_memory_usage(packet).values()) / 1e6
+    logger.info(f"[Schema] data_packet bellek kullanımı: {total_mb:.1f} MB")
+    return packet
+
+
+# =============================================================================
+# SNAPSHOT + ARKA PLAN YENİLEME
+# =============================================================================
+_last_saved_generation = None
+_snapshot_lock = threading.Lock()
+
+
+def _persist_snapshot(packet: Dict[str, Any]):
+    """Paket son kayıttan beri değiştiyse diske snapshot olarak yazar."""
+    global _last_saved_generation
+    generation = get_sync_state().generation
+    with _snapshot_lock:
+        if not packet or generation == _last_saved_generation:
+            return
+        if save_snapshot(packet):
+            _last_saved_generation = generation
+
+
+def _build_and_persist() -> Dict[str, Any]:
+    packet = build_data_packet()
+    _persist_snapshot(packet)
+    return packet
+
+
+def _load_snapshot_packet() -> Optional[Dict[str, Any]]:
+    """Son snapshot'ı okur; eski (tipleri düzenlenmemiş) snapshot'lar da tip sözleşmesine uydurulur."""
+    return apply_packet_schema(load_latest_snapshot())
+
+
+def _probe_sheet_versions() -> tuple:
+    """İki dosyanın Drive sürümlerini okur (sekme verisi çekilmez)."""
+    source = get_data_source()
+    sync = get_sync_state()
+    return tuple(
+        sync.fetch_file_version(source.open(name))
+        for name in (GOOGLE_SHEETS_NAME, SAHA_SHEETS_NAME)
+    )
+
+
+_REFRESHER = DataRefresher(
+    builder=_build_and_persist,
+    initial_loader=_load_snapshot_packet,
+    change_probe=_probe_sheet_versions,
+    interval=REFRESH_CONFIG.get("INTERVAL_SECONDS", 900),
+    poll_interval=REFRESH_CONFIG.get("CHANGE_POLL_SECONDS", 60),
+    background=REFRESH_CONFIG.get("ENABLED", True),
+)
+
+
+def get_data_refresher() -> DataRefresher:
+    """Süreç genelindeki tekil veri yenileyiciyi döndürür."""
+    return _REFRESHER
+
+
+def load_data(_progress_callback=None) -> Dict[str, pd.DataFrame]:
+    """
+    Tüm verileri yükleyen ana fonksiyon.
+    Arka plan yenileyicinin son geçerli paketini döndürür; istek akışında veri çekilmez.
+    Sadece süreçteki ilk çağrıda (snapshot da yoksa) paket senkron oluşturulur.
+    """
+    try:
+        return _REFRESHER.get_packet()
     except Exception as e:
         logger.exception("Veri yükleme hatası")
         st.error(f"Kritik hata: {e}")
@@ -0,0 +1,337 @@
+"""
+DHE Dashboard - Veri Kaynakları (Core)
+======================================
+load_data'nın okuduğu dosyaları soyutlar. Her backend, dosya adına göre
+gspread.Spreadsheet okuma API'sini (worksheet, values_get, values_batch_get,
+fetch_sheet_metadata, get_lastUpdateTime) sağlayan bir handle döndürür;
+böylece core.gsheets ve core.data_loader değişmeden tüm backend'lerle çalışır.
+
+Backend'ler:
+- gspread   : Canlı Google Sheets
+- local     : Yerel CSV / XLSX / Parquet dışa aktarımları
+- synthetic : core.synthetic ile seed'li üretilen veri
+"""
+import os
+import re
+import csv
+import hashlib
+import logging
+import threading
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+import gspread
+import pandas as pd
+
+from config.constants import DATA_SOURCE_CONFIG
+from core.sync import get_sync_state
+
+logger = logging.getLogger(__name__)
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_A1_PATTERN = re.compile(r"^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$")
+
+
+def _column_index(letters: str) -> int:
+    """A1 sütun harfini 1 tabanlı sayıya çevirir (A -> 1, AZ -> 52)."""
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index
+
+
+def split_range_name(range_name: str):
+    """"'Sekme''1'!A6:H" -> ("Sekme'1", "A6:H")"""
+    if range_name.startswith("'"):
+        end = 1
+        while True:
+            end = range_name.index("'", end)
+            if range_name[end:end + 2] == "''":
+                end += 2
+                continue
+            break
+        sheet = range_name[1:end].replace("''", "'")
+        rest = range_name[end + 1:]
+        return sheet, rest[1:] if rest.startswith("!") else ""
+    if "!" in range_name:
+        sheet, a1 = range_name.split("!", 1)
+        return sheet, a1
+    return range_name, ""
+
+
+def _trim(rows: List[List[str]]) -> List[List[str]]:
+    """API gibi sondaki boş hücreleri ve boş satırları kırpar."""
+    trimmed = []
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        trimmed.append(row[:end])
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+# =============================================================================
+# BELLEK İÇİ SPREADSHEET (local + synthetic backend'leri için)
+# =============================================================================
+class TableWorksheet:
+    def __init__(self, title: str, values: List[List[str]]):
+        self.title = title
+        self._values = values
+
+    def get_all_values(self) -> List[List[str]]:
+        return [row[:] for row in self._values]
+
+
+class TableSpreadsheet:
+    """gspread.Spreadsheet okuma API'sinin bellek içi karşılığı."""
+
+    # Yerel kaynak: Google API kotası harcanmaz
+    bypass_quota = True
+
+    def __init__(self, title: str, tabs: Dict[str, List[List[str]]], version: Optional[str] = None):
+        self.title = title
+        self.version = version or "static"
+        self._tabs = {}
+        for name, rows in tabs.items():
+            # get_all_values gibi tüm satırları aynı genişliğe tamamla
+            width = max((len(r) for r in rows), default=0)
+            self._tabs[name] = [[str(c) for c in r] + [""] * (width - len(r)) for r in rows]
+
+    def get_lastUpdateTime(self) -> str:
+        return self.version
+
+    def worksheets(self) -> List[TableWorksheet]:
+        return [TableWorksheet(name, rows) for name, rows in self._tabs.items()]
+
+    def worksheet(self, title: str) -> TableWorksheet:
+        if title not in self._tabs:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return TableWorksheet(title, self._tabs[title])
+
+    def fetch_sheet_metadata(self, params=None) -> dict:
+        return {"sheets": [{"properties": {"title": name}} for name in self._tabs]}
+
+    def values_get(self, range_name: str, params=None) -> dict:
+        sheet, a1 = split_range_name(range_name)
+        if sheet not in self._tabs:
+            raise gspread.exceptions.WorksheetNotFound(sheet)
+        rows = self._tabs[sheet]
+
+        match = _A1_PATTERN.match(a1) if a1 else None
+        if match:
+            c1, r1, c2, r2 = match.groups()
+            row_start = int(r1) - 1 if r1 else 0
+            row_end = int(r2) if r2 else len(rows)
+            col_start = _column_index(c1) - 1 if c1 else 0
+            col_end = _column_index(c2) if c2 else None
+            rows = [r[col_start:col_end] for r in rows[row_start:row_end]]
+        return {"range": range_name, "majorDimension": "ROWS", "values": _trim(rows)}
+
+    def values_batch_get(self, ranges: List[str], params=None) -> dict:
+        return {"valueRanges": [self.values_get(r) for r in ranges]}
+
+
+# =============================================================================
+# BACKEND'LER
+# =============================================================================
+class DataSource:
+    """Dosya adına göre spreadsheet handle'ı döndüren veri kaynağı arayüzü."""
+
+    name = "base"
+
+    @property
+    def storage_key(self) -> str:
+        """Disk önbelleklerinin (snapshot, Saha arşivi) kaynağa göre ayrıldığı klasör adı."""
+        return self.name
+
+    def open(self, file_name: str):
+        raise NotImplementedError
+
+
+class GSpreadSource(DataSource):
+    """Canlı Google Sheets (paylaşılan istemci + handle önbelleği)."""
+
+    name = "gspread"
+
+    def open(self, file_name: str):
+        from core.gsheets import get_gspread_client, open_spreadsheet
+        return open_spreadsheet(get_gspread_client(), file_name)
+
+
+class LocalDirSource(DataSource):
+    """
+    Yerel dışa aktarımlar. Her dosya için iki düzen desteklenir:
+        <root>/<dosya adı>/<sekme>.csv | .xlsx | .parquet   (sekme başına bir dosya)
+        <root>/<dosya adı>.xlsx                             (sekme başına bir sayfa)
+    CSV/XLSX hücreleri olduğu gibi (başlık satırları dahil) okunur;
+    Parquet dosyalarında sütun adları ilk satır kabul edilir.
+    """
+
+    name = "local"
+    EXTENSIONS = (".csv", ".xlsx", ".parquet")
+
+    def __init__(self, root: str):
+        self.root = root if os.path.isabs(root) else os.path.join(BASE_PATH, root)
+        self._cache: Dict[str, TableSpreadsheet] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def storage_key(self) -> str:
+        digest = hashlib.sha1(os.path.abspath(self.root).encode("utf-8")).hexdigest()[:8]
+        return f"{self.name}_{digest}"
+
+    def _files(self, file_name: str) -> List[str]:
+        folder = os.path.join(self.root, file_name)
+        files = []
+        if os.path.isdir(folder):
+            files += [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.lower().endswith(self.EXTENSIONS)]
+        workbook = os.path.join(self.root, f"{file_name}.xlsx")
+        if os.path.isfile(workbook):
+            files.append(workbook)
+        return files
+
+    def open(self, file_name: str) -> TableSpreadsheet:
+        files = self._files(file_name)
+        if not files:
+            raise FileNotFoundError(f"Yerel veri bulunamadı: {os.path.join(self.root, file_name)}")
+        version = str(max(os.path.getmtime(f) for f in files))
+
+        with self._lock:
+            cached = self._cache.get(file_name)
+            if cached is not None and cached.version == version:
+                return cached
+
+        workbook = os.path.join(self.root, f"{file_name}.xlsx")
+        tabs = {}
+        for path in files:
+            stem, ext = os.path.splitext(os.path.basename(path))
+            ext = ext.lower()
+            if ext == ".csv":
+                tabs[stem] = _read_csv(path)
+            elif ext == ".parquet":
+                tabs[stem] = _read_parquet(path)
+            elif path == workbook:
+                tabs.update(_read_workbook(path))
+            else:
+                tabs[stem] = next(iter(_read_workbook(path).values()), [])
+
+        spreadsheet = TableSpreadsheet(file_name, tabs, version)
+        logger.info(f"[Local] {file_name}: {len(tabs)} sekme okundu")
+        with self._lock:
+            self._cache[file_name] = spreadsheet
+        return spreadsheet
+
+
+class SyntheticSource(DataSource):
+    """core.synthetic ile üretilen, seed'e göre tekrarlanabilir veri."""
+
+    name = "synthetic"
+
+    def __init__(self, seed: int = 42, scale: float = 1.0, generator: Optional[Callable] = None):
+        self.seed = seed
+        self.scale = scale
+        self._generator = generator
+        self._workbooks: Optional[Dict[str, TableSpreadsheet]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def storage_key(self) -> str:
+        return f"{self.name}_{self.seed}_{self.scale}"
+
+    def open(self, file_name: str) -> TableSpreadsheet:
+        with self._lock:
+            if self._workbooks is None:
+                if self._generator is None:
+                    from core.synthetic import generate_workbooks
+                    self._generator = generate_workbooks
+                version = f"synthetic-{self.seed}-{self.scale}"
+                self._workbooks = {
+                    name: TableSpreadsheet(name, tabs, version)
+                    for name, tabs in self._generator(seed=self.seed, scale=self.scale).items()
+                }
+        if file_name not in self._workbooks:
+            raise FileNotFoundError(f"Sentetik veride dosya yok: {file_name}")
+        return self._workbooks[file_name]
+
+
+# =============================================================================
+# DOSYA OKUYUCULAR (Hücreler metin olarak, Sheets FORMATTED_VALUE gibi)
+# =============================================================================
+def _cell_text(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d.%m.%Y")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _read_csv(path: str) -> List[List[str]]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [row for row in csv.reader(f)]
+
+
+def _read_parquet(path: str) -> List[List[str]]:
+    df = pd.read_parquet(path)
+    rows = [[_cell_text(v) for v in row] for row in df.itertuples(index=False, name=None)]
+    return [[str(c) for c in df.columns]] + rows
+
+
+def _read_workbook(path: str) -> Dict[str, List[List[str]]]:
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {
+            ws.title: [[_cell_text(v) for v in row] for row in ws.iter_rows(values_only=True)]
+            for ws in workbook.worksheets
+        }
+    finally:
+        workbook.close()
+
+
+# =============================================================================
+# SEÇİM
+# =============================================================================
+def create_data_source(backend: Optional[str] = None) -> DataSource:
+    """Ayar veya argümana göre backend oluşturur."""
+    backend = (backend or os.environ.get("DHE_DATA_SOURCE") or DATA_SOURCE_CONFIG.get("BACKEND", "gspread")).lower()
+    if backend == "gspread":
+        return GSpreadSource()
+    if backend == "local":
+        return LocalDirSource(DATA_SOURCE_CONFIG.get("LOCAL_DIR", "data/local_sheets"))
+    if backend == "synthetic":
+        return SyntheticSource(
+            seed=DATA_SOURCE_CONFIG.get("SYNTHETIC_SEED", 42),
+            scale=DATA_SOURCE_CONFIG.get("SYNTHETIC_SCALE", 1.0),
+        )
+    raise ValueError(f"Bilinmeyen veri kaynağı: {backend}")
+
+
+_DATA_SOURCE: Optional[DataSource] = None
+_DATA_SOURCE_LOCK = threading.Lock()
+
+
+def get_data_source() -> DataSource:
+    """Süreç genelinde kullanılan veri kaynağını döndürür."""
+    global _DATA_SOURCE
+    with _DATA_SOURCE_LOCK:
+        if _DATA_SOURCE is None:
+            _DATA_SOURCE = create_data_source()
+            logger.info(f"[DataSource] Backend: {_DATA_SOURCE.name}")
+        return _DATA_SOURCE
+
+
+def set_data_source(source: Optional[DataSource]):
+    """
+    Veri kaynağını değiştirir (benchmark/test). None -> ayardan yeniden seçilir.
+    Önceki kaynaktan çekilen sekmeler yeni kaynağın verisi sayılmasın diye
+    senkronizasyon durumu sıfırlanır.
+    """
+    global _DATA_SOURCE
+    with _DATA_SOURCE_LOCK:
+        _DATA_SOURCE = source
+    get_sync_state().reset()
@@ -0,0 +1,161 @@
+"""
+DHE Dashboard - Teknisyen-Gün Olgu Tablosu (Core)
+=================================================
+Servis Programı (saha) kayıtlarını yükleme sırasında bir kez uzun formata çevirir:
+her (kayıt, teknisyen) için bir satır. Teknisyen 1 ve Teknisyen 2 ayrı satırlara
+açılır; hafta içi / tatil / iş günü bayrakları ve işlem kategorisi hazır gelir.
+
+Saha görünümündeki tüm KPI'lar (sahada / izin / atölye günleri, işlem sayıları,
+aylık adam-gün ve şehir dağılımı) bu tablo üzerinde tek bir groupby ile hesaplanır;
+teknisyen başına Teknisyen 1/2 maskeleri ve döngüler gerekmez.
+"""
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.utils import tr_upper_series
+from core.workdays import normalize_holidays
+
+logger = logging.getLogger(__name__)
+
+TECHNICIAN_COLUMNS = ("Teknisyen 1", "Teknisyen 2")
+# Olgu tablosuna taşınan saha sütunları (varsa)
+FACT_COLUMNS = ["Tarih", "Yil", "Ay", "Durum", "Müşteri", "Şehir", "İşlem"]
+
+# İşlem kategorileri (performans tablolarındaki sütunlar)
+ISLEM_KATEGORILERI = {
+    "BAKIM": "Bakım",
+    "ARIZA": "Arıza",
+    "ARIZA+BAKIM": "Arıza",
+    "DEVREYE ALMA": "Devreye Alma",
+}
+ISLEM_DIGER = "Diğer"
+
+SUMMARY_COLUMNS = ["Sahada", "Izin", "Sahada_HI", "Izin_HI", "Bakım", "Arıza", "Devreye Alma", "Diğer"]
+
+
+def _holiday_mask(dates: pd.Series, holidays) -> pd.Series:
+    if not holidays:
+        return pd.Series(False, index=dates.index)
+    days = dates.to_numpy().astype("datetime64[D]")
+    return pd.Series(np.isin(days, normalize_holidays(holidays)), index=dates.index)
+
+
+def build_technician_days(df_saha: pd.DataFrame, holidays: Optional[set] = None) -> pd.DataFrame:
+    """
+    Saha kayıtlarından teknisyen-gün olgu tablosunu üretir.
+
+    Sütunlar: Kayit (kaynak satır sırası), Rol (1/2), Teknisyen, Tarih, Yil, Ay, Durum,
+    Müşteri, Şehir, İşlem, Islem_Kategori, Hafta_Ici, Tatil, Is_Gunu.
+    Boş teknisyen hücreleri ve Teknisyen 2 = Teknisyen 1 tekrarları atlanır; böylece
+    bir teknisyenin kayıt sayısı eski "T1 == x | T2 == x" maskesiyle aynıdır.
+    """
+    if df_saha is None or df_saha.empty or "Teknisyen 1" not in df_saha.columns:
+        return pd.DataFrame(columns=["Kayit", "Rol", "Teknisyen"] + FACT_COLUMNS +
+                            ["Islem_Kategori", "Hafta_Ici", "Tatil", "Is_Gunu"])
+
+    base_cols = [c for c in FACT_COLUMNS if c in df_saha.columns]
+    base = df_saha[base_cols].reset_index(drop=True)
+    base.insert(0, "Kayit", np.arange(len(base)))
+
+    first = df_saha["Teknisyen 1"].astype(object).where(df_saha["Teknisyen 1"].notna(), "").to_numpy()
+    parts = []
+    for rol, col in enumerate(TECHNICIAN_COLUMNS, start=1):
+        if col not in df_saha.columns:
+            continue
+        names = df_saha[col].astype(object).where(df_saha[col].notna(), "").to_numpy()
+        keep = names != ""
+        if rol == 2:
+            keep &= names != first
+        part = base[keep].copy()
+        part.insert(1, "Rol", rol)
+        part.insert(2, "Teknisyen", names[keep])
+        parts.append(part)
+
+    facts = pd.concat(parts, ignore_index=True).sort_values(["Kayit", "Rol"], kind="stable", ignore_index=True)
+    facts["Teknisyen"] = facts["Teknisyen"].astype("str")
+
+    if "Tarih" in facts.columns:
+        facts["Tarih"] = facts["Tarih"].dt.normalize()
+        facts["Hafta_Ici"] = (facts["Tarih"].dt.dayofweek < 5).to_numpy()
+        facts["Tatil"] = _holiday_mask(facts["Tarih"], holidays).to_numpy()
+        facts["Is_Gunu"] = facts["Hafta_Ici"] & ~facts["Tatil"]
+
+    # Eski hesap düz .str.upper() kullanıyordu: "Bakim" / "ariza" de BAKIM / ARIZA sayılır (İ -> I)
+    if "İşlem" in facts.columns:
+        islem = tr_upper_series(facts["İşlem"]).str.replace("İ", "I", regex=False).str.strip()
+    else:
+        islem = pd.Series("", index=facts.index)
+    facts["Islem_Kategori"] = islem.map(ISLEM_KATEGORILERI).fillna(ISLEM_DIGER).astype("str")
+    logger.info(f"[FieldFacts] {len(df_saha)} saha kaydı -> {len(facts)} teknisyen-gün satırı")
+    return facts
+
+
+def filter_period(facts: pd.DataFrame, year: Optional[int] = None, month: Optional[int] = None) -> pd.DataFrame:
+    """Olgu tablosunu yıl / ay ile süzer (None = filtre yok)."""
+    mask = pd.Series(True, index=facts.index)
+    if year is not None and "Yil" in facts.columns:
+        mask &= facts["Yil"] == year
+    if month is not None and "Ay" in facts.columns:
+        mask &= facts["Ay"] == month
+    return facts[mask]
+
+
+def clip_to_employment(facts: pd.DataFrame, start: pd.Series, end: pd.Series) -> pd.DataFrame:
+    """
+    Her teknisyenin satırlarını işe giriş / çıkış tarihleriyle sınırlar.
+    start / end: Teknisyen adı indeksli tarih serileri (NaT veya eksik = sınır yok).
+    """
+    if facts.empty:
+        return facts
+    names = facts["Teknisyen"].astype(object).to_numpy()
+    starts = pd.to_datetime(start, errors="coerce").reindex(names).to_numpy()
+    ends = pd.to_datetime(end, errors="coerce").reindex(names).to_numpy()
+    dates = facts["Tarih"].to_numpy()
+    mask = (pd.isna(starts) | (dates >= starts)) & (pd.isna(ends) | (dates <= ends))
+    return facts[mask]
+
+
+def summarize_technicians(facts: pd.DataFrame, technicians: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Teknisyen bazlı gün ve işlem sayıları (Teknisyen indeksli).
+        Sahada / Izin       : AKTİF / İZİNLİ benzersiz gün sayısı
+        Sahada_HI / Izin_HI : Aynısı, sadece iş günleri (hafta içi, tatil değil)
+        Bakım ... Diğer     : AKTİF kayıtların işlem kategorisi sayıları
+    technicians verilirse sadece onlar döner (kaydı olmayanlar 0).
+    """
+    if technicians is not None:
+        technicians = list(technicians)
+        facts = facts[facts["Teknisyen"].isin(technicians)]
+
+    if facts.empty:
+        summary = pd.DataFrame(columns=SUMMARY_COLUMNS, dtype="int64")
+    else:
+        status = facts["Durum"].astype(object)
+        dated = facts[facts["Tarih"].notna() & status.isin(["AKTİF", "İZİNLİ"])]
+        days = dated.drop_duplicates(["Teknisyen", "Tarih", "Durum"])
+        day_status = days["Durum"].astype(object).map({"AKTİF": "Sahada", "İZİNLİ": "Izin"})
+
+        counts = [
+            days.groupby(["Teknisyen", day_status], observed=True).size().unstack(fill_value=0),
+            days[days["Is_Gunu"]].groupby(["Teknisyen", day_status + "_HI"], observed=True).size().unstack(fill_value=0),
+            facts[status == "AKTİF"].groupby(["Teknisyen", "Islem_Kategori"], observed=True).size().unstack(fill_value=0),
+        ]
+        summary = pd.concat(counts, axis=1).reindex(columns=SUMMARY_COLUMNS).fillna(0).astype("int64")
+
+    summary.index = summary.index.astype(object)
+    summary.index.name = "Teknisyen"
+    if technicians is not None:
+        summary = summary.reindex(technicians, fill_value=0)
+    return summary
+
+
+def monthly_technician_days(facts: pd.DataFrame) -> pd.Series:
+    """AKTİF adam-gün sayısı (ay -> teknisyen başına benzersiz gün toplamı)."""
+    aktif = facts[(facts["Durum"] == "AKTİF") & facts["Tarih"].notna()]
+    if aktif.empty:
+        return pd.Series(dtype="int64")
+    per_tech = aktif.drop_duplicates(["Ay", "Teknisyen", "Tarih"]).groupby(["Ay", "Teknisyen"], observed=True).size()
+    return per_tech.groupby(level="Ay").sum().sort_index()
@@ -3,8 +3,11 @@ import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
 import logging
+import threading
 from typing import Dict, Optional, List, Any
+from requests.adapters import HTTPAdapter
 from core.utils import retry_on_exception
+from core.quota import rate_limited
 
 logger = logging.getLogger(__name__)
 
@@ -12,19 +15,68 @@ logger = logging.getLogger(__name__)
 CREDENTIALS_PATH = "data/credentials.json"
 SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 
+# HTTP bağlantı havuzu: paralel thread'ler aynı keep-alive bağlantılarını paylaşır
+HTTP_POOL_SIZE = 16
+
+# Süreç genelinde paylaşılan istemci ve dosya handle'ları
+_client = None
+_client_lock = threading.Lock()
+_spreadsheets: Dict[str, Any] = {}
+_spreadsheets_lock = threading.Lock()
+
 @retry_on_exception(max_retries=3, delay=2)
-def get_gspread_client():
-    """Google Sheets API istemcisini döndürür (Singleton pattern)."""
+def _authorize_client():
+    """Credential dosyasını okuyup yeni bir istemci yetkilendirir."""
     creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SCOPE)
     client = gspread.authorize(creds)
+
+    # Varsayılan havuz (10) paralel çekmelerde bağlantı atıyor -> büyüt
+    session = getattr(getattr(client, "http_client", None), "session", None)
+    if session is not None:
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+    logger.info("[GSheets] İstemci yetkilendirildi")
     return client
 
-@retry_on_exception(max_retries=3, delay=2)
-def open_spreadsheet(client, file_name):
-    """Google Sheets dosyasını açar (Retry destekli)."""
+def get_gspread_client():
+    """
+    Google Sheets API istemcisini döndürür (Singleton pattern).
+    İlk çağrıda yetkilendirilir; token yenileme istemcinin oturumu tarafından yapılır.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = _authorize_client()
+        return _client
+
+def reset_gspread_client():
+    """Paylaşılan istemciyi ve dosya handle'larını temizler (credential değişimi vb.)."""
+    global _client
+    with _client_lock:
+        _client = None
+    with _spreadsheets_lock:
+        _spreadsheets.clear()
+
+@rate_limited(cost=2)  # Drive arama + metadata
+def _open_spreadsheet_remote(client, file_name):
     return client.open(file_name)
 
-@retry_on_exception(max_retries=3, delay=2)
+def open_spreadsheet(client, file_name):
+    """
+    Google Sheets dosyasını açar. Handle dosya adına göre önbelleğe alınır,
+    böylece her yüklemede Drive'da isimle arama yapılmaz.
+    """
+    with _spreadsheets_lock:
+        cached = _spreadsheets.get(file_name)
+    if cached is not None and cached[0] is client:
+        return cached[1]
+
+    spreadsheet = _open_spreadsheet_remote(client, file_name)
+    with _spreadsheets_lock:
+        _spreadsheets[file_name] = (client, spreadsheet)
+    return spreadsheet
+
+@rate_limited(cost=2)  # worksheet() metadata + get_all_values
 def fetch_sheet_data(spreadsheet, sheet_name):
     """Sekme verilerini çeker (Retry destekli)."""
     try:
@@ -51,6 +103,75 @@ def fetch_sheet_data(spreadsheet, sheet_name):
             
     return worksheet.get_all_values()
 
+@rate_limited()
+def fetch_sheet_range(spreadsheet, sheet_name: str, a1_range: str) -> List[List[str]]:
+    """
+    Sekmenin sadece belirtilen A1 aralığını çeker (örn: "A500:AZ").
+    Tüm sekmeyi indirmek yerine satır penceresi okumak için kullanılır.
+    """
+    result = spreadsheet.values_get(gspread.utils.absolute_range_name(sheet_name, a1_range))
+    return result.get("values", [])
+
+def fetch_sheet_ranges(spreadsheet, sheet_name: str, a1_ranges: List[str]) -> List[List[List[str]]]:
+    """Aynı sekmenin birden fazla A1 aralığını tek values_batch_get isteğiyle çeker."""
+    return _values_batch_get(spreadsheet, [gspread.utils.absolute_range_name(sheet_name, r) for r in a1_ranges])
+
+def column_letter(col_index: int) -> str:
+    """1 tabanlı sütun numarasını A1 harfine çevirir (1 -> A, 52 -> AZ)."""
+    return gspread.utils.rowcol_to_a1(1, col_index).rstrip("0123456789")
+
+def frame_from_values(data: List[List[str]], sheet_name: str, column_mapping: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Sekme değerlerini (ilk satır başlık) DataFrame'e çevirir ve kolon eşleştirmesini uygular.
+    safe_read_gsheet ve batch_read_gsheets aynı dönüşümü kullanır.
+    """
+    if len(data) < 2:
+        logger.warning(f"'{sheet_name}' sekmesinde veri bulunamadı")
+        return pd.DataFrame()
+
+    # İlk satır başlık, geri kalanı veri
+    headers = data[0]
+    rows = data[1:]
+
+    # batch_get sondaki boş hücreleri kırpar -> başlık genişliğine tamamla
+    width = len(headers)
+    rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+
+    df = pd.DataFrame(rows, columns=headers)
+
+    # Boş satırları temizle
+    df = df.replace('', pd.NA).dropna(how='all')
+
+    if not df.empty and column_mapping:
+        # Sütun isimlerindeki boşlukları temizle
+        df.columns = df.columns.astype(str).str.strip()
+
+        # Case-insensitive mapping hazırlığı
+        lower_to_original = {k.lower(): k for k in column_mapping.keys()}
+
+        # DataFrame sütunlarını normalize et
+        new_columns = []
+        for col in df.columns:
+            col_lower = col.lower()
+            if col_lower in lower_to_original:
+                # Orijinal key'i kullan (örn: "Tarih")
+                new_columns.append(lower_to_original[col_lower])
+            else:
+                new_columns.append(col)
+        df.columns = new_columns
+
+        # Mapping'de olan sütunları seç ve yeniden adlandır
+        cols_to_use = [col for col in df.columns if col in column_mapping]
+
+        missing_cols = set(column_mapping.keys()) - set(df.columns)
+        if missing_cols:
+            logger.warning(f"[{sheet_name}] Eksik sütunlar: {missing_cols}")
+
+        df = df[cols_to_use].rename(columns=column_mapping)
+
+    logger.info(f"[GSheets] {sheet_name}: {len(df)} satır")
+    return df
+
 def safe_read_gsheet(client, spreadsheet, sheet_name: str, column_mapping: Optional[Dict[str, str]] = None) -> pd.DataFrame:
     """
     Google Sheets'ten belirtilen sekmeyi güvenli bir şekilde okur.
@@ -58,53 +179,70 @@ def safe_read_gsheet(client, spreadsheet, sheet_name: str, column_mapping: Optio
     """
     try:
         data = fetch_sheet_data(spreadsheet, sheet_name)
-        
-        if len(data) < 2:
-            logger.warning(f"'{sheet_name}' sekmesinde veri bulunamadı")
-            return pd.DataFrame()
-        
-        # İlk satır başlık, geri kalanı veri
-        headers = data[0]
-        rows = data[1:]
-        
-        df = pd.DataFrame(rows, columns=headers)
-        
-        # Boş satırları temizle
-        df = df.replace('', pd.NA).dropna(how='all')
-        
-        if not df.empty and column_mapping:
-            # Sütun isimlerindeki boşlukları temizle
-            df.columns = df.columns.astype(str).str.strip()
-            
-            # Case-insensitive mapping hazırlığı
-            lower_to_original = {k.lower(): k for k in column_mapping.keys()}
-            
-            # DataFrame sütunlarını normalize et
-            new_columns = []
-            for col in df.columns:
-                col_lower = col.lower()
-                if col_lower in lower_to_original:
-                    # Orijinal key'i kullan (örn: "Tarih")
-                    new_columns.append(lower_to_original[col_lower])
-                else:
-                    new_columns.append(col)
-            df.columns = new_columns
-            
-            # Mapping'de olan sütunları seç ve yeniden adlandır
-            cols_to_use = [col for col in df.columns if col in column_mapping]
-            
-            missing_cols = set(column_mapping.keys()) - set(df.columns)
-            if missing_cols:
-                logger.warning(f"[{sheet_name}] Eksik sütunlar: {missing_cols}")
-            
-            df = df[cols_to_use].rename(columns=column_mapping)
-        
-        logger.info(f"[GSheets] {sheet_name}: {len(df)} satır")
-        return df
-        
+        return frame_from_values(data, sheet_name, column_mapping)
+
     except gspread.exceptions.WorksheetNotFound:
         logger.error(f"'{sheet_name}' sekmesi bulunamadı")
         return pd.DataFrame()
     except Exception as e:
         logger.error(f"Google Sheets okuma hatası ({sheet_name}): {e}")
         return pd.DataFrame()
+
+# =============================================================================
+# TOPLU OKUMA (Tek metadata + tek values_batch_get)
+# =============================================================================
+@rate_limited()
+def fetch_sheet_titles(spreadsheet) -> List[str]:
+    """Dosyadaki tüm sekme adlarını tek bir metadata isteğiyle döndürür."""
+    metadata = spreadsheet.fetch_sheet_metadata(params={"fields": "sheets.properties.title"})
+    return [sheet["properties"]["title"] for sheet in metadata.get("sheets", [])]
+
+@rate_limited()
+def _values_batch_get(spreadsheet, ranges: List[str]) -> List[List[List[str]]]:
+    response = spreadsheet.values_batch_get(ranges)
+    return [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+
+def resolve_sheet_title(titles: List[str], sheet_name: str) -> Optional[str]:
+    """Sekme adını birebir, yoksa büyük/küçük harf duyarsız eşleştirir."""
+    if sheet_name in titles:
+        return sheet_name
+    target = str(sheet_name).strip().lower()
+    for title in titles:
+        if title.strip().lower() == target:
+            return title
+    return None
+
+def batch_read_gsheets(spreadsheet, tasks: Dict[str, tuple]) -> Dict[str, pd.DataFrame]:
+    """
+    Birden fazla sekmeyi 2 API çağrısıyla okur (metadata + values_batch_get).
+
+    Args:
+        spreadsheet: gspread Spreadsheet
+        tasks: anahtar -> (sekme adı, kolon eşleştirmesi). Eşleştirme None ise
+               sekme ham haliyle (ilk satır başlık) döner.
+
+    Bulunamayan sekmeler boş DataFrame döner. API hatası exception olarak fırlatılır.
+    """
+    titles = fetch_sheet_titles(spreadsheet)
+
+    resolved = {}
+    for key, (sheet_name, _) in tasks.items():
+        title = resolve_sheet_title(titles, sheet_name)
+        if title is None:
+            logger.error(f"'{sheet_name}' sekmesi bulunamadı")
+        else:
+            resolved[key] = title
+
+    keys = list(resolved)
+    values = _values_batch_get(spreadsheet, [gspread.utils.absolute_range_name(resolved[k]) for k in keys]) if keys else []
+
+    results = {key: pd.DataFrame() for key in tasks}
+    for key, data in zip(keys, values):
+        sheet_name, mapping = tasks[key]
+        if mapping:
+            results[key] = frame_from_values(data, sheet_name, mapping)
+        elif len(data) > 1:
+            width = len(data[0])
+            rows = [row[:width] + [''] * (width - len(row)) for row in data[1:]]
+            results[key] = pd.DataFrame(rows, columns=data[0])
+    return results
@@ -0,0 +1,151 @@
+"""
+DHE Dashboard - Görünüm Önbelleği (Core)
+========================================
+Streamlit her etkileşimde (sekme değişimi, metrik seçimi) sayfayı baştan çalıştırır.
+Sayfaların filtreye bağlı ara tabloları ve grafik verileri burada
+(paket sürümü, sayfa, filtre demeti) anahtarıyla tutulur:
+- LRU: en uzun süredir kullanılmayan kayıt önce atılır (MAX_ENTRIES, MAX_MB sınırları)
+- Sürüm: anahtar DataRefresher paket sürümünü içerir; yeni paket gelince eski kayıtlar silinir
+- Eski paketi okuyan oturum (yayın sırasında) önbelleği atlar, sonucu doğrudan hesaplar
+Dönen nesneler oturumlar arasında paylaşılır; görünümler bunları değiştirmez (CoW + assign).
+Ayarlar config/constants.py -> VIEW_MEMO_CONFIG.
+"""
+import sys
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import VIEW_MEMO_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(obj: Any) -> int:
+    """Önbellek kaydının yaklaşık bellek boyutu (bayt); tablolar, diziler ve iç içe kaplar."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class ViewMemo:
+    """
+    (paket sürümü, sayfa, filtre demeti) anahtarlı, bellek sınırlı LRU önbellek.
+
+    Args:
+        max_entries: Tutulacak en fazla kayıt sayısı
+        max_bytes: Kayıtların toplam tahmini boyut sınırı
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop_older_versions(self, version: int):
+        """Yeni paket sürümü görüldüğünde önceki sürümlerin kayıtlarını siler (kilit altında)."""
+        if self._version is not None and version <= self._version:
+            return
+        stale = [key for key in self._entries if key[0] != version]
+        for key in stale:
+            self._bytes -= self._entries.pop(key)[1]
+        if stale:
+            logger.info(f"[Memo] Paket v{version}: {len(stale)} eski kayıt silindi")
+        self._version = version
+
+    def _evict(self):
+        """Sınırlar aşıldıkça en eski (LRU) kaydı atar (kilit altında)."""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def get_or_compute(self, version: int, page: str, filters: Hashable, builder: Callable[[], Any]) -> Any:
+        """
+        Kayıt varsa döndürür, yoksa builder() sonucunu saklayıp döndürür.
+        builder kilit dışında çalışır; hata fırlatırsa hiçbir şey saklanmaz.
+        """
+        key = (version, page, filters)
+        with self._lock:
+            self._drop_older_versions(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = builder()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"[Memo] {page} sonucu sınırdan büyük ({size} bayt), önbelleğe alınmadı")
+            return value
+
+        with self._lock:
+            # Hesaplama sırasında yeni paket geldiyse eski sürüm sonucu saklanmaz
+            if self._version is not None and version < self._version:
+                return value
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_MEMO = ViewMemo(
+    max_entries=VIEW_MEMO_CONFIG.get("MAX_ENTRIES", 256),
+    max_bytes=int(VIEW_MEMO_CONFIG.get("MAX_MB", 256) * 1024 * 1024),
+)
+
+
+def get_view_memo() -> ViewMemo:
+    """Süreç genelindeki tekil görünüm önbelleğini döndürür."""
+    return _MEMO
+
+
+def memoize_view(data_packet: Optional[Dict[str, Any]], page: str, filters: Hashable,
+                 builder: Callable[[], Any]) -> Any:
+    """
+    Sayfa sonucunu paket sürümü + filtre demeti ile önbellekten döndürür.
+    Paket yenileyicinin güncel paketi değilse (eski oturum, test) veya önbellek kapalıysa
+    builder doğrudan çalıştırılır.
+    """
+    if not data_packet or not VIEW_MEMO_CONFIG.get("ENABLED", True):
+        return builder()
+    from core.data_loader import get_data_refresher
+    version = get_data_refresher().version_of(data_packet)
+    if version is None:
+        return builder()
+    return _MEMO.get_or_compute(version, page, filters, builder)
@@ -0,0 +1,77 @@
+"""
+DHE Dashboard - Salt-Okunur Sorgu Yardımcıları (Core)
+=====================================================
+Görünümler önbellekteki veri paketini kopyalamadan süzer:
+- Filtreler tek bir satır maskesinde (numpy bool) birleştirilir; "Tümü" / None değerli filtre atlanır.
+- Sonuç tek indeksleme ile döner: önce gereken sütunlar, sonra satırlar seçilir. Maske tüm satırları
+  kapsıyorsa paket tablosuyla veriyi paylaşan sığ bir görünüm döner, veri taşınmaz.
+- Copy-on-Write açıkken dönen tabloya yazmak paketi değiştirmez; görünüm sütun eklerken
+  `.assign` kullanır ve yalnızca yeni sütun için bellek ayrılır.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Filtre uygulanmayacağını belirten seçim değerleri (selectbox "Tümü" seçenekleri)
+ALL_VALUES = ("Tümü", "TÜMÜ")
+
+
+def enable_copy_on_write() -> None:
+    """
+    pandas Copy-on-Write modunu açar (uygulama başlangıcında bir kez çağrılır).
+    pandas 3 ile CoW her zaman açıktır; seçenek sadece pandas 2.x'te ayarlanır.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return
+    if not pd.get_option("mode.copy_on_write"):
+        pd.set_option("mode.copy_on_write", True)
+        logger.info("[Query] pandas Copy-on-Write açıldı")
+
+
+def _is_all(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value in ALL_VALUES)
+
+
+def row_mask(df: pd.DataFrame, filters: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Sütun -> değer filtrelerinden satır maskesi.
+    - Liste / küme / demet değer -> isin, diğerleri -> eşitlik
+    - None veya "Tümü" değerli filtre ve tabloda olmayan sütun atlanır
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in (filters or {}).items():
+        if _is_all(value) or column not in df.columns:
+            continue
+        if isinstance(value, (list, set, tuple, frozenset)):
+            cond = df[column].isin(list(value))
+        else:
+            cond = df[column] == value
+        mask = mask & cond.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def select(df: pd.DataFrame, mask: Optional[np.ndarray] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Maskeye uyan satırların salt-okunur dilimi (açık kopya yok).
+    Sütunlar önce seçilir; maske tüm satırları kapsıyorsa satır seçimi yapılmaz ve
+    sığ kopya döner (CoW ile yazma pakete ulaşmaz).
+    """
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    else:
+        df = df.copy(deep=False)
+    if mask is None:
+        return df
+    mask = np.asarray(mask, dtype=bool)
+    if mask.all():
+        return df
+    return df[mask]
+
+
+def query(df: pd.DataFrame, filters: Optional[Dict[str, Any]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """row_mask + select kısayolu: `query(df_saha, {"Yil": 2025, "Ay": None})`."""
+    return select(df, row_mask(df, filters), columns)
@@ -0,0 +1,200 @@
+"""
+DHE Dashboard - Google API Kota Yönetimi (Core)
+===============================================
+Tüm oturumlar ve thread'ler arasında paylaşılan token bucket ile
+Sheets/Drive API çağrılarını hız sınırlar.
+- 429 / 5xx yanıtlarında üstel bekleme + jitter ile yeniden dener
+- 429 alındığında bucket tüm çağıranlar için soğumaya alınır (retry fırtınası olmaz)
+- Bekleme süresi, reddedilen çağrı ve throttle sayıları metrik olarak tutulur
+"""
+import time
+import random
+import logging
+import functools
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from config.constants import QUOTA_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Yeniden denenecek HTTP kodları (kota + geçici sunucu hataları)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class QuotaExceededError(Exception):
+    """Token bucket'tan zaman aşımı içinde token alınamadığında fırlatılır."""
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """gspread APIError / requests hatasından HTTP kodunu çıkarır."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Kota/geçici sunucu hatası veya bağlantı hatası ise True."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # HTTP kodu olmayan ağ hataları (bağlantı koptu, timeout vb.)
+    return isinstance(error, (ConnectionError, TimeoutError)) or \
+        type(error).__module__.startswith(("requests", "urllib3"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket. rate: saniyedeki token, capacity: burst."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cost: float = 1, timeout: Optional[float] = None) -> float:
+        """
+        Token alınana kadar bekler ve beklenen süreyi döndürür.
+        Zaman aşımında QuotaExceededError fırlatır.
+        """
+        cost = min(cost, self.capacity)
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= cost:
+                    self._tokens -= cost
+                    return now - start
+                wait = max(self._blocked_until - now, (cost - self._tokens) / self.rate)
+
+            if timeout is not None and (time.monotonic() - start) + wait > timeout:
+                raise QuotaExceededError(f"{timeout:.0f} sn içinde API kotası alınamadı")
+            time.sleep(wait)
+
+    def cool_down(self, seconds: float):
+        """Bucket'ı boşaltır ve belirtilen süre boyunca token verilmez."""
+        with self._lock:
+            self._tokens = 0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class QuotaLimiter:
+    """Token bucket + üstel backoff ile API çağrısı yapan paylaşılan limiter."""
+
+    def __init__(self, requests_per_minute: float = 60, burst: float = 10,
+                 acquire_timeout: Optional[float] = 120, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 32.0):
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.acquire_timeout = acquire_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._metrics = {
+            "calls": 0,
+            "retries": 0,
+            "throttled": 0,        # 429 / 5xx yanıt sayısı
+            "rejected": 0,         # Token alınamadığı için reddedilen çağrılar
+            "failed": 0,
+            "wait_seconds": 0.0,   # Token beklemede geçen toplam süre
+            "backoff_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _record(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self._metrics[key] += value
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Üstel bekleme + jitter (0.5x - 1x arası)."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def call(self, func: Callable, *args, cost: float = 1, **kwargs) -> Any:
+        """func'ı kota dahilinde çağırır; geçici hatalarda backoff ile yeniden dener."""
+        name = getattr(func, "__name__", "api")
+        for attempt in range(self.max_retries + 1):
+            try:
+                waited = self.bucket.acquire(cost, timeout=self.acquire_timeout)
+            except QuotaExceededError:
+                self._record(rejected=1)
+                raise
+            with self._lock:
+                self._metrics["calls"] += 1
+                self._metrics["wait_seconds"] += waited
+                self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], waited)
+
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self._record(failed=1)
+                    raise
+
+                delay = self.backoff_delay(attempt)
+                status = _status_code(e)
+                if status == 429:
+                    # Kota doldu: tüm çağıranlar birlikte beklesin
+                    self.bucket.cool_down(delay)
+                self._record(retries=1, throttled=1 if status else 0, backoff_seconds=delay)
+                logger.warning(
+                    f"[Kota] {name} başarısız ({status or type(e).__name__}), "
+                    f"{delay:.1f} sn sonra yeniden denenecek ({attempt + 1}/{self.max_retries})"
+                )
+                time.sleep(delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Metriklerin anlık kopyası (sidebar / benchmark için)."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["avg_wait_seconds"] = metrics["wait_seconds"] / metrics["calls"] if metrics["calls"] else 0.0
+        return metrics
+
+    def reset_metrics(self):
+        with self._lock:
+            for key in self._metrics:
+                self._metrics[key] = 0.0 if isinstance(self._metrics[key], float) else 0
+
+
+_LIMITER = QuotaLimiter(
+    requests_per_minute=QUOTA_CONFIG.get("REQUESTS_PER_MINUTE", 60),
+    burst=QUOTA_CONFIG.get("BURST", 10),
+    acquire_timeout=QUOTA_CONFIG.get("ACQUIRE_TIMEOUT", 120),
+    max_retries=QUOTA_CONFIG.get("MAX_RETRIES", 5),
+    backoff_base=QUOTA_CONFIG.get("BACKOFF_BASE", 1.0),
+    backoff_max=QUOTA_CONFIG.get("BACKOFF_MAX", 32.0),
+)
+
+
+def get_quota_limiter() -> QuotaLimiter:
+    """Süreç genelindeki tekil limiter'ı döndürür."""
+    return _LIMITER
+
+
+def rate_limited(cost: float = 1):
+    """
+    API çağrısı yapan fonksiyonu paylaşılan limiter üzerinden çalıştıran decorator.
+
+    Args:
+        cost: Fonksiyonun yaptığı yaklaşık API isteği sayısı
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Yerel/sentetik kaynaklar (bypass_quota) kota harcamaz
+            if args and getattr(args[0], "bypass_quota", False):
+                return func(*args, **kwargs)
+            return _LIMITER.call(func, *args, cost=cost, **kwargs)
+        return wrapper
+    return decorator
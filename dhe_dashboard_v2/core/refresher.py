@@ -0,0 +1,269 @@
+"""
+DHE Dashboard - Arka Plan Veri Yenileyici (Core)
+================================================
+data_packet'i istek akışının dışında, arka plandaki bir thread ile yeniden oluşturur.
+- Periyodik: INTERVAL_SECONDS dolduğunda tam yenileme
+- Değişiklik tetiklemeli: Sheet sürümü (lastUpdateTime) değişince erken yenileme
+- Atomik: Yeni paket tamamen hazır olduğunda tek referans değişimiyle yayınlanır
+Kullanıcılar her zaman son geçerli paketi okur; hata durumunda eski paket korunur.
+"""
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DataRefresher:
+    """
+    Son geçerli data_packet'i tutan ve arka planda yenileyen servis.
+
+    Args:
+        builder: Yeni paketi üreten fonksiyon (hata durumunda exception fırlatır)
+        initial_loader: İlk paketi hızlıca sağlayan fonksiyon (örn: disk snapshot'ı)
+        change_probe: Kaynak sürümünü döndüren hafif fonksiyon (değişiklik tespiti)
+        interval: Tam yenileme periyodu (saniye)
+        poll_interval: Değişiklik kontrol periyodu (saniye)
+        background: False ise thread başlatılmaz (sadece manuel yenileme)
+    """
+
+    def __init__(self, builder: Callable[[], Dict[str, Any]],
+                 initial_loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+                 change_probe: Optional[Callable[[], Any]] = None,
+                 interval: float = 900, poll_interval: float = 60,
+                 background: bool = True):
+        self._builder = builder
+        self._initial_loader = initial_loader
+        self._change_probe = change_probe
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.background = background
+
+        self._lock = threading.Lock()
+        self._finished_cond = threading.Condition(self._lock)
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._packet: Optional[Dict[str, Any]] = None
+        self._version = 0
+        self._source: Optional[str] = None
+        self._built_at: Optional[datetime] = None
+        self._next_refresh_at: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._last_probe: Any = None
+        self._started = 0      # Başlayan / biten yenileme denemeleri (manuel bekleme için)
+        self._finished = 0
+
+    # -------------------------------------------------------------------------
+    # OKUMA (İstek akışı)
+    # -------------------------------------------------------------------------
+    def get_packet(self) -> Dict[str, Any]:
+        """
+        Son geçerli paketi döndürür. Henüz paket yoksa önce snapshot denenir,
+        o da yoksa ilk paket bir kez senkron olarak oluşturulur.
+        """
+        with self._lock:
+            packet = self._packet
+        if packet is None:
+            self._bootstrap()
+            with self._lock:
+                packet = self._packet
+        self.start()
+        return packet or {}
+
+    @property
+    def version(self) -> int:
+        """Her atomik değişimde artan paket sürümü."""
+        with self._lock:
+            return self._version
+
+    def version_of(self, packet: Dict[str, Any]) -> Optional[int]:
+        """Paket şu an yayındaki paketse sürümünü, değilse (eski / dış paket) None döndürür."""
+        with self._lock:
+            if packet is not None and packet is self._packet:
+                return self._version
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        """Sidebar için paket yaşı ve sonraki yenileme bilgisi."""
+        with self._lock:
+            built_at = self._built_at
+            next_at = self._next_refresh_at
+            status = {
+                "version": self._version,
+                "source": self._source,
+                "built_at": built_at,
+                "next_refresh_at": next_at,
+                "last_error": self._last_error,
+                "background": self.is_running(),
+            }
+        now = datetime.now()
+        status["age_seconds"] = (now - built_at).total_seconds() if built_at else None
+        status["next_refresh_seconds"] = max(0.0, (next_at - now).total_seconds()) if next_at else None
+        return status
+
+    # -------------------------------------------------------------------------
+    # YENİLEME
+    # -------------------------------------------------------------------------
+    def refresh_now(self) -> bool:
+        """
+        Paketi senkron olarak yeniden oluşturur ve atomik olarak yayınlar.
+        Aynı anda tek bir yenileme çalışır. Başarılıysa True döner.
+        """
+        with self._build_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        with self._lock:
+            self._started += 1
+        # Sürüm build'den önce okunur: build sırasında gelen değişiklik kaçmaz
+        probe = self._read_probe()
+        try:
+            packet = self._builder()
+        except Exception as e:
+            logger.warning(f"[Refresher] Yenileme başarısız, eski paket korunuyor: {e}")
+            with self._lock:
+                self._last_error = str(e)
+                self._schedule_next()
+            self._finish_attempt()
+            return False
+
+        if not packet:
+            logger.warning("[Refresher] Boş paket üretildi, eski paket korunuyor")
+            with self._lock:
+                self._last_error = "Boş paket"
+                self._schedule_next()
+            self._finish_attempt()
+            return False
+
+        self._last_probe = probe
+        self._publish(packet, source="live")
+        self._finish_attempt()
+        return True
+
+    def _finish_attempt(self):
+        with self._finished_cond:
+            self._finished += 1
+            self._finished_cond.notify_all()
+
+    def request_refresh(self, timeout: Optional[float] = None) -> bool:
+        """
+        Manuel yenileme: thread çalışıyorsa uyandırır, yoksa senkron yeniler.
+        timeout verilirse istekten sonra başlayan yenilemenin bitmesi en fazla timeout
+        saniye beklenir (o an süren yenileme, istekten önce okuduğu için sayılmaz).
+        Yeni paket yayınlandıysa True; beklenmediyse, zaman aşımında veya hatada False döner.
+        """
+        if not self.is_running():
+            return self.refresh_now()
+        with self._lock:
+            target = self._started + 1
+        self._wake.set()
+        if not timeout:
+            return False
+        with self._finished_cond:
+            done = self._finished_cond.wait_for(lambda: self._finished >= target, timeout)
+            return done and self._last_error is None
+
+    def _publish(self, packet: Dict[str, Any], source: str):
+        with self._lock:
+            self._packet = packet
+            self._version += 1
+            self._source = source
+            self._built_at = datetime.now()
+            self._last_error = None
+            self._schedule_next()
+        logger.info(f"[Refresher] Paket yayınlandı (v{self._version}, {source})")
+
+    def _schedule_next(self):
+        self._next_refresh_at = datetime.now() + timedelta(seconds=self.interval)
+
+    def _bootstrap(self):
+        """İlk paketi snapshot'tan veya senkron build ile sağlar (tek sefer)."""
+        with self._build_lock:
+            with self._lock:
+                if self._packet is not None:
+                    return
+            if self._initial_loader is not None:
+                try:
+                    packet = self._initial_loader()
+                except Exception as e:
+                    logger.warning(f"[Refresher] Başlangıç paketi okunamadı: {e}")
+                    packet = None
+                if packet:
+                    self._publish(packet, source="snapshot")
+                    # Snapshot eski olabilir -> thread ilk turda hemen doğrulasın
+                    self._wake.set()
+                    return
+
+            self._refresh_locked()
+
+    # -------------------------------------------------------------------------
+    # ARKA PLAN THREAD'İ
+    # -------------------------------------------------------------------------
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Arka plan thread'ini başlatır (idempotent)."""
+        if not self.background or self.is_running():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-refresher", daemon=True)
+            self._thread.start()
+        logger.info("[Refresher] Arka plan yenileme başlatıldı")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _read_probe(self) -> Any:
+        if self._change_probe is None:
+            return None
+        try:
+            return self._change_probe()
+        except Exception as e:
+            logger.warning(f"[Refresher] Değişiklik kontrolü başarısız: {e}")
+            return None
+
+    def _source_changed(self) -> bool:
+        """Kaynak sürümü son yenilemeden beri değiştiyse True."""
+        probe = self._read_probe()
+        if probe is None:
+            return False
+        if self._last_probe is None:
+            self._last_probe = probe
+            return False
+        return probe != self._last_probe
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                next_at = self._next_refresh_at
+            remaining = (next_at - datetime.now()).total_seconds() if next_at else 0
+            woke = self._wake.wait(timeout=max(0.0, min(self.poll_interval, remaining)))
+            if self._stop.is_set():
+                break
+
+            if woke:
+                self._wake.clear()
+                reason = "istek"
+            elif next_at is None or datetime.now() >= next_at:
+                reason = "periyodik"
+            elif self._source_changed():
+                reason = "sheet değişikliği"
+            else:
+                continue
+
+            logger.info(f"[Refresher] Yenileme başlıyor ({reason})")
+            started = time.perf_counter()
+            if self.refresh_now():
+                logger.info(f"[Refresher] Yenileme tamamlandı ({time.perf_counter() - started:.1f} sn)")
@@ -0,0 +1,148 @@
+"""
+DHE Dashboard - Satış Küpü (Core)
+=================================
+Servis Performansı sayfası için yüklemede bir kez hazırlanan ön-toplamlı küp:
+(Kaynak, Yil, Ay, Personel_Adi, Musteri, Para_Birimi) -> Tutar_EUR, Kar_EUR, Adet
+
+Her ölçü dört revizyon kapsamında tutulur (sütun son eki):
+- ""         : tüm satırlar (revizyonlar dahil)
+- "_Net"     : tüm geçmişe göre en güncel revizyon (Is_Latest_Rev) - yıllık grafik
+- "_Net_Yil" : yıl içinde en güncel revizyon - "Tüm Yıl" dönemi
+- "_Net_Ay"  : yıl+ay içinde en güncel revizyon - tek ay dönemi
+Böylece KPI, personel ve dönüşüm kartları dönem değişiminde ham tabloları kopyalayıp
+revizyon tekilleştirmesi yapmak yerine küp dilimlerini toplar.
+"""
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.transforms import latest_revision_mask, period_revision_mask
+
+logger = logging.getLogger(__name__)
+
+CUBE_DIMENSIONS = ["Kaynak", "Yil", "Ay", "Personel_Adi", "Musteri", "Para_Birimi"]
+CUBE_MEASURES = ["Tutar_EUR", "Kar_EUR", "Adet"]
+REVISION_SCOPES = ["", "_Net", "_Net_Yil", "_Net_Ay"]
+
+# Kaynak -> belge no sütunu
+CUBE_SOURCES = {"siparis": "Siparis_No", "all_quotes": "Teklif_No"}
+
+
+def _revision_flags(df: pd.DataFrame, col_name: str) -> Dict[str, np.ndarray]:
+    """Kapsam son eki -> satır maskesi (yüklemede hesaplanan bayraklar yoksa burada hesaplanır)."""
+    def flag(column, compute):
+        return df[column].to_numpy(dtype=bool) if column in df.columns else compute()
+    return {
+        "": np.ones(len(df), dtype=bool),
+        "_Net": flag("Is_Latest_Rev", lambda: latest_revision_mask(df, col_name).to_numpy(dtype=bool)),
+        "_Net_Yil": flag("Is_Latest_Rev_Yil", lambda: period_revision_mask(df, col_name, ("Yil",))),
+        "_Net_Ay": flag("Is_Latest_Rev_Ay", lambda: period_revision_mask(df, col_name, ("Yil", "Ay"))),
+    }
+
+
+def _source_cube(df: pd.DataFrame, source: str, col_name: str) -> pd.DataFrame:
+    """Tek kaynağın küp satırları (boyutlarda eksik değerler de korunur; toplamlar eksiksiz)."""
+    dims = [d for d in CUBE_DIMENSIONS[1:] if d in df.columns]
+    tutar = df["Tutar_EUR"].to_numpy(dtype=float)
+    kar = df["Kar_EUR"].to_numpy(dtype=float)
+
+    columns = {d: df[d].to_numpy() for d in dims}
+    for suffix, mask in _revision_flags(df, col_name).items():
+        columns[f"Tutar_EUR{suffix}"] = np.where(mask, tutar, 0.0)
+        columns[f"Kar_EUR{suffix}"] = np.where(mask, kar, 0.0)
+        columns[f"Adet{suffix}"] = mask.astype("int64")
+
+    cube = pd.DataFrame(columns).groupby(dims, sort=True, dropna=False, observed=True).sum().reset_index()
+    cube.insert(0, "Kaynak", source)
+    return cube
+
+
+# =============================================================================
+# KÜP OLUŞTURMA
+# =============================================================================
+def build_sales_cube(df_siparis: pd.DataFrame, df_all_quotes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sipariş ve tüm teklif tablolarından satış küpünü üretir (bkz. modül açıklaması).
+    Tablolar process_finance çıktısıdır (Yil, Ay, Tutar_EUR, Kar_EUR + revizyon bayrakları).
+    """
+    frames = []
+    for source, df in (("siparis", df_siparis), ("all_quotes", df_all_quotes)):
+        if df is None or df.empty:
+            continue
+        frames.append(_source_cube(df, source, CUBE_SOURCES[source]))
+    if not frames:
+        return pd.DataFrame(columns=CUBE_DIMENSIONS + [f"{m}{s}" for s in REVISION_SCOPES for m in CUBE_MEASURES])
+
+    cube = pd.concat(frames, ignore_index=True)
+    logger.info(f"[Cube] Satış küpü: {len(cube)} hücre "
+                f"({sum(len(df) for df in (df_siparis, df_all_quotes) if df is not None)} satırdan)")
+    return cube
+
+
+# =============================================================================
+# DİLİMLER
+# =============================================================================
+def net_scope(month: Optional[int] = None) -> str:
+    """Seçili dönemin "Net" kapsamı: tek ay -> ay içi, tüm yıl -> yıl içi tekilleştirme."""
+    return "_Net_Ay" if month is not None else "_Net_Yil"
+
+
+def cube_slice(cube: pd.DataFrame, source: str, year: int, month: Optional[int] = None) -> pd.DataFrame:
+    """Kaynağın yıl (ve ay) dilimi - kopya yok."""
+    mask = (cube["Kaynak"] == source) & (cube["Yil"] == year)
+    if month is not None:
+        mask &= cube["Ay"] == month
+    return cube[mask]
+
+
+def cube_years(cube: pd.DataFrame, source: str = "siparis") -> List[int]:
+    """Kaynakta verisi olan yıllar (azalan)."""
+    years = cube.loc[cube["Kaynak"] == source, "Yil"].dropna().unique()
+    return sorted((int(y) for y in years), reverse=True)
+
+
+def period_totals(cube: pd.DataFrame, source: str, year: int, month: Optional[int] = None) -> Dict[str, float]:
+    """Dönemin net toplamları: Tutar_EUR, Kar_EUR, Adet ve işlem yapılan Musteri sayısı."""
+    scope = net_scope(month)
+    sl = cube_slice(cube, source, year, month)
+    adet = sl[f"Adet{scope}"]
+    return {
+        "Tutar_EUR": sl[f"Tutar_EUR{scope}"].sum(),
+        "Kar_EUR": sl[f"Kar_EUR{scope}"].sum(),
+        "Adet": int(adet.sum()),
+        "Musteri": sl.loc[adet > 0, "Musteri"].nunique(),
+    }
+
+
+def personnel_totals(cube: pd.DataFrame, source: str, year: int, month: Optional[int] = None) -> pd.DataFrame:
+    """Personel_Adi indeksli dönem net toplamları (Tutar_EUR, Kar_EUR, Adet, Musteri sayısı)."""
+    scope = net_scope(month)
+    sl = cube_slice(cube, source, year, month)
+    sl = sl[sl[f"Adet{scope}"] > 0]
+    g = sl.groupby("Personel_Adi", observed=True)
+    return pd.DataFrame({
+        "Tutar_EUR": g[f"Tutar_EUR{scope}"].sum(),
+        "Kar_EUR": g[f"Kar_EUR{scope}"].sum(),
+        "Adet": g[f"Adet{scope}"].sum(),
+        "Musteri": g["Musteri"].nunique(),
+    })
+
+
+def monthly_totals(cube: pd.DataFrame, source: str, measure: str, scope: str = "_Net") -> pd.DataFrame:
+    """Yil x Ay tablosu (ölçü toplamı; varsayılan tüm geçmişe göre net)."""
+    sl = cube[cube["Kaynak"] == source]
+    return sl.groupby(["Yil", "Ay"])[f"{measure}{scope}"].sum().unstack(fill_value=0)
+
+
+def period_rows(df: pd.DataFrame, year: int, month: Optional[int] = None, col_name: str = "Teklif_No") -> pd.DataFrame:
+    """
+    Satır tablosunun dönem içi net dilimi (detay tablosu): yıl/ay + dönem revizyon bayrağı.
+    Bayrak sütunu yoksa (eski snapshot) maske burada hesaplanır.
+    """
+    mask = (df["Yil"] == year).to_numpy()
+    if month is not None:
+        mask = mask & (df["Ay"] == month).to_numpy()
+    flags = _revision_flags(df, col_name)[net_scope(month)] if len(df) else np.zeros(0, dtype=bool)
+    return df[mask & flags]
@@ -0,0 +1,167 @@
+"""
+DHE Dashboard - Veri Tipi Şeması (Core)
+=======================================
+data_packet tablolarının sütun tiplerini tek yerden yönetir.
+- Sekme şemaları (SHEET_SCHEMAS): her sekme çekildiği anda metin/tarih/tutar/tamsayı
+  tiplerine bir kez çevrilir (enforce_schema); sonraki aşamalar tekrar ayrıştırmaz
+- Düşük kardinaliteli metin sütunları (Para_Birimi, Personel_Adi, Durum, Teknisyen 1/2...)
+  pandas Categorical'a çevrilir (DTYPE_CONFIG["CATEGORICAL_COLUMNS"])
+- Görünümlerdeki ==, isin, groupby ve nunique çağrıları tamsayı kodlar üzerinden çalışır
+- Önbellekteki paketin bellek kullanımı düşer; snapshot'ta Arrow dictionary olarak saklanır
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config.constants import DTYPE_CONFIG, SHEET_SCHEMAS
+from core.utils import clean_money_series
+
+logger = logging.getLogger(__name__)
+
+# Paket anahtarı -> sekme şeması (işlenmiş tablolar ham sekmenin sütunlarını taşır)
+PACKET_SCHEMAS = {
+    "teklif": "teklif",
+    "all_quotes": "teklif",
+    "siparis": "siparis",
+    "musteri": "musteri",
+    "urun": "urun",
+    "saha": "saha",
+    "saha_personel": "personel",
+    "sehirler": "sehirler",
+}
+
+
+# =============================================================================
+# SEKME ŞEMALARI
+# =============================================================================
+# Arrow tabanlı metin tipi, eksikler NaN (pandas 3'ün varsayılan "str" tipiyle aynı)
+try:
+    STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)   # pandas >= 2.3
+except TypeError:
+    STRING_DTYPE = pd.StringDtype("pyarrow_numpy")               # pandas 2.1 - 2.2
+
+
+def _cast(series: pd.Series, kind: str) -> Optional[pd.Series]:
+    """Sütunu şema tipine çevirir; zaten o tipteyse None döner (kopya yok)."""
+    dtype = series.dtype
+    if kind == "string":
+        if dtype == STRING_DTYPE or isinstance(dtype, pd.CategoricalDtype):
+            return None
+        # Metin olmayan hücreler str() ile çevrilir, None / NaN eksik olarak kalır
+        return series.astype(STRING_DTYPE)
+    if kind in ("date", "date_dmy"):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return None
+        if kind == "date_dmy":
+            parsed = pd.to_datetime(series, format="%d.%m.%Y", errors="coerce")
+        else:
+            parsed = pd.to_datetime(series, dayfirst=True, errors="coerce")
+        return parsed.astype("datetime64[us]")
+    if kind == "money":
+        if pd.api.types.is_float_dtype(dtype):
+            return None
+        if pd.api.types.is_numeric_dtype(dtype):
+            return series.astype("float64")
+        return clean_money_series(series).astype("float64")
+    if kind == "int":
+        if pd.api.types.is_integer_dtype(dtype):
+            return None
+        return pd.to_numeric(series, errors="coerce").fillna(0).astype("int64")
+    raise ValueError(f"Bilinmeyen şema tipi: {kind}")
+
+
+def enforce_schema(df: pd.DataFrame, schema: Union[str, Dict[str, str]]) -> pd.DataFrame:
+    """
+    DataFrame'i sekme şemasına (SHEET_SCHEMAS anahtarı veya {sütun: tip}) göre tiplendirir.
+    Tekrar çağrılabilir: tipi uyan sütunlara dokunulmaz, olmayan sütunlar atlanır.
+    Girdi değiştirilmez; değişiklik yoksa aynı nesne döner.
+    """
+    columns = SHEET_SCHEMAS.get(schema, {}) if isinstance(schema, str) else schema
+    if df is None or df.empty or not columns:
+        return df
+
+    result = None
+    for col, kind in columns.items():
+        if col not in df.columns or isinstance(df[col], pd.DataFrame):  # Tekrar eden başlık
+            continue
+        cast = _cast(df[col], kind)
+        if cast is None:
+            continue
+        if result is None:
+            result = df.copy(deep=False)
+        result[col] = cast
+    return df if result is None else result
+
+
+# =============================================================================
+# KATEGORİK TİPLER
+# =============================================================================
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_string_dtype(series.dtype) or series.dtype == object
+
+
+def to_categorical(df: pd.DataFrame, columns: Iterable[str],
+                   max_unique_ratio: Optional[float] = None) -> pd.DataFrame:
+    """
+    Verilen metin sütunlarını Categorical'a çevirir (girdi değiştirilmez).
+    Olmayan, zaten kategorik olan veya benzersiz değer oranı eşiği aşan sütunlar atlanır.
+    """
+    if df is None or df.empty:
+        return df
+    if max_unique_ratio is None:
+        max_unique_ratio = DTYPE_CONFIG.get("MAX_UNIQUE_RATIO", 0.5)
+
+    result = None
+    for col in columns:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or not _is_text(series):
+            continue
+        if series.nunique(dropna=True) > max_unique_ratio * len(series):
+            continue
+        if result is None:
+            result = df.copy(deep=False)
+        result[col] = series.astype("category")
+    return df if result is None else result
+
+
+def categorize_packet(packet: Dict[str, Any]) -> Dict[str, Any]:
+    """data_packet'teki tabloları DTYPE_CONFIG'e göre kategorik tiplere çevirir (yeni dict döner)."""
+    if not packet or not DTYPE_CONFIG.get("CATEGORICAL_ENABLED", True):
+        return packet
+
+    columns_by_key = DTYPE_CONFIG.get("CATEGORICAL_COLUMNS", {})
+    result = dict(packet)
+    for key, columns in columns_by_key.items():
+        df = result.get(key)
+        if isinstance(df, pd.DataFrame):
+            result[key] = to_categorical(df, columns)
+    return result
+
+
+def apply_packet_schema(packet: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    data_packet'in tip sözleşmesini garanti eder: sekme şemaları + kategorik tipler.
+    Yeni oluşturulan pakette sadece kategorik çevrim yapılır (sekmeler zaten tipli);
+    eski snapshot'lardan okunan paketlerde eksik tip çevrimleri de tamamlanır.
+    """
+    if not packet:
+        return packet
+    result = dict(packet)
+    for key, schema in PACKET_SCHEMAS.items():
+        df = result.get(key)
+        if isinstance(df, pd.DataFrame):
+            result[key] = enforce_schema(df, schema)
+    return categorize_packet(result)
+
+
+def packet_memory_usage(packet: Dict[str, Any]) -> Dict[str, int]:
+    """Paketteki her DataFrame'in derin bellek kullanımı (byte)."""
+    return {
+        key: int(df.memory_usage(deep=True).sum())
+        for key, df in (packet or {}).items()
+        if isinstance(df, pd.DataFrame)
+    }
@@ -0,0 +1,220 @@
+"""
+DHE Dashboard - Snapshot Deposu (Core)
+======================================
+İşlenmiş data_packet'i diske Arrow IPC (.arrow) dosyaları olarak yazar.
+Yapı (veri kaynağı başına ayrı klasör; sentetik / yerel paket canlı oturumu başlatmaz):
+    data/snapshots/<kaynak>/        # gspread, local_<kök özeti>, synthetic_<seed>_<ölçek>
+    ├── latest.json                 # Son geçerli snapshot'ın adı
+    └── 20260118_101500/
+        ├── manifest.json           # Tablo listesi, satır sayıları, kaynak, oluşturma zamanı
+        ├── teklif.arrow
+        └── ...
+Okuma memory-map ile yapılır; soğuk başlangıçta Google Sheets beklenmez.
+"""
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+from config.constants import SNAPSHOT_CONFIG
+from core.data_sources import get_data_source
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:  # pragma: no cover - pyarrow streamlit ile birlikte gelir
+    pa = None
+    HAS_ARROW = False
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Tarih seti olarak saklanan paket anahtarları (DataFrame değil)
+DATE_SET_KEYS = {"holidays"}
+
+
+def get_snapshot_dir() -> str:
+    """Etkin veri kaynağının snapshot klasörü."""
+    return os.path.join(BASE_PATH, SNAPSHOT_CONFIG.get("DIR", "data/snapshots"), get_data_source().storage_key)
+
+
+def _write_table(df: pd.DataFrame, path: str):
+    """DataFrame'i (index dahil) sıkıştırmasız Arrow IPC dosyasına yazar."""
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_table(path: str) -> pd.DataFrame:
+    """Arrow IPC dosyasını memory-map ile açıp DataFrame'e çevirir."""
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+def save_snapshot(packet: Dict[str, Any]) -> Optional[str]:
+    """
+    data_packet'i yeni bir snapshot klasörüne yazar ve latest.json'u günceller.
+    Başarısız olursa None döner (uygulama akışı etkilenmez).
+    """
+    if not SNAPSHOT_CONFIG.get("ENABLED", True) or not HAS_ARROW or not packet:
+        return None
+
+    root = get_snapshot_dir()
+    snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    tmp_dir = os.path.join(root, f".tmp_{snapshot_id}")
+    final_dir = os.path.join(root, snapshot_id)
+
+    try:
+        os.makedirs(tmp_dir, exist_ok=True)
+        tables = {}
+        for key, value in packet.items():
+            if key in DATE_SET_KEYS:
+                df = pd.DataFrame({"Tarih": pd.to_datetime(sorted(value or []))})
+                kind = "date_set"
+            elif isinstance(value, pd.DataFrame):
+                df = value
+                kind = "frame"
+            else:
+                continue
+
+            _write_table(df, os.path.join(tmp_dir, f"{key}.arrow"))
+            tables[key] = {"kind": kind, "rows": int(len(df))}
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "snapshot_id": snapshot_id,
+            "source": get_data_source().storage_key,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "tables": tables,
+        }
+        with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # Atomik yayınlama: klasör rename + latest.json replace
+        os.replace(tmp_dir, final_dir)
+        latest_tmp = os.path.join(root, "latest.json.tmp")
+        with open(latest_tmp, "w", encoding="utf-8") as f:
+            json.dump({"snapshot_id": snapshot_id}, f)
+        os.replace(latest_tmp, os.path.join(root, "latest.json"))
+
+        _prune_snapshots(root, keep=SNAPSHOT_CONFIG.get("KEEP_LAST", 3))
+        logger.info(f"[Snapshot] Kaydedildi: {snapshot_id} ({len(tables)} tablo)")
+        return final_dir
+
+    except Exception as e:
+        logger.warning(f"[Snapshot] Kaydedilemedi: {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+
+def load_latest_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    En son snapshot'ı memory-map ile okuyup data_packet olarak döndürür.
+    Snapshot yoksa, bozuksa veya format eskiyse None döner.
+    """
+    if not SNAPSHOT_CONFIG.get("ENABLED", True) or not HAS_ARROW:
+        return None
+
+    root = get_snapshot_dir()
+    try:
+        with open(os.path.join(root, "latest.json"), encoding="utf-8") as f:
+            snapshot_id = json.load(f)["snapshot_id"]
+
+        snapshot_dir = os.path.join(root, snapshot_id)
+        with open(os.path.join(snapshot_dir, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            logger.info("[Snapshot] Format sürümü farklı, snapshot atlandı")
+            return None
+
+        packet = {}
+        for key, info in manifest["tables"].items():
+            df = _read_table(os.path.join(snapshot_dir, f"{key}.arrow"))
+            if info["kind"] == "date_set":
+                packet[key] = set(df["Tarih"].dt.date.tolist())
+            else:
+                packet[key] = df
+
+        logger.info(f"[Snapshot] Yüklendi: {snapshot_id} ({manifest['created_at']})")
+        return packet
+
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[Snapshot] Okunamadı: {e}")
+        return None
+
+
+def get_latest_manifest() -> Optional[Dict[str, Any]]:
+    """Son snapshot'ın manifest bilgisini döndürür (sidebar bilgi kartı için)."""
+    root = get_snapshot_dir()
+    try:
+        with open(os.path.join(root, "latest.json"), encoding="utf-8") as f:
+            snapshot_id = json.load(f)["snapshot_id"]
+        with open(os.path.join(root, snapshot_id, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _prune_snapshots(root: str, keep: int):
+    """En yeni `keep` snapshot dışındakileri siler."""
+    snapshots = sorted(
+        d for d in os.listdir(root)
+        if os.path.isdir(os.path.join(root, d)) and not d.startswith(".")
+    )
+    for old in snapshots[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+
+# =============================================================================
+# DONDURULMUŞ SEKME ARŞİVİ (Geçmiş yıl sekmeleri)
+# =============================================================================
+# Ham sekmelerde tekrar eden / boş başlıklar olabildiği için sütunlar
+# pozisyonel adlarla yazılır, orijinal başlıklar şema metadata'sında tutulur.
+def save_frozen_tab(path: str, df: pd.DataFrame) -> bool:
+    """Ham sekme DataFrame'ini (başlıklar dahil) Arrow dosyasına dondurur."""
+    if not HAS_ARROW or df is None or df.empty:
+        return False
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = {f"c{i}": df.iloc[:, i].astype(str).tolist() for i in range(df.shape[1])}
+        table = pa.table(columns).replace_schema_metadata({
+            "headers": json.dumps([str(c) for c in df.columns], ensure_ascii=False),
+            "frozen_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        logger.info(f"[Arşiv] Donduruldu: {os.path.basename(path)} ({len(df)} satır)")
+        return True
+    except Exception as e:
+        logger.warning(f"[Arşiv] Yazılamadı ({path}): {e}")
+        return False
+
+
+def load_frozen_tab(path: str) -> Optional[pd.DataFrame]:
+    """Dondurulmuş sekmeyi orijinal başlıklarıyla okur. Yoksa None döner."""
+    if not HAS_ARROW or not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        headers = json.loads(table.schema.metadata[b"headers"].decode("utf-8"))
+        df = table.to_pandas()
+        df.columns = headers
+        return df
+    except Exception as e:
+        logger.warning(f"[Arşiv] Okunamadı ({path}): {e}")
+        return None
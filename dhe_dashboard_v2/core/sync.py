@@ -0,0 +1,140 @@
+"""
+DHE Dashboard - Artımlı Senkronizasyon (Core)
+=============================================
+Google Sheets sekmelerindeki değişiklikleri takip eder.
+- Dosya seviyesi: Drive "lastUpdateTime" değişmediyse sekmeler yeniden çekilmez
+- Sekme seviyesi: İçerik checksum'ı değişmeyen sekmeler yeniden işlenmez
+- Aşama seviyesi: Girdi sekmeleri aynı kalan işleme aşamaları önceki sonucu döndürür
+"""
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from core.quota import get_quota_limiter
+
+logger = logging.getLogger(__name__)
+
+
+def frame_checksum(df: pd.DataFrame) -> str:
+    """DataFrame içeriği (başlıklar + hücreler) için kararlı bir checksum üretir."""
+    if df is None or df.empty:
+        return "empty"
+
+    digest = hashlib.sha1()
+    digest.update("|".join(map(str, df.columns)).encode("utf-8"))
+    row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    digest.update(row_hashes.values.tobytes())
+    return digest.hexdigest()
+
+
+class SheetSyncState:
+    """
+    Süreç genelinde (tüm Streamlit oturumları) paylaşılan senkronizasyon durumu.
+    Her dosyanın son sürümünü, her sekmenin son checksum + ham verisini
+    ve her işleme aşamasının son sonucunu saklar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file_versions: Dict[str, str] = {}
+        self._tabs: Dict[str, Dict[str, Tuple[str, pd.DataFrame]]] = {}
+        self._stages: Dict[str, Tuple[Tuple[str, ...], Any]] = {}
+        # Herhangi bir aşama yeniden hesaplandığında artar (snapshot/yenileme kontrolü için)
+        self.generation = 0
+
+    # -------------------------------------------------------------------------
+    # DOSYA SEVİYESİ
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def fetch_file_version(spreadsheet) -> Optional[str]:
+        """Drive API'den dosyanın son güncellenme zamanını okur (hata -> None)."""
+        try:
+            if getattr(spreadsheet, "bypass_quota", False):
+                return spreadsheet.get_lastUpdateTime()
+            return get_quota_limiter().call(spreadsheet.get_lastUpdateTime)
+        except Exception as e:
+            logger.warning(f"[Sync] Dosya sürümü okunamadı: {e}")
+            return None
+
+    def is_file_unchanged(self, file_name: str, version: Optional[str]) -> bool:
+        """Dosya son senkronizasyondan beri değişmediyse ve sekmeleri elimizdeyse True."""
+        if version is None:
+            return False
+        with self._lock:
+            return self._file_versions.get(file_name) == version and file_name in self._tabs
+
+    def mark_file_synced(self, file_name: str, version: Optional[str]):
+        """Dosyanın tüm sekmeleri başarıyla çekildikten sonra sürümü kaydeder."""
+        if version is None:
+            return
+        with self._lock:
+            self._file_versions[file_name] = version
+
+    # -------------------------------------------------------------------------
+    # SEKME SEVİYESİ
+    # -------------------------------------------------------------------------
+    def update_tab(self, file_name: str, tab: str, df: pd.DataFrame) -> bool:
+        """Sekmenin yeni içeriğini kaydeder. İçerik değiştiyse True döner."""
+        checksum = frame_checksum(df)
+        with self._lock:
+            tabs = self._tabs.setdefault(file_name, {})
+            previous = tabs.get(tab)
+            tabs[tab] = (checksum, df)
+        changed = previous is None or previous[0] != checksum
+        if changed:
+            logger.info(f"[Sync] {file_name}/{tab}: değişiklik tespit edildi")
+        return changed
+
+    def cached_tabs(self, file_name: str) -> Dict[str, pd.DataFrame]:
+        """Son senkronizasyondaki ham sekme verilerini döndürür."""
+        with self._lock:
+            return {tab: df for tab, (_, df) in self._tabs.get(file_name, {}).items()}
+
+    def tab_checksum(self, file_name: str, tab: str) -> str:
+        with self._lock:
+            entry = self._tabs.get(file_name, {}).get(tab)
+        return entry[0] if entry else "missing"
+
+    # -------------------------------------------------------------------------
+    # AŞAMA SEVİYESİ
+    # -------------------------------------------------------------------------
+    def run_stage(self, name: str, inputs: Iterable[Tuple[str, str]], builder: Callable[[], Any]) -> Any:
+        """
+        İşleme aşamasını yalnızca girdi sekmelerinden biri değiştiyse çalıştırır.
+
+        Args:
+            name: Aşama adı (örn: "finans")
+            inputs: (dosya, sekme) çiftleri
+            builder: Aşama sonucunu üreten fonksiyon
+        """
+        fingerprint = tuple(self.tab_checksum(f, t) for f, t in inputs)
+        with self._lock:
+            cached = self._stages.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            logger.info(f"[Sync] '{name}' aşaması değişmedi, önceki sonuç kullanılıyor")
+            return cached[1]
+
+        result = builder()
+        with self._lock:
+            self._stages[name] = (fingerprint, result)
+            self.generation += 1
+        return result
+
+    def reset(self):
+        """Tüm senkronizasyon durumunu temizler (tam yeniden yükleme)."""
+        with self._lock:
+            self._file_versions.clear()
+            self._tabs.clear()
+            self._stages.clear()
+            self.generation += 1
+
+
+_SYNC_STATE = SheetSyncState()
+
+
+def get_sync_state() -> SheetSyncState:
+    """Süreç genelindeki tekil senkronizasyon durumunu döndürür."""
+    return _SYNC_STATE
@@ -0,0 +1,239 @@
+"""
+DHE Dashboard - Sentetik Veri Üretici (Core)
+============================================
+Google Sheets dosyalarının (DHE_Data + Servis Programı) ham hücre ızgaralarını
+seed'li olarak üretir. Çıktı doğrudan data_sources.TableSpreadsheet'e verilir,
+böylece tüm yükleme yolu ağ erişimi olmadan çalıştırılabilir.
+
+scale=1 bugünkü üretim hacmine yakındır; 10 ve 100 ölçekleme testleri içindir.
+Gerçek veride görülen düzensizlikler bilinçli olarak üretilir:
+- Teklif revizyonları: 1234, 1234R1, 1234-R2, 1234 R3, 1234REV4
+- Karışık para formatları: 1.234,56 (TR) / 1,234.56 (US) / 1234,5 / "1.234,56 EUR"
+- Birden fazla para birimi (EUR, USD, GBP, TL, TRY) + az sayıda geçersiz kod / tarih
+- Servis Programı: 1. satır başlık üstü, 2. satır başlık, boş başlıklı sütun
+"""
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.constants import EXCEL_CONFIG, FIELD_TECHNICIANS, PERSONEL_MAP
+
+SAHA_FILE_NAME = "2025 SERVİS PROGRAMI"
+DHE_FILE_NAME = EXCEL_CONFIG.get("FILE_NAME", "DHE_Data")
+
+# Servis Programı yıl sekmesi başlıkları (2. satır). Sondaki boş başlık gerçek sayfadaki gibi.
+SAHA_HEADERS = ["Tarih", "Teknisyen 1", "Teknisyen 2", "Müşteri", "Servis Ürünü", "İşlem", "Şehir", "Sorumlu", ""]
+
+# scale=1 için hacimler (yaklaşık bugünkü üretim verisi)
+BASE_VOLUME = {
+    "customers": 600,
+    "quote_roots_per_year": 2500,
+    "technicians": len(FIELD_TECHNICIANS),
+}
+
+CUSTOMER_WORDS = ["ANADOLU", "EGE", "MARMARA", "DEMİR", "ÇELİK", "KİMYA", "GIDA", "TEKSTİL",
+                  "OTOMOTİV", "PLASTİK", "İNŞAAT", "ENERJİ", "MAKİNA", "AMBALAJ", "KAĞIT", "CAM"]
+CITIES = ["İstanbul", "İzmir", "Ankara", "Bursa", "Kocaeli", "Manisa", "Konya", "Kayseri",
+          "Gaziantep", "Adana", "Denizli", "Tekirdağ", "Sakarya", "Eskişehir"]
+PRODUCTS = ["Kompresör", "Kurutucu", "Filtre", "Tank", "Vidalı Kompresör", "Azot Jeneratörü"]
+ISLEMLER = ["BAKIM", "ARIZA", "ARIZA+BAKIM", "DEVREYE ALMA", "KEŞİF", "MONTAJ"]
+
+CURRENCIES = np.array(["EUR", "USD", "TL", "GBP", "TRY", "", "XYZ"])
+CURRENCY_WEIGHTS = [0.55, 0.20, 0.14, 0.05, 0.03, 0.02, 0.01]
+REVISION_FORMATS = ["{root}R{rev}", "{root}-R{rev}", "{root} R{rev}", "{root}REV{rev}"]
+
+
+def _headers(mapping_key: str) -> List[str]:
+    return list(EXCEL_CONFIG["COLUMN_MAPPINGS"][mapping_key].keys())
+
+
+def _fmt_dates(days: np.ndarray, invalid_ratio: float, rng: np.random.Generator) -> List[str]:
+    """Gün sayılarını (epoch) DD.MM.YYYY metnine çevirir, bir kısmını bozar."""
+    texts = pd.to_datetime(days, unit="D").strftime("%d.%m.%Y").tolist()
+    for i in np.flatnonzero(rng.random(len(texts)) < invalid_ratio):
+        texts[i] = "" if i % 2 else "31.02.2024"
+    return texts
+
+
+def _fmt_money(values: np.ndarray, rng: np.random.Generator) -> List[str]:
+    """Tutarları karışık TR/US formatlarında metne çevirir."""
+    styles = rng.choice(4, size=len(values), p=[0.6, 0.25, 0.1, 0.05])
+    out = []
+    for value, style in zip(values.tolist(), styles.tolist()):
+        us = f"{value:,.2f}"
+        if style == 0:    # TR: 1.234,56
+            out.append(us.replace(",", "_").replace(".", ",").replace("_", "."))
+        elif style == 1:  # US: 1,234.56
+            out.append(us)
+        elif style == 2:  # Binlik ayırıcısız TR: 1234,5
+            out.append(f"{value:.1f}".replace(".", ","))
+        else:             # Birimli: 1.234,56 EUR
+            out.append(us.replace(",", "_").replace(".", ",").replace("_", ".") + " EUR")
+    return out
+
+
+def _customers(rng: np.random.Generator, n: int) -> List[str]:
+    words = rng.choice(CUSTOMER_WORDS, size=(n, 2))
+    return [f"{a} {b} {i}" for i, (a, b) in enumerate(words.tolist())]
+
+
+def _technicians(n: int) -> List[str]:
+    names = list(FIELD_TECHNICIANS[:n])
+    names += [f"TEKNİSYEN {i:03d}" for i in range(len(names) + 1, n + 1)]
+    return names
+
+
+def _finance_tabs(rng: np.random.Generator, scale: float, years: Sequence[int], customers: List[str]):
+    """teklif + siparis ızgaraları (revizyonlu)."""
+    n_roots = max(10, int(BASE_VOLUME["quote_roots_per_year"] * scale * len(years)))
+    epoch = pd.Timestamp("1970-01-01")
+    start = (pd.Timestamp(date(min(years), 1, 1)) - epoch).days
+    end = (pd.Timestamp(date(max(years), 12, 31)) - epoch).days
+
+    # Her kök için revizyon sayısı (çoğu revizyonsuz, bazıları R5+)
+    n_revs = np.minimum(rng.geometric(0.6, size=n_roots) - 1, 9)
+    root_idx = np.repeat(np.arange(n_roots), n_revs + 1)
+    rev_no = np.concatenate([np.arange(k + 1) for k in n_revs.tolist()])
+
+    root_day = rng.integers(start, end - 30, size=n_roots)
+    root_customer = rng.integers(0, len(customers), size=n_roots)
+    root_amount = np.round(rng.lognormal(mean=8.5, sigma=1.2, size=n_roots), 2)
+    root_currency = rng.choice(CURRENCIES, size=n_roots, p=CURRENCY_WEIGHTS)
+    personel_codes = np.array(list(PERSONEL_MAP.keys()) + ["mert", "Kaan"])
+    root_personel = rng.choice(personel_codes, size=n_roots)
+    rev_format = rng.integers(0, len(REVISION_FORMATS), size=n_roots)
+
+    # Revizyon satırları
+    days = root_day[root_idx] + rev_no * rng.integers(1, 6, size=len(rev_no))
+    amounts = np.round(root_amount[root_idx] * (1 + rev_no * rng.uniform(-0.05, 0.08, size=len(rev_no))), 2)
+    costs = np.round(amounts * rng.uniform(0.45, 0.8, size=len(amounts)), 2)
+    quote_ids = [
+        str(100000 + r) if v == 0 else REVISION_FORMATS[f].format(root=100000 + r, rev=v)
+        for r, v, f in zip(root_idx.tolist(), rev_no.tolist(), rev_format[root_idx].tolist())
+    ]
+    isaret = np.where(rng.random(len(rev_no)) < 0.05, "X", "")
+
+    teklif_cols = [
+        quote_ids,
+        [customers[i] for i in root_customer[root_idx].tolist()],
+        root_personel[root_idx].tolist(),
+        _fmt_dates(days, 0.01, rng),
+        _fmt_money(amounts, rng),
+        _fmt_money(costs, rng),
+        isaret.tolist(),
+        root_currency[root_idx].tolist(),
+    ]
+    teklif = [_headers("TEKLIF")] + [list(row) for row in zip(*teklif_cols)]
+
+    # Siparişler: köklerin ~%35'inin son revizyonu siparişe döner
+    last_pos = np.cumsum(n_revs + 1) - 1
+    ordered = last_pos[rng.random(n_roots) < 0.35]
+    order_days = days[ordered] + rng.integers(3, 45, size=len(ordered))
+    siparis_cols = [
+        [quote_ids[i] for i in ordered.tolist()],
+        [teklif_cols[1][i] for i in ordered.tolist()],
+        [teklif_cols[2][i] for i in ordered.tolist()],
+        _fmt_dates(order_days, 0.005, rng),
+        _fmt_money(amounts[ordered], rng),
+        _fmt_money(costs[ordered], rng),
+        [teklif_cols[7][i] for i in ordered.tolist()],
+    ]
+    siparis = [_headers("SIPARIS")] + [list(row) for row in zip(*siparis_cols)]
+    return teklif, siparis
+
+
+def _saha_tab(rng: np.random.Generator, year: int, technicians: List[str], customers: List[str]) -> List[List[str]]:
+    """Bir yıl sekmesi: her teknisyen için her iş günü bir satır (+ bazı hafta sonları)."""
+    all_days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    weekend = all_days.dayofweek >= 5
+    n_tech = len(technicians)
+
+    day_grid = np.repeat(np.arange(len(all_days)), n_tech)
+    tech_grid = np.tile(np.arange(n_tech), len(all_days))
+    # Hafta sonu satırlarının sadece ~%5'i dolu
+    keep = ~weekend[day_grid] | (rng.random(len(day_grid)) < 0.05)
+    day_grid, tech_grid = day_grid[keep], tech_grid[keep]
+    n = len(day_grid)
+
+    kind = rng.choice(3, size=n, p=[0.9, 0.04, 0.06])  # 0: saha işi, 1: izin, 2: atölye
+    customer = np.array(customers, dtype=object)[rng.integers(0, len(customers), size=n)]
+    customer[kind == 1] = "İZİNLİ"
+    customer[kind == 2] = "DHE ENDÜSTRİYEL"
+    on_site = kind == 0
+
+    tech2 = np.where(on_site & (rng.random(n) < 0.2), np.array(technicians, dtype=object)[rng.integers(0, n_tech, size=n)], "")
+    product = np.where(on_site, rng.choice(PRODUCTS, size=n), "")
+    islem = np.where(on_site, rng.choice(ISLEMLER, size=n, p=[0.4, 0.25, 0.1, 0.1, 0.1, 0.05]), "")
+    city = np.where(on_site, rng.choice(CITIES, size=n), "")
+    sorumlu = np.where(on_site, rng.choice(["MERT", "OGUZHAN", "FATIH", "KAAN"], size=n), "")
+    # İsimler sayfada karışık yazılıyor (küçük harf / fazla boşluk)
+    tech1 = np.array(technicians, dtype=object)[tech_grid]
+    messy = rng.random(n) < 0.1
+    tech1[messy] = [f" {t.lower()} " for t in tech1[messy].tolist()]
+
+    cols = [
+        all_days[day_grid].strftime("%d.%m.%Y").tolist(),
+        tech1.tolist(), tech2.tolist(), customer.tolist(), product.tolist(),
+        islem.tolist(), city.tolist(), sorumlu.tolist(), [""] * n,
+    ]
+    title_row = [f"{year} SERVİS PROGRAMI"] + [""] * (len(SAHA_HEADERS) - 1)
+    return [title_row, list(SAHA_HEADERS)] + [list(row) for row in zip(*cols)]
+
+
+def generate_workbooks(seed: int = 42, scale: float = 1.0,
+                       years: Sequence[int] = (2024, 2025, 2026)) -> Dict[str, Dict[str, List[List[str]]]]:
+    """
+    Dosya adı -> sekme adı -> hücre ızgarası (başlık satırları dahil) döndürür.
+
+    Args:
+        seed: Tekrarlanabilirlik için rastgelelik tohumu
+        scale: Hacim çarpanı (1 ≈ bugünkü üretim, 10 / 100 ölçek testleri)
+        years: Üretilecek yıllar (Servis Programı sekmeleri, kurlar, tatiller)
+    """
+    rng = np.random.default_rng(seed)
+    sheets = EXCEL_CONFIG["SHEETS"]
+    customers = _customers(rng, max(5, int(BASE_VOLUME["customers"] * scale)))
+    technicians = _technicians(max(1, int(round(BASE_VOLUME["technicians"] * scale))))
+
+    teklif, siparis = _finance_tabs(rng, scale, years, customers)
+
+    personel_codes = ["mert", "oguzhan", "fatih", "kaan", ""]
+    musteri = [_headers("MUSTERI")] + [
+        [str(i + 1), name, f"{name} SAN. VE TİC. A.Ş.", personel_codes[i % len(personel_codes)]]
+        for i, name in enumerate(customers)
+    ]
+    urun_days = rng.integers((date(min(years) - 5, 1, 1) - date(1970, 1, 1)).days,
+                             (date(max(years), 12, 31) - date(1970, 1, 1)).days, size=len(customers) * 3)
+    urun = [_headers("URUN")] + [
+        [str(i + 1), f"S{i:07d}", f"C{i:07d}", customers[i % len(customers)].lower(), d]
+        for i, d in enumerate(_fmt_dates(urun_days, 0.0, rng))
+    ]
+    kurlar = [["Yıl", "Ay", "EUR", "USD", "GBP", "TL"]] + [
+        [str(y), str(m), "1", f"{rng.uniform(0.88, 0.95):.4f}".replace(".", ","),
+         f"{rng.uniform(1.15, 1.2):.4f}".replace(".", ","), f"{1 / (30 + (y - 2024) * 6 + m / 2):.5f}".replace(".", ",")]
+        for y in years for m in range(1, 13)
+    ]
+    personel = [_headers("PERSONEL")] + [[name.title(), "Saha", "01.01.2020", ""] for name in technicians]
+    tatiller = [_headers("TATILLER")] + [
+        [f"{d}.{y}", desc] for y in years
+        for d, desc in [("01.01", "Yılbaşı"), ("23.04", "Ulusal Egemenlik"), ("01.05", "Emek ve Dayanışma"),
+                        ("19.05", "Gençlik ve Spor"), ("15.07", "Demokrasi ve Milli Birlik"),
+                        ("30.08", "Zafer Bayramı"), ("29.10", "Cumhuriyet Bayramı")]
+    ]
+    sehirler = [_headers("SEHIRLER")] + [[city, str(i % 7 + 1), f"Bölge {i % 7 + 1}"] for i, city in enumerate(CITIES)]
+
+    dhe = {
+        sheets["TEKLIF"]: teklif,
+        sheets["SIPARIS"]: siparis,
+        sheets["MUSTERI"]: musteri,
+        sheets["URUN"]: urun,
+        sheets["KURLAR"]: kurlar,
+        sheets["PERSONEL"]: personel,
+        sheets["TATILLER"]: tatiller,
+        sheets["SEHIRLER"]: sehirler,
+    }
+    saha = {str(y): _saha_tab(rng, y, technicians, customers) for y in years}
+
+    return {DHE_FILE_NAME: dhe, SAHA_FILE_NAME: saha}
@@ -3,15 +3,21 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
-from typing import Dict, Any
-from core.utils import clean_currency_code, get_exchange_rate, tr_upper, clean_money_text, clean_money_series
+from typing import Dict, Any, Optional, Union
+from core.utils import (
+    clean_currency_code, tr_upper, tr_upper_series, clean_money_text,
+    rate_table_from_map, lookup_rates
+)
+from core.schema import enforce_schema
+from core.crm_scoring import CrmScorer, assemble_crm, build_aggregates
 
 logger = logging.getLogger(__name__)
 
-def process_finance_dataframe(df: pd.DataFrame, id_col: str, monthly_rates: Dict, personel_dict: Dict) -> pd.DataFrame:
+def process_finance_dataframe(df: pd.DataFrame, id_col: str, monthly_rates: Union[Dict, pd.Series], personel_dict: Dict) -> pd.DataFrame:
     """
     Teklif ve Sipariş DataFrameleri için ortak işleme mantığı.
     Para birimi dönüştürme, tarih ayrıştırma ve hesaplamaları yapar.
+    monthly_rates: parse_rate_table çıktısı veya {(yil, ay, para_birimi): kur} sözlüğü.
     """
     if df.empty:
         return df
@@ -23,52 +29,36 @@ def process_finance_dataframe(df: pd.DataFrame, id_col: str, monthly_rates: Dict
     df["Para_Birimi"] = df["Para_Birimi"].apply(clean_currency_code)
     df = df.dropna(subset=["Para_Birimi"]).copy()
     
-    # Tarih İşlemleri (Standart format: DD.MM.YYYY - örn: 02.01.2017)
-    df["Tarih"] = pd.to_datetime(df["Tarih"], format='%d.%m.%Y', errors='coerce')
+    # Tarih (GG.AA.YYYY) ve tutar tipleri: sekme şeması çekimde uygulandıysa dokunulmaz
+    df = enforce_schema(df, {"Tarih": "date_dmy", "Tutar_Ham": "money", "Maliyet_Ham": "money"})
     df = df.dropna(subset=["Tarih"]).copy()
     
     df["Yil"] = df["Tarih"].dt.year
     df["Ay"] = df["Tarih"].dt.month
     df["Ay_Sira"] = df["Ay"]
     
-    # Tutar Temizliği (1.000,50 formatı) - VEKTÖRIZE
-    df["Tutar_Ham"] = clean_money_series(df["Tutar_Ham"])
-    df["Maliyet_Ham"] = clean_money_series(df["Maliyet_Ham"])
-    
-    # Kur Çevrimi Helper
-    def get_rate(yil, ay, pb):
-        # 1. Aylık tabloya bak
-        rate = monthly_rates.get((yil, ay, pb))
-        if rate is not None:
-            return rate
-        # 2. Yıllık ortalamaya bak (fallback)
-        return get_exchange_rate(pb, yil)
-    
-    # Kur Hesaplama
-    unique_combinations = df[["Yil", "Ay", "Para_Birimi"]].drop_duplicates()
-    rates_map = {}
-    for _, row in unique_combinations.iterrows():
-        rates_map[(row["Yil"], row["Ay"], row["Para_Birimi"])] = get_rate(row["Yil"], row["Ay"], row["Para_Birimi"])
-    
-    df["_Rate_Key"] = list(zip(df["Yil"], df["Ay"], df["Para_Birimi"]))
-    df["Exchange_Rate"] = df["_Rate_Key"].map(rates_map).fillna(1.0)
+    # Kur Çevrimi: (Yil, Ay, Para_Birimi) kur tablosundan tek seferde, yoksa yıllık ortalama
+    rate_table = monthly_rates if isinstance(monthly_rates, pd.Series) else rate_table_from_map(monthly_rates or {})
+    df["Exchange_Rate"] = lookup_rates(df["Yil"], df["Ay"], df["Para_Birimi"], rate_table)
     
     # EUR Dönüşümleri
     df["Tutar_EUR"] = df["Tutar_Ham"] * df["Exchange_Rate"]
     df["Maliyet_EUR"] = df["Maliyet_Ham"] * df["Exchange_Rate"]
     df["Kar_EUR"] = df["Tutar_EUR"] - df["Maliyet_EUR"]
     
-    df.drop(columns=["_Rate_Key", "Exchange_Rate"], inplace=True)
-    
     # Personel Eşleştirme
-    df["Personel_Kodu"] = df["Personel"].astype(str).str.strip().apply(tr_upper)
+    df["Personel_Kodu"] = tr_upper_series(df["Personel"].astype(str).str.strip())
     df["Personel_Adi"] = df["Personel_Kodu"].map(personel_dict).fillna(df["Personel_Kodu"])
     
     return df
 
 
-def prepare_crm_data(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_musteri: pd.DataFrame) -> pd.DataFrame:
-    """CRM modülü için müşteri segmentasyonu ve metrik analizleri."""
+def prepare_crm_data(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_musteri: pd.DataFrame,
+                     scorer: Optional[CrmScorer] = None) -> pd.DataFrame:
+    """
+    CRM modülü için müşteri segmentasyonu ve metrik analizleri (core.crm_scoring).
+    scorer verilirse (get_crm_scorer) sadece teklif/siparişi değişen müşteriler yeniden toplanır.
+    """
     try:
         # ÖNEMLİ: CRM Analizinde "Toplam Teklif Hacmi" hesaplanırken, 
         # aynı teklifin 5 revizyonunu alt alta toplarsak müşterinin hacmi şişer.
@@ -76,89 +66,9 @@ def prepare_crm_data(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_muste
         df_teklif_unique = filter_latest_revisions(df_teklif, "Teklif_No")
         df_siparis_unique = filter_latest_revisions(df_siparis, "Siparis_No")
 
-        # Sipariş Özeti
-        cust_sip = df_siparis_unique.groupby("Musteri").agg(
-            Total_Ciro_EUR=('Tutar_EUR', 'sum'),
-            Siparis_Adedi=('Siparis_No', 'nunique'),
-            Son_Siparis_Tarihi=('Tarih', 'max'),
-            Ilk_Siparis_Tarihi=('Tarih', 'min'),
-        ).reset_index()
-        
-        # Sıklık Hesabı
-        cust_sip["Gun_Farki"] = (cust_sip["Son_Siparis_Tarihi"] - cust_sip["Ilk_Siparis_Tarihi"]).dt.days
-        # Eğer birden fazla sipariş varsa, (Son-İlk) / (Adet-1)
-        cust_sip["Purchase_Frequency"] = cust_sip.apply(
-            lambda x: x["Gun_Farki"] / (x["Siparis_Adedi"] - 1) if x["Siparis_Adedi"] > 1 else 0, axis=1
-        )
-        
-        # Teklif Özeti
-        # Son Teklif Detayları
-        last_quotes = df_teklif_unique.sort_values("Tarih").drop_duplicates("Musteri", keep="last")
-        last_quotes = last_quotes[["Musteri", "Teklif_No", "Tutar_EUR"]].rename(
-            columns={
-                "Teklif_No": "Son_Teklif_No",
-                "Tutar_EUR": "Son_Teklif_Tutar"
-            }
-        )
-
-        cust_teklif = df_teklif_unique.groupby("Musteri").agg(
-            Total_Teklif_EUR=('Tutar_EUR', 'sum'),
-            Teklif_Sayisi=('Teklif_No', 'nunique'),
-            Son_Teklif_Tarihi=('Tarih', 'max'),
-            Ilk_Teklif_Tarihi=('Tarih', 'min')
-        ).reset_index()
-        
-        # Detayları birleştir
-        cust_teklif = pd.merge(cust_teklif, last_quotes, on="Musteri", how="left")
-        
-        # Ana Müşteri Listesi Oluşturma
-        if df_musteri.empty:
-            all_customers = pd.DataFrame(cust_sip["Musteri"].unique(), columns=["Musteri"])
-            all_customers["Uzun_Ad"] = all_customers["Musteri"]
-            all_customers["Sorumlu_Clean"] = "Genel"
-        else:
-            all_customers = df_musteri[['Kisa_Ad', 'Uzun_Ad', 'Sorumlu_Clean']].rename(columns={'Kisa_Ad': 'Musteri'})
-            
-        # 3 Tabloyu Birleştirme
-        df_crm = pd.merge(all_customers, cust_sip, on="Musteri", how="left")
-        df_crm = pd.merge(df_crm, cust_teklif, on="Musteri", how="left")
-        
-        # NaN Doldurma
-        df_crm["Total_Teklif_EUR"] = df_crm["Total_Teklif_EUR"].fillna(0)
-        df_crm["Total_Ciro_EUR"] = df_crm["Total_Ciro_EUR"].fillna(0)
-        df_crm["Siparis_Adedi"] = df_crm["Siparis_Adedi"].fillna(0)
-        df_crm["Teklif_Sayisi"] = df_crm["Teklif_Sayisi"].fillna(0)
-        
-        # Pareto Analizi
-        df_crm = df_crm.sort_values("Total_Teklif_EUR", ascending=False)
-        total_quote_vol = df_crm["Total_Teklif_EUR"].sum()
-        df_crm["Cum_Quote"] = df_crm["Total_Teklif_EUR"].cumsum()
-        df_crm["Revenue_Share"] = df_crm["Cum_Quote"] / total_quote_vol if total_quote_vol > 0 else 0
-        
-        # Segmentasyon Kuralları
-        def assign_segment(row):
-            if row["Total_Teklif_EUR"] == 0:
-                return "Pasif"
-            elif row["Revenue_Share"] <= 0.80:
-                return "🥇 VIP"
-            elif row["Revenue_Share"] <= 0.95:
-                return "🥈 Gold"
-            else:
-                return "🥉 Standart"
-                
-        df_crm["Segment"] = df_crm.apply(assign_segment, axis=1)
-        
-        # Recency
-        now = datetime.now()
-        df_crm["Recency_Days"] = (now - df_crm["Son_Teklif_Tarihi"]).dt.days.fillna(9999).astype(int)
-        
-        # Risk Analizi
-        def check_risk(row):
-            return "VIP" in row["Segment"] and row["Recency_Days"] > 90
-            
-        df_crm["Riskli"] = df_crm.apply(check_risk, axis=1)
-
-        return df_crm
+        if scorer is not None:
+            return scorer.update(df_teklif_unique, df_siparis_unique, df_musteri)
+        return assemble_crm(build_aggregates(df_teklif_unique, df_siparis_unique), df_musteri)
         
     except Exception as e:
         logger.error(f"CRM veri hazırlama hatası: {e}")
@@ -230,7 +140,96 @@ def determine_saha_status(row):
     except Exception:
         return 'ATÖLYE'
 
-import re
+
+def _clean_text_series(df: pd.DataFrame, col: str) -> pd.Series:
+    """determine_saha_status içindeki safe_str'in sütun karşılığı (None/NaN/'nan' -> '')."""
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    s = df[col].astype(object).where(df[col].notna(), '').astype(str).str.strip()
+    return s.mask(s.str.lower() == 'nan', '')
+
+
+def determine_saha_status_series(df: pd.DataFrame) -> pd.Series:
+    """
+    determine_saha_status kurallarının vektörize hali (tüm tablo için tek seferde).
+    Sonuç satır bazlı fonksiyonla birebir aynıdır:
+    - Müşteri 'DHE ENDÜSTRİYEL' içeriyorsa: hafta sonu AKTİF, hafta içi ATÖLYE
+    - Müşteri 'İZİNLİ' ise: İZİNLİ
+    - Teknisyen ve iş bilgisi (müşteri/ürün/sorumlu) varsa AKTİF, yoksa ATÖLYE
+    """
+    if df.empty:
+        return pd.Series(index=df.index, dtype=object)
+
+    teknisyen1 = _clean_text_series(df, 'Teknisyen 1')
+    teknisyen2 = _clean_text_series(df, 'Teknisyen 2')
+    musteri = tr_upper_series(_clean_text_series(df, 'Müşteri'))
+    servis_urunu = _clean_text_series(df, 'Servis Ürünü')
+    sorumlu = _clean_text_series(df, 'Sorumlu')
+
+    is_dhe = musteri.str.contains('DHE ENDÜSTRİYEL', regex=False).to_numpy(dtype=bool)
+
+    # Hafta sonu sadece DHE satırları için gerekli
+    is_weekend = np.zeros(len(df), dtype=bool)
+    if 'Tarih' in df.columns and is_dhe.any():
+        tarih = df['Tarih'][is_dhe]
+        if not pd.api.types.is_datetime64_any_dtype(tarih):
+            # Satır bazlı pd.to_datetime(dayfirst=True) ile aynı: her değer kendi formatıyla
+            tarih = pd.to_datetime(tarih, dayfirst=True, errors='coerce', format='mixed')
+        is_weekend[is_dhe] = (tarih.dt.dayofweek >= 5).to_numpy(dtype=bool)
+
+    has_technician = (teknisyen1 != '') | (teknisyen2 != '')
+    has_work_info = (musteri != '') | (servis_urunu != '') | (sorumlu != '')
+
+    status = np.select(
+        [is_dhe & is_weekend, is_dhe, (musteri == 'İZİNLİ').to_numpy(), (has_technician & has_work_info).to_numpy()],
+        ['AKTİF', 'ATÖLYE', 'İZİNLİ', 'AKTİF'],
+        default='ATÖLYE',
+    )
+    return pd.Series(status, index=df.index, dtype=object)
+
+# Revizyon ayracı öncesindeki boşluk/tire karakterleri (1234-R1, 1234 R1)
+_REVISION_SEPARATORS = " \t\n\r\f\v\u00a0-"
+
+
+def parse_revisions(values: pd.Series):
+    """
+    Teklif numaralarını vektörize olarak (Kök, Revizyon) ikilisine ayırır.
+    Desteklenen formatlar: 1234, 1234R1, 1234-R1, 1234 R1, 1234REV1
+    - Revizyonsuz numara: kendisi kök, revizyon 0
+    - Kökü boş olan (örn. "R1"): kendisi kök, revizyon 0
+    - Boş / eksik numara: kök "", revizyon -1
+    Satır başına regex yerine sütun bazlı string işlemleri kullanılır.
+    Dönüş: (kök Series, revizyon Series[int]) - index values ile aynı
+    """
+    numbers = values.fillna('').astype(str).str.strip().str.upper()
+    root = numbers.to_numpy(dtype=object).copy()
+    rev = np.zeros(len(numbers), dtype='int64')
+
+    # Sadece 'R' içeren numaralar revizyon olabilir (çoğu teklif revizyonsuz)
+    candidates = numbers.str.contains('R', regex=False).to_numpy(dtype=bool)
+    if candidates.any():
+        cand = numbers[candidates]
+        # Sondaki rakamlar revizyon no, öncesi 'R' veya 'REV' ile bitmeli
+        body = cand.str.rstrip('0123456789')
+        is_rev = body.str.endswith('REV')
+        is_r = body.str.endswith('R')
+        head = body.str[:-3].where(is_rev, body.str[:-1]).str.rstrip(_REVISION_SEPARATORS).str.strip()
+        matched = ((cand.str.len() > body.str.len()) & (is_rev | is_r) & (head != '')).to_numpy(dtype=bool)
+
+        positions = np.flatnonzero(candidates)[matched]
+        root[positions] = head.to_numpy(dtype=object)[matched]
+        digits = cand[matched].str.replace(r'^.*R(?:EV)?', '', regex=True)
+        rev[positions] = digits.astype('int64').to_numpy()
+
+    rev[(numbers == '').to_numpy(dtype=bool)] = -1
+    return pd.Series(root, index=values.index, dtype=numbers.dtype), pd.Series(rev, index=values.index)
+
+
+def latest_revision_positions(root: pd.Series, rev: pd.Series) -> np.ndarray:
+    """Her kök için en yüksek revizyonlu satırın pozisyonu (kök sırasına göre, eşitlikte ilk satır)."""
+    keys = pd.DataFrame({"root": root.to_numpy(), "rev": rev.to_numpy()})
+    return keys.groupby("root", sort=True)["rev"].idxmax().to_numpy()
+
 
 def filter_latest_revisions(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd.DataFrame:
     """
@@ -239,69 +238,75 @@ def filter_latest_revisions(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd
     
     Örnek:
     100, 100R1, 100R2 -> Sadece 100R2 kalır.
+
+    Vektörize çalışır: tam tablo kopyası yerine sadece numara sütunu işlenir,
+    tekilleştirme tek groupby/idxmax ile yapılır. Sonuç kök numaraya göre sıralıdır.
     """
     if df.empty or col_name not in df.columns:
         return df
-        
-    # İşlem yapmak için geçici bir kopya al
-    df_temp = df.copy()
-    
-    # 1. Temizlik ve Hazırlık
-    # String'e çevir ve boşlukları temizle
-    df_temp["_temp_no"] = df_temp[col_name].astype(str).str.strip().str.upper()
-    
-    # Boş olanları eleme (Orijinal veride kalmalı mı? Genelde boş teklif no olmaz ama varsa da filtrelemeye gerek yok)
-    # Ancak revizyon analizi için boş olmayanlar lazım.
-    
-    def parse_revision(val):
-        """
-        Teklif numarasını (Kök, Revizyon) olarak ayırır.
-        Dönüş: (Kök_String, Revizyon_Int)
-        """
-        if not val:
-            return (val, -1)
-            
-        # Regex: Başta rakamlar, sonra opsiyonel R ve rakamlar
-        # Örnek Pattern: ^(\d+)(?:R(\d+))?$
-        # Ancak bazen arada boşluk veya tire olabilir, basit tutalım.
-        # Genelde format: 1234, 1234R1, 1234-R1, 1234 R1
-        
-        # En basit mantık: Sondaki R ve sayıları bulmak.
-        match = re.search(r'^(.*?)[\s\-]*(?:R|REV)(\d+)$', val)
-        if match:
-            root = match.group(1).strip() # R öncesi
-            rev = int(match.group(2))     # R sonrası sayı
-            # Eğer root boşsa (Örn: R1 diye veri varsa), olduğu gibi kalsın
-            if not root: 
-                return (val, 0)
-            return (root, rev)
-        
-        # Eğer R formatı yoksa, direkt kendisi köktür, revizyon 0'dır.
-        # Ama şuna dikkat: 100A, 100B gibi formatlar varsa?
-        # Kullanıcı R1 R2 dediği için sadece R'ye odaklanıyoruz.
-        return (val, 0)
-
-    # Apply parse
-    # Hız için bu işlemi vektörize edebiliriz ama regex karmaşık. Apply ile yapalım.
-    parsed_data = df_temp["_temp_no"].apply(parse_revision)
-    
-    df_temp["_root_no"] = [x[0] for x in parsed_data]
-    df_temp["_rev_no"] = [x[1] for x in parsed_data]
-    
-    # 2. Sıralama: Kök'e göre ve Revizyon (Büyükten küçüğe)
-    # Böylece her grubun en üstünde en son revizyon olacak.
-    df_temp = df_temp.sort_values(by=["_root_no", "_rev_no"], ascending=[True, False])
-    
-    # 3. Tekilleştirme (Keep First = En yüksek revizyon)
-    df_filtered = df_temp.drop_duplicates(subset=["_root_no"], keep="first")
-    
-    # Geçici kolonları temizle
-    cols_to_drop = ["_temp_no", "_root_no", "_rev_no"]
-    df_filtered = df_filtered.drop(columns=cols_to_drop)
-    
-    # Sıralamayı (Tarihe göre) tekrar eski haline getirmek gerekebilir ama 
-    # genelde dashboard'da zaten tarihe göre sıralanıyor.
-    # O yüzden orijinal df'den index ile filtrelemek daha güvenli olabilir.
-    
-    return df.loc[df_filtered.index].copy()
 
+    # Yüklemede hesaplanan Kok_No / Rev_No varsa tekrar ayrıştırma yapılmaz
+    if "Kok_No" in df.columns and "Rev_No" in df.columns:
+        root, rev = df["Kok_No"], df["Rev_No"]
+    else:
+        root, rev = parse_revisions(df[col_name])
+    return df.iloc[latest_revision_positions(root, rev)].copy()
+
+
+def add_revision_columns(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd.DataFrame:
+    """
+    Kok_No, Rev_No ve Is_Latest_Rev sütunlarını ekler (yüklemede bir kez, tüm geçmiş üzerinden).
+    Is_Latest_Rev, filter_latest_revisions'ın tüm tabloda tutacağı satırları işaretler.
+    """
+    if col_name not in df.columns:
+        return df
+    root, rev = parse_revisions(df[col_name])
+    is_latest = np.zeros(len(df), dtype=bool)
+    if len(df):
+        is_latest[latest_revision_positions(root, rev)] = True
+    df["Kok_No"] = root
+    df["Rev_No"] = rev
+    df["Is_Latest_Rev"] = is_latest
+    return df
+
+
+def period_revision_mask(df: pd.DataFrame, col_name: str = "Teklif_No", by=("Yil", "Ay")) -> np.ndarray:
+    """
+    Dönem içi en güncel revizyon maskesi: by sütunlarının her diliminde filter_latest_revisions'ın
+    tutacağı satırlar (df[mask & dilim] ~ filter_latest_revisions(df[dilim]), eşitlikte ilk satır).
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    if df.empty or col_name not in df.columns:
+        return mask
+    if "Kok_No" in df.columns and "Rev_No" in df.columns:
+        root, rev = df["Kok_No"], df["Rev_No"]
+    else:
+        root, rev = parse_revisions(df[col_name])
+    keys = pd.DataFrame({**{col: df[col].to_numpy() for col in by}, "root": root.to_numpy(), "rev": rev.to_numpy()})
+    mask[keys.groupby(list(by) + ["root"], sort=False)["rev"].idxmax().to_numpy()] = True
+    return mask
+
+
+def add_period_revision_columns(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd.DataFrame:
+    """
+    Is_Latest_Rev_Ay (yıl+ay içinde) ve Is_Latest_Rev_Yil (yıl içinde) en güncel revizyon bayraklarını ekler.
+    Servis Performansı "Net" görünümü revizyonu seçili dönem içinde tekilleştirir; bayraklar yüklemede
+    bir kez hesaplanır (core.sales_cube ve detay tablosu dilim başına groupby yapmaz).
+    """
+    df["Is_Latest_Rev_Ay"] = period_revision_mask(df, col_name, ("Yil", "Ay"))
+    df["Is_Latest_Rev_Yil"] = period_revision_mask(df, col_name, ("Yil",))
+    return df
+
+
+def latest_revision_mask(df: pd.DataFrame, col_name: str = "Teklif_No") -> pd.Series:
+    """
+    Tüm geçmişe göre en güncel revizyon maskesi (df[mask] ~ filter_latest_revisions(df), sıra korunur).
+    Sadece tam tablo (all_quotes / siparis) için anlamlıdır; dönem dilimlerinde filter_latest_revisions kullanın.
+    """
+    if "Is_Latest_Rev" in df.columns:
+        return df["Is_Latest_Rev"]
+    mask = pd.Series(False, index=df.index)
+    if not df.empty and col_name in df.columns:
+        root, rev = parse_revisions(df[col_name])
+        mask.iloc[latest_revision_positions(root, rev)] = True
+    return mask
@@ -3,8 +3,9 @@ DHE Dashboard - Yardımcı Fonksiyonlar
 =====================================
 Dönüşüm, temizleme ve formatlama fonksiyonları.
 """
+import numpy as np
 import pandas as pd
-from typing import Union, Optional
+from typing import Dict, Union, Optional
 
 from config.constants import YEARLY_EXCHANGE_RATES
 import time
@@ -63,6 +64,106 @@ def get_exchange_rate(currency: str, year: int) -> float:
     return YEARLY_EXCHANGE_RATES[target_year].get(currency, 0.0)
 
 
+# =============================================================================
+# KUR TABLOSU (Yil, Ay, Para_Birimi) -> EUR dönüşüm oranı
+# =============================================================================
+RATE_INDEX_NAMES = ["Yil", "Ay", "Para_Birimi"]
+
+# kurlar sekmesindeki sütun adı varyasyonları (ilk dolu olan kullanılır)
+_KURLAR_COLUMNS = {
+    "Yil": ["yil", "year"],
+    "Ay": ["ay", "month"],
+    "EUR": ["eur", "euro"],
+    "USD": ["usd", "dolar"],
+    "GBP": ["gbp", "sterlin"],
+    "TL": ["tl", "try"],
+}
+
+# Yıllık ortalama kurlar (aylık kur yoksa kullanılır)
+_YEARLY_RATES = pd.Series(
+    {(year, currency): rate for year, rates in YEARLY_EXCHANGE_RATES.items() for currency, rate in rates.items()},
+    name="Rate",
+)
+
+
+def _first_filled(df: pd.DataFrame, names: list) -> pd.Series:
+    """Verilen sütunlardan satır bazında ilk dolu olan değer (hiçbiri yoksa '')."""
+    result = pd.Series("", index=df.index, dtype=object)
+    for name in reversed(names):
+        if name in df.columns:
+            values = df[name].astype(object).where(df[name].notna(), "").astype(str).str.strip()
+            result = values.where(values != "", result)
+    return result
+
+
+def parse_rate_table(df_kurlar: pd.DataFrame) -> pd.Series:
+    """
+    kurlar sekmesini (Yil, Ay, Para_Birimi) indeksli kur serisine çevirir (vektörize).
+    - "1,08" / "1.08" ve boşluklu değerler kabul edilir, boş kur hücresi 1.0 sayılır
+    - Sayıya çevrilemeyen satırlar atlanır; aynı ay tekrar ederse sonuncu geçerlidir
+    - TRY kuru TL sütunundan alınır
+    """
+    empty = pd.Series([], index=pd.MultiIndex.from_tuples([], names=RATE_INDEX_NAMES), dtype=float, name="Rate")
+    if df_kurlar is None or df_kurlar.empty:
+        return empty
+
+    df = df_kurlar.copy()
+    df.columns = [str(c).strip().lower().replace("ı", "i").replace("i̇", "i") for c in df.columns]
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    def numeric(col, default):
+        text = _first_filled(df, _KURLAR_COLUMNS[col]).str.replace(",", ".", regex=False).str.replace(" ", "", regex=False)
+        values = pd.to_numeric(text.where(text != "", default), errors="coerce")
+        return values
+
+    parsed = pd.DataFrame({col: numeric(col, "0" if col in ("Yil", "Ay") else "1") for col in _KURLAR_COLUMNS})
+    parsed = parsed.dropna()
+    parsed = parsed[(parsed["Yil"] > 0) & (parsed["Ay"] > 0)]
+    if parsed.empty:
+        return empty
+
+    parsed["Yil"] = parsed["Yil"].astype("int64")
+    parsed["Ay"] = parsed["Ay"].astype("int64")
+    parsed["TRY"] = parsed["TL"]
+    parsed = parsed.drop_duplicates(subset=["Yil", "Ay"], keep="last")
+
+    table = parsed.set_index(["Yil", "Ay"]).stack()
+    table.index.names = RATE_INDEX_NAMES
+    return table.astype(float).rename("Rate").sort_index()
+
+
+def rate_table_from_map(rates_map: Dict[tuple, float]) -> pd.Series:
+    """{(yil, ay, para_birimi): kur} sözlüğünü kur serisine çevirir."""
+    if not rates_map:
+        return parse_rate_table(pd.DataFrame())
+    index = pd.MultiIndex.from_tuples(list(rates_map.keys()), names=RATE_INDEX_NAMES)
+    return pd.Series(list(rates_map.values()), index=index, dtype=float, name="Rate")
+
+
+def lookup_rates(yil: pd.Series, ay: pd.Series, currency: pd.Series, rate_table: pd.Series) -> np.ndarray:
+    """
+    Her satır için EUR kuru (tek reindex ile). Aylık kur yoksa yıllık ortalama
+    (get_exchange_rate ile aynı kural: bilinmeyen yıl -> en son yıl), o da yoksa 1.0.
+    """
+    yil = pd.Series(yil).to_numpy(dtype="int64")
+    ay = pd.Series(ay).to_numpy(dtype="int64")
+    currency = pd.Series(currency).astype(str).to_numpy(dtype=object)
+
+    rates = np.full(len(yil), np.nan)
+    if len(rate_table):
+        keys = pd.MultiIndex.from_arrays([yil, ay, currency])
+        rates = rate_table.reindex(keys).to_numpy(dtype=float, copy=True)
+
+    missing = np.isnan(rates)
+    if missing.any():
+        known_years = np.array(sorted(YEARLY_EXCHANGE_RATES))
+        target_year = np.where(np.isin(yil[missing], known_years), yil[missing], known_years.max())
+        keys = pd.MultiIndex.from_arrays([target_year, currency[missing]])
+        rates[missing] = _YEARLY_RATES.reindex(keys).to_numpy(dtype=float)
+
+    return np.nan_to_num(rates, nan=1.0)
+
+
 def calculate_delta(current: float, previous: float) -> float:
     """
     İki değer arasındaki yüzdesel değişimi hesaplar.
@@ -80,6 +181,17 @@ def calculate_delta(current: float, previous: float) -> float:
     return ((current - previous) / previous) * 100.0
 
 
+# Türkçe büyük/küçük harf çeviri tabloları (modül yüklenirken bir kez oluşturulur)
+_TR_UPPER_TABLE = str.maketrans({
+    "i": "İ", "ı": "I", "ğ": "Ğ", "ü": "Ü",
+    "ş": "Ş", "ö": "Ö", "ç": "Ç", "I": "I", "İ": "İ"
+})
+_TR_LOWER_TABLE = str.maketrans({
+    "İ": "i", "I": "ı", "Ğ": "ğ", "Ü": "ü",
+    "Ş": "ş", "Ö": "ö", "Ç": "ç"
+})
+
+
 def tr_upper(text: str) -> str:
     """
     Türkçe karakterleri doğru büyüten uppercase fonksiyonu.
@@ -88,12 +200,7 @@ def tr_upper(text: str) -> str:
     if not isinstance(text, str):
         return str(text) if text is not None else ""
     
-    trans_table = str.maketrans({
-        "i": "İ", "ı": "I", "ğ": "Ğ", "ü": "Ü",
-        "ş": "Ş", "ö": "Ö", "ç": "Ç", "I": "I", "İ": "İ"
-    })
-    
-    return text.translate(trans_table).upper()
+    return text.translate(_TR_UPPER_TABLE).upper()
 
 
 def tr_lower(text: str) -> str:
@@ -104,12 +211,41 @@ def tr_lower(text: str) -> str:
     if not isinstance(text, str):
         return str(text) if text is not None else ""
         
-    trans_table = str.maketrans({
-        "İ": "i", "I": "ı", "Ğ": "ğ", "Ü": "ü",
-        "Ş": "ş", "Ö": "ö", "Ç": "ç"
-    })
-    
-    return text.translate(trans_table).lower()
+    return text.translate(_TR_LOWER_TABLE).lower()
+
+
+# =============================================================================
+# VEKTÖRİZE TÜRKÇE METİN İŞLEMLERİ (Series bazlı, .apply(tr_upper) yerine)
+# Eksik değerler (None/NaN) "" olur. Sadece i/İ ve ı/I özel eşlenir, gerisi
+# string motorunun upper/lower'ı ile yapılır (Türkçe harflerde tr_upper ile aynı).
+# =============================================================================
+def _text_series(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+def tr_upper_series(series: pd.Series) -> pd.Series:
+    """tr_upper'ın Series karşılığı."""
+    return _text_series(series).str.replace("i", "İ", regex=False).str.upper()
+
+
+def tr_lower_series(series: pd.Series) -> pd.Series:
+    """tr_lower'ın Series karşılığı."""
+    s = _text_series(series).str.replace("İ", "i", regex=False).str.replace("I", "ı", regex=False)
+    return s.str.lower()
+
+
+def collapse_spaces_series(series: pd.Series) -> pd.Series:
+    """Baştaki/sondaki boşlukları atar, aradaki boşluk gruplarını tek boşluğa indirir."""
+    return _text_series(series).str.replace("[\\s\u00a0]+", " ", regex=True).str.strip()
+
+
+def normalize_name_series(series: pd.Series) -> pd.Series:
+    """
+    İsim normalizasyonu: boşluk temizliği + Türkçe büyük harf, 'NAN' -> "".
+    Örn: "  ali   veli " -> "ALİ VELİ"
+    """
+    s = tr_upper_series(collapse_spaces_series(series))
+    return s.mask(s == "NAN", "")
 
 
 def clean_money_text(val: Union[str, float, int]) -> float:
@@ -0,0 +1,188 @@
+"""
+DHE Dashboard - İş Günü Takvimi (Core)
+======================================
+Hafta içi + resmi tatil (Tatiller sekmesi) bilgisini tek bir kümülatif diziye indirger.
+- Takvim kapsadığı her gün için "o güne kadarki iş günü sayısı"nı tutar (prefix-sum)
+- İki tarih arasındaki iş günü sayısı iki dizi okumasıdır: cum[bitiş + 1] - cum[başlangıç]
+- Personel giriş/çıkış kırpması dahil, çok sayıda teknisyen tek numpy çağrısıyla hesaplanır
+- Kapsam dışı bir tarih istenirse takvim otomatik genişler
+Tatil setine göre önbelleklenir (get_workday_calendar); her render'da yeniden kurulmaz.
+"""
+import logging
+import threading
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DAY = np.timedelta64(1, "D")
+# Varsayılan kapsam: bu yıldan SPAN_YEARS_BACK yıl öncesi -> gelecek yıl sonu
+SPAN_YEARS_BACK = 6
+_CACHE_MAX = 8
+
+
+def _to_day(value) -> Optional[np.datetime64]:
+    """Tek bir tarihi (date / datetime / Timestamp / GG.AA.YYYY metni) gün hassasiyetine çevirir."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        value = pd.to_datetime(value, dayfirst=not value[:4].isdigit(), errors="coerce")  # ISO değilse GG.AA.YYYY
+        if pd.isna(value):
+            return None
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def to_days(values) -> np.ndarray:
+    """Tarih dizisini datetime64[D] dizisine çevirir (geçersiz / boş -> NaT)."""
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[D]")
+    days = [_to_day(v) for v in arr.ravel().tolist()]
+    return np.array([np.datetime64("NaT") if d is None else d for d in days], dtype="datetime64[D]")
+
+
+def normalize_holidays(holidays: Optional[Iterable]) -> np.ndarray:
+    """Tatil setini sıralı, tekil datetime64[D] dizisine çevirir (ayrıştırılamayanlar atlanır)."""
+    days = [_to_day(h) for h in (holidays or ())]
+    return np.unique(np.array([d for d in days if d is not None], dtype="datetime64[D]"))
+
+
+def weekday_of(days: np.ndarray) -> np.ndarray:
+    """datetime64[D] dizisinin haftanın günü (Pzt=0 ... Paz=6). 1970-01-01 Perşembe."""
+    return (days.astype("int64") + 3) % 7
+
+
+class WorkdayCalendar:
+    """
+    Tatil duyarlı iş günü takvimi.
+
+    Args:
+        holidays: Tatil tarihleri (date / Timestamp / metin)
+        start, end: Başlangıç kapsamı (dahil); sonradan gerektiğinde genişler
+    """
+
+    def __init__(self, holidays: Optional[Iterable] = None, start=None, end=None):
+        self.holidays = normalize_holidays(holidays)
+        today = date.today()
+        start, end = _to_day(start), _to_day(end)
+        if start is None:
+            start = np.datetime64(date(today.year - SPAN_YEARS_BACK, 1, 1), "D")
+        if end is None:
+            end = np.datetime64(date(today.year + 1, 12, 31), "D")
+        if self.holidays.size:
+            start = min(start, self.holidays[0])
+            end = max(end, self.holidays[-1])
+        self._lock = threading.Lock()
+        self._span = self._build(start, end)
+
+    def _build(self, start: np.datetime64, end: np.datetime64) -> Tuple[np.datetime64, np.datetime64, np.ndarray]:
+        days = np.arange(start, end + DAY, dtype="datetime64[D]")
+        is_workday = (weekday_of(days) < 5) & ~np.isin(days, self.holidays)
+        cum = np.concatenate(([0], np.cumsum(is_workday, dtype=np.int64)))
+        return start, end, cum
+
+    def _ensure(self, lo: np.datetime64, hi: np.datetime64):
+        """Kapsamı [lo, hi] aralığını içerecek şekilde genişletir; (başlangıç, kümülatif) döner."""
+        start, end, cum = self._span
+        if lo >= start and hi <= end:
+            return start, cum
+        with self._lock:
+            start, end, cum = self._span
+            if lo < start or hi > end:
+                start, end = min(start, lo), max(end, hi)
+                logger.info(f"[Workdays] Takvim kapsamı genişletildi: {start} - {end}")
+                self._span = start, end, cum = self._build(start, end)
+        return start, cum
+
+    @property
+    def span(self) -> Tuple[date, date]:
+        start, end, _ = self._span
+        return start.astype(date), end.astype(date)
+
+    def count(self, start, end) -> int:
+        """[start, end] aralığındaki (dahil) iş günü sayısı; start > end ise 0."""
+        lo, hi = _to_day(start), _to_day(end)
+        if lo is None or hi is None or lo > hi:
+            return 0
+        base, cum = self._ensure(lo, hi)
+        return int(cum[(hi - base) // DAY + 1] - cum[(lo - base) // DAY])
+
+    def count_many(self, starts, ends) -> np.ndarray:
+        """
+        Vektörize count: starts[i]..ends[i] aralıklarının iş günü sayıları.
+        NaT içeren veya ters aralıklar 0 döner.
+        """
+        lo, hi = to_days(starts), to_days(ends)
+        valid = ~np.isnat(lo) & ~np.isnat(hi) & (lo <= hi)
+        result = np.zeros(len(lo), dtype=np.int64)
+        if not valid.any():
+            return result
+        lo, hi = lo[valid], hi[valid]
+        base, cum = self._ensure(lo.min(), hi.max())
+        result[valid] = cum[(hi - base) // DAY + 1] - cum[(lo - base) // DAY]
+        return result
+
+    def is_workday(self, dates) -> np.ndarray:
+        """Her tarih için iş günü mü (hafta içi ve tatil değil); NaT -> False."""
+        days = to_days(dates)
+        return ~np.isnat(days) & (weekday_of(days) < 5) & ~np.isin(days, self.holidays)
+
+    def period_workdays(self, year: int, month: Optional[int] = None, until_today: bool = True) -> int:
+        """Yıl / ay dönemindeki iş günü sayısı (until_today: bugünden sonrası sayılmaz)."""
+        return self.count(*period_bounds(year, month, until_today))
+
+    def effective_workdays(self, year: int, month: Optional[int] = None,
+                           starts=None, ends=None, until_today: bool = True) -> np.ndarray:
+        """
+        Dönem iş günlerini her personelin giriş / çıkış tarihleriyle kırparak sayar.
+        starts / ends: eşit uzunlukta tarih dizileri (NaT = sınır yok). Çıkış: int64 dizisi.
+        """
+        p_start, p_end = period_bounds(year, month, until_today)
+        starts = to_days(starts)
+        ends = to_days(ends if ends is not None else [None] * len(starts))
+        lo = np.where(np.isnat(starts) | (starts < p_start), p_start, starts)
+        hi = np.where(np.isnat(ends) | (ends > p_end), p_end, ends)
+        return self.count_many(lo, hi)
+
+
+def period_bounds(year: int, month: Optional[int] = None, until_today: bool = True) -> Tuple[np.datetime64, np.datetime64]:
+    """Dönemin ilk ve son günü (datetime64[D]); until_today ise son gün bugünle sınırlanır."""
+    if month:
+        start = np.datetime64(f"{year:04d}-{month:02d}", "M")
+        end = (start + 1).astype("datetime64[D]") - DAY
+        start = start.astype("datetime64[D]")
+    else:
+        start = np.datetime64(f"{year:04d}-01-01", "D")
+        end = np.datetime64(f"{year:04d}-12-31", "D")
+    if until_today:
+        end = min(end, np.datetime64(date.today(), "D"))
+    return start, end
+
+
+# =============================================================================
+# ÖNBELLEK
+# =============================================================================
+_calendars = {}
+_calendars_lock = threading.Lock()
+
+
+def get_workday_calendar(holidays: Optional[Iterable] = None, start=None, end=None) -> WorkdayCalendar:
+    """
+    Tatil setine göre önbelleklenmiş takvimi döner (yoksa kurar).
+    start / end verilirse takvim en az bu aralığı kapsayacak şekilde genişletilir.
+    """
+    key = frozenset(holidays or ())
+    with _calendars_lock:
+        calendar = _calendars.get(key)
+        if calendar is None:
+            if len(_calendars) >= _CACHE_MAX:
+                _calendars.pop(next(iter(_calendars)))
+            calendar = _calendars[key] = WorkdayCalendar(key, start, end)
+    lo, hi = _to_day(start), _to_day(end)
+    if lo is not None and hi is not None and lo <= hi:
+        calendar._ensure(lo, hi)
+    return calendar
@@ -0,0 +1,34 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_pipeline import STAGES, run_benchmarks, save_results, compare_results
+
+
+class TestBenchPipeline(unittest.TestCase):
+
+    def test_run_save_and_compare(self):
+        """Küçük hacimde tüm aşamalar ölçülmeli, JSON'a yazılmalı ve karşılaştırılabilmeli."""
+        report = run_benchmarks(scales=[0.05], repeat=1, seed=1)
+        stages = report["results"]["0.05"]
+        self.assertEqual(set(stages), set(STAGES))
+        self.assertTrue(all(s["rows"] > 0 for s in stages.values()))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = save_results(report, os.path.join(tmp, "bench.json"))
+            with open(path, encoding="utf-8") as f:
+                baseline = json.load(f)
+
+        # Aynı rapor -> regression yok; 2 kat yavaş aşama -> regression
+        self.assertFalse(any(r["regression"] for r in compare_results(baseline, report)))
+        slower = json.loads(json.dumps(report))
+        slower["results"]["0.05"]["crm"]["min_s"] *= 2
+        flagged = [r["stage"] for r in compare_results(baseline, slower) if r["regression"]]
+        self.assertEqual(flagged, ["crm"])
+
+
+if __name__ == '__main__':
+    unittest.main()
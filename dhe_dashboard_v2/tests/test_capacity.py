@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date
+
+import pandas as pd
+from core.capacity import personnel_dates, technician_capacity, CAPACITY_COLUMNS
+from core.date_utils import calculate_effective_workdays
+from core.field_facts import build_technician_days, filter_period
+
+
+class TestTechnicianCapacity(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.to_datetime(["2025-01-02", "2025-01-03", "2025-01-06", "2025-01-07", "2025-01-08", "2025-01-13"])
+        self.facts = filter_period(build_technician_days(pd.DataFrame({
+            "Tarih": dates,
+            "Yil": dates.year,
+            "Ay": dates.month,
+            "Teknisyen 1": ["ALİ", "ALİ", "VELİ", "ALİ", "ALİ", "VELİ"],
+            "Teknisyen 2": ["VELİ", "", "", "", "", ""],
+            "Durum": ["AKTİF", "AKTİF", "AKTİF", "İZİNLİ", "AKTİF", "AKTİF"],
+            "Müşteri": ["A", "B", "C", "", "D", "E"],
+            "Şehir": ["ADANA"] * 6,
+            "İşlem": ["BAKIM", "ARIZA", "BAKIM", "", "DEVREYE ALMA", "BAKIM"],
+        })), 2025, 1)
+        self.personel = pd.DataFrame({
+            "Ad_Soyad": ["Ali", "VELİ", "ALİ"],
+            "Ise_Giris": pd.to_datetime(["2024-01-01", "2025-01-06", "2020-01-01"]),
+            "Isten_Cikis": pd.to_datetime([None, "2025-01-10", None]),
+        })
+        self.holidays = {date(2025, 1, 1)}
+
+    def test_personnel_dates(self):
+        dates = personnel_dates(self.personel)
+        self.assertEqual(dates.index.tolist(), ["ALİ", "VELİ"])  # Türkçe büyük harf, ilk kayıt
+        self.assertEqual(dates.loc["ALİ", "Ise_Giris"], pd.Timestamp("2024-01-01"))
+        self.assertTrue(personnel_dates(pd.DataFrame()).empty)
+        self.assertTrue(personnel_dates(self.personel[["Ad_Soyad"]])["Ise_Giris"].isna().all())
+
+    def test_capacity_table(self):
+        result = technician_capacity(self.facts, self.personel, ["ALİ", "VELİ", "YENİ", "ALİ"], 2025, 1, self.holidays)
+        self.assertEqual(result.columns.tolist(), CAPACITY_COLUMNS)
+        self.assertEqual(result.index.tolist(), ["ALİ", "VELİ", "YENİ"])
+
+        # Kapasite: tek tek hesapla aynı (VELİ 06-10 Ocak arası çalışmış)
+        for tek, start, end in [("ALİ", "2024-01-01", None), ("VELİ", "2025-01-06", "2025-01-10"), ("YENİ", None, None)]:
+            expected = calculate_effective_workdays(2025, 1, pd.Timestamp(start) if start else None,
+                                                    pd.Timestamp(end) if end else None, holidays=self.holidays)
+            self.assertEqual(result.loc[tek, "Kapasite"], expected, tek)
+
+        ali = result.loc["ALİ"]
+        self.assertEqual((ali["Sahada"], ali["Izin"], ali["Bakım"], ali["Arıza"], ali["Devreye Alma"]), (3, 1, 1, 1, 1))
+        self.assertEqual(ali["Atolye"], ali["Kapasite"] - 4)
+        self.assertAlmostEqual(ali["Verimlilik"], 3 / ali["Kapasite"] * 100)
+
+        # VELİ: 02.01 ve 13.01 çalışma aralığı dışında -> sadece 06.01 sayılır
+        veli = result.loc["VELİ"]
+        self.assertEqual((veli["Kapasite"], veli["Sahada"], veli["Atolye"]), (5, 1, 4))
+        self.assertAlmostEqual(veli["Verimlilik"], 20.0)
+
+        self.assertEqual(result.loc["YENİ", "Sahada"], 0)
+
+    def test_future_period(self):
+        result = technician_capacity(self.facts.iloc[0:0], self.personel, ["ALİ"], date.today().year + 1, 1)
+        self.assertEqual(result.loc["ALİ", "Kapasite"], 0)
+        self.assertEqual(result.loc["ALİ", "Verimlilik"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from core.crm_scoring import CrmScorer, assemble_crm, build_aggregates
+from core.transforms import prepare_crm_data
+
+NOW = datetime(2026, 10, 1)
+
+
+def legacy_crm(df_teklif, df_siparis, df_musteri):
+    """Eski satır bazlı (apply) CRM hesabı - referans."""
+    cust_sip = df_siparis.groupby("Musteri").agg(
+        Total_Ciro_EUR=('Tutar_EUR', 'sum'), Siparis_Adedi=('Siparis_No', 'nunique'),
+        Son_Siparis_Tarihi=('Tarih', 'max'), Ilk_Siparis_Tarihi=('Tarih', 'min')).reset_index()
+    cust_sip["Gun_Farki"] = (cust_sip["Son_Siparis_Tarihi"] - cust_sip["Ilk_Siparis_Tarihi"]).dt.days
+    cust_sip["Purchase_Frequency"] = cust_sip.apply(
+        lambda x: x["Gun_Farki"] / (x["Siparis_Adedi"] - 1) if x["Siparis_Adedi"] > 1 else 0, axis=1)
+    last_quotes = df_teklif.sort_values("Tarih").drop_duplicates("Musteri", keep="last")
+    last_quotes = last_quotes[["Musteri", "Teklif_No", "Tutar_EUR"]].rename(
+        columns={"Teklif_No": "Son_Teklif_No", "Tutar_EUR": "Son_Teklif_Tutar"})
+    cust_teklif = df_teklif.groupby("Musteri").agg(
+        Total_Teklif_EUR=('Tutar_EUR', 'sum'), Teklif_Sayisi=('Teklif_No', 'nunique'),
+        Son_Teklif_Tarihi=('Tarih', 'max'), Ilk_Teklif_Tarihi=('Tarih', 'min')).reset_index()
+    cust_teklif = pd.merge(cust_teklif, last_quotes, on="Musteri", how="left")
+    all_customers = df_musteri[['Kisa_Ad', 'Uzun_Ad', 'Sorumlu_Clean']].rename(columns={'Kisa_Ad': 'Musteri'})
+    df_crm = pd.merge(pd.merge(all_customers, cust_sip, on="Musteri", how="left"), cust_teklif, on="Musteri", how="left")
+    for col in ("Total_Teklif_EUR", "Total_Ciro_EUR", "Siparis_Adedi", "Teklif_Sayisi"):
+        df_crm[col] = df_crm[col].fillna(0)
+    df_crm = df_crm.sort_values("Total_Teklif_EUR", ascending=False, kind="stable")
+    total = df_crm["Total_Teklif_EUR"].sum()
+    df_crm["Cum_Quote"] = df_crm["Total_Teklif_EUR"].cumsum()
+    df_crm["Revenue_Share"] = df_crm["Cum_Quote"] / total
+
+    def assign_segment(row):
+        if row["Total_Teklif_EUR"] == 0:
+            return "Pasif"
+        elif row["Revenue_Share"] <= 0.80:
+            return "🥇 VIP"
+        elif row["Revenue_Share"] <= 0.95:
+            return "🥈 Gold"
+        return "🥉 Standart"
+    df_crm["Segment"] = df_crm.apply(assign_segment, axis=1)
+    df_crm["Recency_Days"] = (NOW - df_crm["Son_Teklif_Tarihi"]).dt.days.fillna(9999).astype(int)
+    df_crm["Riskli"] = df_crm.apply(lambda r: "VIP" in r["Segment"] and r["Recency_Days"] > 90, axis=1)
+    return df_crm
+
+
+def finance_frames(seed=1, n_customers=60, n_rows=400):
+    rng = np.random.default_rng(seed)
+    customers = [f"M{i:03d}" for i in range(n_customers)]
+    # Müşteri başına benzersiz tarihler (son teklif eşitliği olmasın)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.permutation(900)[:n_rows], unit="D")
+
+    def frame(id_col, prefix, k):
+        return pd.DataFrame({
+            "Musteri": rng.choice(customers[:-5], size=k),  # Son 5 müşteri: hiç işlem yok
+            id_col: [f"{prefix}{i}" for i in range(k)],
+            "Tutar_EUR": rng.gamma(2.0, 5000.0, size=k).round(2),
+            "Tarih": dates[:k].astype("datetime64[us]"),
+        })
+    teklif = frame("Teklif_No", "T", n_rows)
+    siparis = frame("Siparis_No", "S", n_rows // 3)
+    musteri = pd.DataFrame({"Kisa_Ad": customers, "Uzun_Ad": [c + " A.Ş." for c in customers],
+                            "Sorumlu_Clean": "MERT"})
+    return teklif, siparis, musteri
+
+
+class TestCrmScoring(unittest.TestCase):
+
+    def assert_same(self, result, expected):
+        self.assertEqual(result.columns.tolist(), expected.columns.tolist())
+        self.assertEqual(result.index.tolist(), expected.index.tolist())
+        for col in expected.columns:
+            x = result[col].astype(object).where(result[col].notna(), None).tolist()
+            y = expected[col].astype(object).where(expected[col].notna(), None).tolist()
+            self.assertEqual(x, y, col)
+
+    def test_parity_with_legacy(self):
+        teklif, siparis, musteri = finance_frames()
+        result = assemble_crm(build_aggregates(teklif, siparis), musteri, now=NOW)
+        expected = legacy_crm(teklif, siparis, musteri)
+        self.assert_same(result, expected)
+        self.assertEqual(set(result["Segment"]), {"Pasif", "🥇 VIP", "🥈 Gold", "🥉 Standart"})
+        self.assertTrue(result["Riskli"].any())
+
+    def test_incremental_matches_full(self):
+        teklif, siparis, musteri = finance_frames(seed=2)
+        scorer = CrmScorer()
+        scorer.update(teklif, siparis, musteri, now=NOW)
+        self.assertEqual(scorer.last_touched, 55)  # İlk çağrı: işlemi olan tüm müşteriler
+
+        # Değişmeyen veri -> hiçbir müşteri yeniden toplanmaz
+        scorer.update(teklif, siparis, musteri, now=NOW)
+        self.assertEqual(scorer.last_touched, 0)
+
+        # Bir tutar değişir, bir müşterinin tüm teklifleri silinir, yeni müşteriye teklif eklenir
+        teklif2 = teklif.copy()
+        teklif2.loc[0, "Tutar_EUR"] += 1000
+        silinen = teklif2.loc[1, "Musteri"]
+        teklif2 = teklif2[teklif2["Musteri"] != silinen]
+        yeni = pd.DataFrame({"Musteri": ["M059"], "Teklif_No": ["T9999"], "Tutar_EUR": [5e5],
+                             "Tarih": pd.to_datetime(["2025-06-30"]).astype("datetime64[us]")})
+        teklif2 = pd.concat([teklif2, yeni], ignore_index=True)
+
+        result = scorer.update(teklif2, siparis, musteri, now=NOW)
+        self.assertLessEqual(scorer.last_touched, 3)
+        self.assert_same(result, assemble_crm(build_aggregates(teklif2, siparis), musteri, now=NOW))
+        self.assertEqual(result.iloc[0]["Musteri"], "M059")
+
+    def test_prepare_crm_data(self):
+        teklif, siparis, musteri = finance_frames(seed=3)
+        teklif.loc[teklif.index[:5], "Teklif_No"] = ["X1", "X1R1", "X1R2", "X2", "X2 R1"]  # Revizyonlar tekilleşir
+        df_crm = prepare_crm_data(teklif, siparis, musteri)
+        self.assertEqual(len(df_crm), len(musteri))
+        self.assertEqual(df_crm["Teklif_Sayisi"].sum(), len(teklif) - 3)
+        self.assertTrue(df_crm["Total_Teklif_EUR"].is_monotonic_decreasing)
+
+        # Müşteri listesi yoksa siparişi olan müşteriler
+        df_crm = prepare_crm_data(teklif, siparis, musteri.iloc[0:0])
+        self.assertEqual(sorted(df_crm["Musteri"]), sorted(siparis["Musteri"].unique()))
+        self.assertTrue((df_crm["Sorumlu_Clean"] == "Genel").all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from core.crm_scoring import assemble_crm, build_aggregates
+from core.customer_analytics import ANALYTICS_COLUMNS, build_customer_analytics, quantile_scores
+
+NOW = datetime(2025, 7, 1)
+
+
+class TestCustomerAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        # A: 2 sipariş (1 yıl arayla), B: 1 sipariş, C: sadece teklif (eski), D: işlemsiz
+        self.teklif = pd.DataFrame({
+            "Musteri": ["A", "A", "A", "B", "B", "C"],
+            "Teklif_No": ["T1", "T2", "T3", "T4", "T5", "T6"],
+            "Tutar_EUR": [1000.0, 3000.0, 500.0, 2000.0, 800.0, 400.0],
+            "Tarih": pd.to_datetime(["2024-01-10", "2025-01-10", "2025-06-01", "2024-11-01", "2025-02-01", "2023-03-01"]),
+            "Is_Latest_Rev": [True, True, True, True, True, True],
+        })
+        self.siparis = pd.DataFrame({
+            "Musteri": ["A", "A", "B"],
+            "Siparis_No": ["T1", "T2", "T4"],
+            "Tutar_EUR": [1000.0, 3000.0, 2000.0],
+            "Tarih": pd.to_datetime(["2024-01-10", "2025-01-10", "2024-11-01"]),
+        })
+        self.musteri = pd.DataFrame({"Kisa_Ad": list("ABCD"), "Uzun_Ad": list("ABCD"), "Sorumlu_Clean": "MERT"})
+        self.crm = assemble_crm(build_aggregates(self.teklif, self.siparis), self.musteri, now=NOW)
+        self.result = build_customer_analytics(self.crm, self.teklif, self.siparis, now=NOW).set_index("Musteri")
+
+    def test_columns_and_order(self):
+        result = build_customer_analytics(self.crm, self.teklif, self.siparis, now=NOW)
+        self.assertEqual(result["Musteri"].tolist(), self.crm["Musteri"].tolist())
+        self.assertTrue(set(ANALYTICS_COLUMNS) <= set(result.columns))
+        self.assertTrue(build_customer_analytics(self.crm.iloc[0:0], self.teklif, self.siparis).empty)
+
+    def test_recency_groups(self):
+        r = self.result
+        self.assertEqual(r.loc["A", "Recency_Grubu"], "0-6 AY")    # Son teklif 30 gün önce
+        self.assertEqual(r.loc["B", "Recency_Grubu"], "0-6 AY")    # 150 gün
+        self.assertEqual(r.loc["C", "Recency_Grubu"], "24+ AY")
+        self.assertTrue(pd.isna(r.loc["D", "Recency_Grubu"]))      # Teklif hacmi yok
+        self.assertEqual(r.loc["D", "Segment_Etiket"], "Uyuyan")
+
+    def test_rfm_scores(self):
+        r = self.result
+        self.assertEqual(r.loc["D", "RFM_Kod"], "-")
+        self.assertEqual(r.loc["D", "RFM_Toplam"], 0)
+        self.assertEqual(r.loc["A", "M_Skor"], 5)                  # En yüksek ciro
+        self.assertEqual(r.loc["A", "R_Skor"], 5)                  # En yeni işlem
+        self.assertEqual(r.loc["C", "F_Skor"], 2)                  # Siparişsiz: en düşük dilim
+        self.assertEqual(r.loc["A", "RFM_Kod"], f"{r.loc['A', 'R_Skor']}{r.loc['A', 'F_Skor']}{r.loc['A', 'M_Skor']}")
+
+        scores = quantile_scores(pd.Series([10, 20, 30, 40, 50, 0]), np.array([1, 1, 1, 1, 1, 0], dtype=bool), 5)
+        self.assertEqual(scores.tolist(), [1, 2, 3, 4, 5, 0])
+
+    def test_conversion_and_clv(self):
+        r = self.result
+        self.assertAlmostEqual(r.loc["A", "Donusum_Orani"], 2 / 3)
+        self.assertAlmostEqual(r.loc["B", "Donusum_Orani"], 0.5)
+        self.assertEqual(r.loc["D", "Donusum_Orani"], 0.0)
+
+        # A: ort. sipariş 2000, 366 gün arayla 2 sipariş, ilk siparişten 538 gün
+        self.assertEqual(r.loc["A", "Ort_Siparis_Araligi"], 366)
+        self.assertTrue(np.isnan(r.loc["B", "Ort_Siparis_Araligi"]))
+        yearly = 2 * 365 / 538
+        aktif = 1 - 172 / 730
+        self.assertAlmostEqual(r.loc["A", "CLV_Tahmini"], 2000 * yearly * 3 * aktif)
+        self.assertEqual(r.loc["C", "CLV_Tahmini"], 0.0)
+
+    def test_without_orders(self):
+        result = build_customer_analytics(
+            assemble_crm(build_aggregates(self.teklif, self.siparis.iloc[0:0]), self.musteri, now=NOW),
+            self.teklif, self.siparis.iloc[0:0], now=NOW)
+        self.assertTrue((result["CLV_Tahmini"] == 0).all())
+        self.assertTrue((result["Donusum_Orani"] == 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -63,3 +63,131 @@ def test_process_finance_dataframe_cleaning():
     assert df_result.iloc[0]["Tutar_Ham"] == 1000.50
     assert df_result.iloc[0]["Maliyet_Ham"] == 500.00
     assert df_result.iloc[0]["Tutar_EUR"] == 1000.50 # Rate default 1.0 for EUR
+
+def test_saha_window_start():
+    """Cari yıl penceresi son ayların ilk satırından başlamalı."""
+    from core.data_loader import _saha_window_start
+
+    today = pd.Timestamp.now().normalize()
+    old = (today - pd.DateOffset(months=6)).strftime("%d.%m.%Y")
+    recent = today.strftime("%d.%m.%Y")
+    df = pd.DataFrame({"Tarih": [old, old, "", recent, recent]})
+
+    assert _saha_window_start(df) == 3
+    assert _saha_window_start(pd.DataFrame({"Tarih": [old]})) == 1
+    assert _saha_window_start(pd.DataFrame()) is None
+
+def _saha_sheet(rows):
+    """Servis Programı düzeninde (başlık üstü + başlık + veri) bellek içi yıl sekmesi."""
+    from core.data_sources import TableSpreadsheet
+    return TableSpreadsheet("saha", {"2026": [["SERVİS PROGRAMI"], ["Tarih", "Teknisyen 1", "Müşteri"]] + rows})
+
+def test_saha_window_splice_checks_overlap():
+    """Pencere birleştirmesi sadece pencere üstü değişmediyse yapılmalı."""
+    from core.data_loader import _fetch_saha_window
+
+    rows = [["01.01.2026", "ALİ", "A"], ["02.01.2026", "VELİ", "B"], ["01.03.2026", "ALİ", "C"]]
+    previous = pd.DataFrame(rows, columns=["Tarih", "Teknisyen 1", "Müşteri"])
+
+    # Pencereye satır eklenmiş, üstü aynı -> birleştirilir
+    grown = rows + [["02.03.2026", "VELİ", "D"]]
+    df = _fetch_saha_window(_saha_sheet(grown), "2026", previous, 2)
+    assert df.values.tolist() == grown
+
+    # Pencere üstüne satır eklenmiş / silinmiş -> sınır satırı kayar, tam okuma
+    assert _fetch_saha_window(_saha_sheet([rows[0], ["15.01.2026", "ALİ", "X"]] + grown[1:]), "2026", previous, 2) is None
+    assert _fetch_saha_window(_saha_sheet(grown[1:]), "2026", previous, 2) is None
+
+    # Yeni sütun (başlıklı ya da sadece pencere verisinde) -> tam okuma
+    from core.data_sources import TableSpreadsheet
+    wide = TableSpreadsheet("saha", {"2026": [["SERVİS PROGRAMI"], ["Tarih", "Teknisyen 1", "Müşteri", "Şehir"]] + rows})
+    assert _fetch_saha_window(wide, "2026", previous, 2) is None
+    assert _fetch_saha_window(_saha_sheet(rows[:2] + [rows[2] + ["İZMİR"]]), "2026", previous, 2) is None
+
+def test_saha_archive_grace_period():
+    """Geçmiş yıl, ertesi Ocak bitmeden dondurulmamalı."""
+    from datetime import datetime
+    from core.data_loader import _saha_archivable
+
+    assert not _saha_archivable("2025", datetime(2026, 1, 1))
+    assert not _saha_archivable("2025", datetime(2026, 1, 31, 23, 59))
+    assert _saha_archivable("2025", datetime(2026, 2, 1))
+    assert _saha_archivable("2024", datetime(2026, 1, 15))
+
+def test_saha_empty_past_year_is_not_archived(monkeypatch, tmp_path):
+    """Boş okunan geçmiş yıl sekmesi arşive dondurulmamalı."""
+    import core.data_loader as dl
+    from core.data_sources import TableSpreadsheet
+    from core.sync import SheetSyncState
+
+    monkeypatch.setitem(dl.SAHA_FETCH_CONFIG, "ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(dl, "SAHA_YEARS", ["2024"])
+    sheet = TableSpreadsheet("saha", {"2024": [["SERVİS PROGRAMI"], ["Tarih", "Teknisyen 1"]]})
+
+    results = dl._sync_saha_tabs(sheet, SheetSyncState())
+
+    assert results["2024"].empty
+    assert not os.path.exists(dl._saha_archive_path("2024"))
+
+def test_saha_archive_is_per_source(monkeypatch, tmp_path):
+    """Sentetik kaynakla dondurulan yıl, canlı kaynağa dönüldüğünde okunmamalı."""
+    import core.data_loader as dl
+    from core.data_sources import TableSpreadsheet, GSpreadSource, SyntheticSource, set_data_source
+    from core.sync import SheetSyncState
+
+    monkeypatch.setitem(dl.SAHA_FETCH_CONFIG, "ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(dl, "SAHA_YEARS", ["2024"])
+    header = [["SERVİS PROGRAMI"], ["Tarih", "Teknisyen 1"]]
+    fake = TableSpreadsheet("saha", {"2024": header + [["01.01.2024", "SENTETİK"]]})
+    real = TableSpreadsheet("saha", {"2024": header + [["02.01.2024", "ALİ"]]})
+    try:
+        set_data_source(SyntheticSource(seed=1))
+        synthetic_path = dl._saha_archive_path("2024")
+        assert dl._sync_saha_tabs(fake, SheetSyncState())["2024"]["Teknisyen 1"].tolist() == ["SENTETİK"]
+        assert os.path.exists(synthetic_path)
+
+        set_data_source(GSpreadSource())
+        assert dl._saha_archive_path("2024") != synthetic_path
+        assert dl._sync_saha_tabs(real, SheetSyncState())["2024"]["Teknisyen 1"].tolist() == ["ALİ"]
+    finally:
+        set_data_source(None)
+
+class _FailingSpreadsheet:
+    """Her okumada API hatası (429) fırlatan sahte Servis Programı dosyası."""
+    bypass_quota = True
+
+    def get_lastUpdateTime(self):
+        return "v2"
+
+    def worksheet(self, title):
+        raise RuntimeError("429 Too Many Requests")
+
+    def worksheets(self):
+        raise RuntimeError("429 Too Many Requests")
+
+    def values_get(self, range_name, params=None):
+        raise RuntimeError("429 Too Many Requests")
+
+    def values_batch_get(self, ranges, params=None):
+        raise RuntimeError("429 Too Many Requests")
+
+def test_saha_fetch_error_keeps_cached_tabs(monkeypatch):
+    """Çekme hatasında son geçerli yıl sekmeleri boş tablo ile ezilmemeli."""
+    import core.data_loader as dl
+    from core.sync import SheetSyncState
+
+    monkeypatch.setitem(dl.SAHA_FETCH_CONFIG, "ARCHIVE_PAST_YEARS", False)
+    sync = SheetSyncState()
+    cached = {}
+    for year in dl.SAHA_YEARS:
+        cached[year] = pd.DataFrame({"Tarih": [f"01.01.{year}"], "Teknisyen 1": ["ALİ"]})
+        sync.update_tab(dl.SAHA_SHEETS_NAME, year, cached[year])
+    sync.mark_file_synced(dl.SAHA_SHEETS_NAME, "v1")
+
+    results = dl._sync_saha_tabs(_FailingSpreadsheet(), sync)
+
+    for year in dl.SAHA_YEARS:
+        assert results[year] is cached[year]
+        assert sync.cached_tabs(dl.SAHA_SHEETS_NAME)[year] is cached[year]
+    # Sürüm kaydedilmedi: bir sonraki yenilemede tekrar denenir
+    assert not sync.is_file_unchanged(dl.SAHA_SHEETS_NAME, "v2")
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gspread
+import pandas as pd
+from core.data_sources import (
+    TableSpreadsheet, LocalDirSource, SyntheticSource, create_data_source, split_range_name
+)
+from core.gsheets import batch_read_gsheets, fetch_sheet_data, fetch_sheet_range
+from core.synthetic import SAHA_FILE_NAME
+
+
+class TestTableSpreadsheet(unittest.TestCase):
+
+    def setUp(self):
+        self.sh = TableSpreadsheet("Test", {
+            "2025": [["başlık üstü"], ["Tarih", "Teknisyen 1", "Not"], ["01.01.2025", "ALİ", ""], ["02.01.2025", "VELİ", "x"]],
+        }, version="v1")
+
+    def test_split_range_name(self):
+        self.assertEqual(split_range_name("'Sekme''1'!A6:H"), ("Sekme'1", "A6:H"))
+        self.assertEqual(split_range_name("'2025'"), ("2025", ""))
+        self.assertEqual(split_range_name("kurlar!A1:B2"), ("kurlar", "A1:B2"))
+
+    def test_gsheets_helpers_work_on_table(self):
+        """core.gsheets yardımcıları bellek içi handle ile de çalışmalı."""
+        self.assertEqual(len(fetch_sheet_data(self.sh, "2025")), 4)
+        # Pencere okuma: sondaki boş hücre API gibi kırpılır
+        self.assertEqual(fetch_sheet_range(self.sh, "2025", "A3:B"), [["01.01.2025", "ALİ"], ["02.01.2025", "VELİ"]])
+        with self.assertRaises(gspread.exceptions.WorksheetNotFound):
+            fetch_sheet_data(self.sh, "2030")
+
+    def test_local_dir_source(self):
+        """Sekme başına CSV dosyaları ham ızgara olarak okunmalı."""
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "DHE_Data"))
+            with open(os.path.join(root, "DHE_Data", "sehirler.csv"), "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows([["SehirAd", "BolgeId", "BolgeAd"], ["İzmir", "3", "Ege"]])
+            pd.DataFrame({"Yıl": ["2025"], "Ay": ["1"]}).to_parquet(os.path.join(root, "DHE_Data", "kurlar.parquet"))
+
+            sh = LocalDirSource(root).open("DHE_Data")
+            results = batch_read_gsheets(sh, {
+                "sehirler": ("sehirler", {"SehirAd": "Sehir_Ad", "BolgeAd": "Bolge_Ad"}),
+                "kurlar": ("kurlar", None),
+            })
+            self.assertEqual(results["sehirler"].iloc[0].tolist(), ["İzmir", "Ege"])
+            self.assertEqual(list(results["kurlar"].columns), ["Yıl", "Ay"])
+
+            with self.assertRaises(FileNotFoundError):
+                LocalDirSource(root).open("YOK")
+
+    def test_synthetic_source_is_seeded(self):
+        a = SyntheticSource(seed=7).open(SAHA_FILE_NAME).worksheet("2025").get_all_values()
+        b = SyntheticSource(seed=7).open(SAHA_FILE_NAME).worksheet("2025").get_all_values()
+        self.assertEqual(a, b)
+        self.assertEqual(a[1][0], "Tarih")  # Başlık 2. satırda
+
+    def test_create_data_source(self):
+        self.assertEqual(create_data_source("synthetic").name, "synthetic")
+        with self.assertRaises(ValueError):
+            create_data_source("ftp")
+
+    def test_storage_key_identifies_data(self):
+        """Snapshot / arşiv klasörü backend'e ve verisini belirleyen ayarlara göre ayrılır."""
+        keys = {
+            create_data_source("gspread").storage_key,
+            SyntheticSource(seed=1).storage_key,
+            SyntheticSource(seed=2).storage_key,
+            SyntheticSource(seed=1, scale=0.5).storage_key,
+            LocalDirSource("a").storage_key,
+            LocalDirSource("b").storage_key,
+        }
+        self.assertEqual(len(keys), 6)
+        self.assertEqual(LocalDirSource("a").storage_key, LocalDirSource("a").storage_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
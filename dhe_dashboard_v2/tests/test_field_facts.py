@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date
+
+import pandas as pd
+from core.data_loader import process_saha
+from core.field_facts import (build_technician_days, filter_period, clip_to_employment,
+                              summarize_technicians, monthly_technician_days)
+from core.synthetic import generate_workbooks, SAHA_FILE_NAME
+
+
+def legacy_summary(df, tek, holidays):
+    """Eski görünümdeki teknisyen başına maske + nunique hesabı (referans)."""
+    mask = (df['Teknisyen 1'] == tek) | (df['Teknisyen 2'] == tek)
+    tek_df = df[mask]
+    aktif = tek_df[tek_df['Durum'] == 'AKTİF']
+    izinli = tek_df[tek_df['Durum'] == 'İZİNLİ']
+
+    def weekday_days(part):
+        dates = part[part['Tarih'].dt.dayofweek < 5]['Tarih'].dt.date
+        return dates[~dates.isin(holidays)].nunique()
+
+    islemler = aktif['İşlem'].astype(str).str.strip().str.upper()
+    bakim = (islemler == "BAKIM").sum()
+    ariza = islemler.isin(["ARIZA", "ARIZA+BAKIM"]).sum()
+    devreye = (islemler == "DEVREYE ALMA").sum()
+    return {
+        "Sahada": aktif['Tarih'].dt.date.nunique(),
+        "Izin": izinli['Tarih'].dt.date.nunique(),
+        "Sahada_HI": weekday_days(aktif),
+        "Izin_HI": weekday_days(izinli),
+        "Bakım": bakim, "Arıza": ariza, "Devreye Alma": devreye,
+        "Diğer": len(aktif) - (bakim + ariza + devreye),
+    }
+
+
+class TestTechnicianDays(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Tarih": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-04", "2025-02-03", "2025-02-03"]),
+            "Yil": [2025] * 5,
+            "Ay": [1, 1, 1, 2, 2],
+            "Teknisyen 1": ["ALİ", "ALİ", "VELİ", "ALİ", "ALİ"],
+            "Teknisyen 2": ["VELİ", "ALİ", "", "", "VELİ"],
+            "Durum": ["AKTİF", "AKTİF", "AKTİF", "İZİNLİ", "AKTİF"],
+            "Müşteri": ["A", "B", "C", "", "D"],
+            "Şehir": ["ADANA", "BURSA", "ADANA", "", "İZMİR"],
+            "İşlem": ["Bakım", "arıza", "DEVREYE ALMA", "", "Keşif"],
+        })
+        self.holidays = {date(2025, 1, 1)}
+
+    def test_long_format(self):
+        facts = build_technician_days(self.df, self.holidays)
+        # T2 boş veya T1 ile aynıysa satır açılmaz
+        self.assertEqual(list(zip(facts["Kayit"], facts["Rol"], facts["Teknisyen"])),
+                         [(0, 1, "ALİ"), (0, 2, "VELİ"), (1, 1, "ALİ"), (2, 1, "VELİ"),
+                          (3, 1, "ALİ"), (4, 1, "ALİ"), (4, 2, "VELİ")])
+        self.assertEqual(facts["Islem_Kategori"].tolist()[:4], ["Bakım", "Bakım", "Arıza", "Devreye Alma"])
+        self.assertEqual(facts["Islem_Kategori"].iloc[-1], "Diğer")
+        self.assertEqual(facts["Tatil"].tolist()[:3], [True, True, False])
+        self.assertEqual(facts["Is_Gunu"].tolist(), [False, False, True, False, True, True, True])
+        self.assertTrue(build_technician_days(pd.DataFrame()).empty)
+
+    def test_summary_and_filters(self):
+        facts = build_technician_days(self.df, self.holidays)
+        ozet = summarize_technicians(facts, ["ALİ", "VELİ", "YOK"])
+        self.assertEqual(ozet.loc["ALİ"].tolist(), [3, 1, 2, 1, 1, 1, 0, 1])
+        self.assertEqual(ozet.loc["VELİ", "Sahada_HI"], 1)  # 01.01 tatil, 04.01 cumartesi
+        self.assertEqual(ozet.loc["YOK"].sum(), 0)
+
+        ocak = filter_period(facts, 2025, 1)
+        self.assertEqual(set(ocak["Ay"]), {1})
+        self.assertEqual(len(filter_period(facts, 2025)), len(facts))
+
+        ends = pd.Series({"ALİ": pd.Timestamp("2025-01-31")})
+        clipped = clip_to_employment(facts, pd.Series(dtype="datetime64[us]"), ends)
+        self.assertEqual(clipped[clipped["Teknisyen"] == "ALİ"]["Ay"].unique().tolist(), [1])
+        self.assertEqual((clipped["Teknisyen"] == "VELİ").sum(), 3)
+
+        self.assertEqual(monthly_technician_days(facts).to_dict(), {1: 4, 2: 2})
+
+    def test_mixed_case_islem_parity(self):
+        """Noktasız / ASCII yazılmış işlemler eski .str.upper() hesabıyla aynı kategoriye düşer."""
+        df = self.df.copy()
+        df["Durum"] = "AKTİF"
+        df["İşlem"] = ["Bakim", "Ariza", "ariza+bakim", "bakım", " BAKIM "]
+        facts = build_technician_days(df, self.holidays)
+        self.assertEqual(facts["Islem_Kategori"].tolist(),
+                         ["Bakım", "Bakım", "Arıza", "Arıza", "Bakım", "Bakım", "Bakım"])
+        ozet = summarize_technicians(facts, ["ALİ", "VELİ"])
+        for tek in ("ALİ", "VELİ"):
+            self.assertEqual(ozet.loc[tek].to_dict(), legacy_summary(df, tek, self.holidays), tek)
+
+    def test_synthetic_parity(self):
+        """Üretim benzeri veride eski teknisyen başına maske hesabıyla aynı sonuç."""
+        grids = generate_workbooks(seed=11, scale=0.3, years=(2025,))[SAHA_FILE_NAME]
+        df = process_saha([pd.DataFrame(g[2:], columns=g[1]) for g in grids.values()])
+        holidays = {date(2025, 1, 1), date(2025, 5, 1), date(2025, 10, 29)}
+
+        facts = build_technician_days(df, holidays)
+        technicians = sorted(set(df["Teknisyen 1"]) | (set(df["Teknisyen 2"]) - {""}))
+        ozet = summarize_technicians(facts, technicians)
+        for tek in technicians:
+            self.assertEqual(ozet.loc[tek].to_dict(), legacy_summary(df, tek, holidays), tek)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import gsheets
+from core.gsheets import batch_read_gsheets, resolve_sheet_title
+
+
+class FakeSpreadsheet:
+    """Sadece metadata + values_batch_get destekleyen sahte spreadsheet."""
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.calls = []
+
+    def fetch_sheet_metadata(self, params=None):
+        self.calls.append("metadata")
+        return {"sheets": [{"properties": {"title": t}} for t in self.tabs]}
+
+    def values_batch_get(self, ranges, params=None):
+        self.calls.append("batch_get")
+        return {"valueRanges": [{"values": self.tabs[r.strip("'")]} for r in ranges]}
+
+
+class TestBatchRead(unittest.TestCase):
+
+    def test_resolve_sheet_title(self):
+        titles = ["teklif", "Tatiller "]
+        self.assertEqual(resolve_sheet_title(titles, "teklif"), "teklif")
+        self.assertEqual(resolve_sheet_title(titles, "tatiller"), "Tatiller ")
+        self.assertIsNone(resolve_sheet_title(titles, "kurlar"))
+
+    def test_batch_read_applies_mapping(self):
+        """Tüm sekmeler 2 çağrıda okunmalı, eşleştirme safe_read_gsheet ile aynı olmalı."""
+        sh = FakeSpreadsheet({
+            "Teklif": [["Teklif No", "müşteri", "Fazla"], ["1", "ACME"], ["", "", ""]],
+            "kurlar": [["Yıl", "Ay", "EUR"], ["2025", "1"]],
+        })
+        tasks = {
+            "teklif": ("teklif", {"Teklif No": "Teklif_No", "Müşteri": "Musteri"}),
+            "kurlar": ("kurlar", None),
+            "personel": ("Personel", {"Ad Soyad": "Ad_Soyad"}),
+        }
+        results = batch_read_gsheets(sh, tasks)
+
+        self.assertEqual(sh.calls, ["metadata", "batch_get"])
+        # Eşleştirme + boş satır temizliği (kırpılmış satırlar tamamlanır)
+        self.assertEqual(list(results["teklif"].columns), ["Teklif_No", "Musteri"])
+        self.assertEqual(len(results["teklif"]), 1)
+        # Eşleştirmesiz sekme ham döner
+        self.assertEqual(results["kurlar"].iloc[0].tolist(), ["2025", "1", ""])
+        # Bulunamayan sekme boş döner
+        self.assertTrue(results["personel"].empty)
+
+
+class TestClientPool(unittest.TestCase):
+
+    def setUp(self):
+        gsheets.reset_gspread_client()
+
+    def tearDown(self):
+        gsheets.reset_gspread_client()
+
+    def test_client_authorized_once(self):
+        """İstemci süreç boyunca bir kez yetkilendirilmeli."""
+        with patch.object(gsheets, "_authorize_client", side_effect=lambda: object()) as auth:
+            first = gsheets.get_gspread_client()
+            self.assertIs(gsheets.get_gspread_client(), first)
+            self.assertEqual(auth.call_count, 1)
+
+    def test_spreadsheet_handle_cached(self):
+        """Aynı dosya tekrar açılırken Drive araması yapılmamalı."""
+        client = object()
+        with patch.object(gsheets, "_open_spreadsheet_remote", side_effect=lambda c, n: object()) as remote:
+            sh = gsheets.open_spreadsheet(client, "DHE_Data")
+            self.assertIs(gsheets.open_spreadsheet(client, "DHE_Data"), sh)
+            self.assertEqual(remote.call_count, 1)
+            # Farklı istemci -> yeni handle
+            gsheets.open_spreadsheet(object(), "DHE_Data")
+            self.assertEqual(remote.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.memo import ViewMemo, estimate_size, memoize_view
+from core.data_loader import get_data_refresher
+
+
+class TestViewMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def builder(self, value):
+        def build():
+            self.calls.append(value)
+            return value
+        return build
+
+    def test_hit_and_miss(self):
+        memo = ViewMemo(max_entries=8)
+        self.assertEqual(memo.get_or_compute(1, "servis", (2025, 3), self.builder("a")), "a")
+        self.assertEqual(memo.get_or_compute(1, "servis", (2025, 3), self.builder("b")), "a")
+        self.assertEqual(memo.get_or_compute(1, "servis", (2025, None), self.builder("c")), "c")
+        self.assertEqual(memo.get_or_compute(1, "saha", (2025, 3), self.builder("d")), "d")
+        self.assertEqual(self.calls, ["a", "c", "d"])
+        self.assertEqual((memo.stats()["hits"], memo.stats()["misses"]), (1, 3))
+
+    def test_lru_eviction(self):
+        memo = ViewMemo(max_entries=2)
+        memo.get_or_compute(1, "p", "x", self.builder("x"))
+        memo.get_or_compute(1, "p", "y", self.builder("y"))
+        memo.get_or_compute(1, "p", "x", self.builder("x2"))   # x en son kullanılan
+        memo.get_or_compute(1, "p", "z", self.builder("z"))    # y atılır
+        self.assertEqual(memo.get_or_compute(1, "p", "x", self.builder("x3")), "x")
+        self.assertEqual(memo.get_or_compute(1, "p", "y", self.builder("y2")), "y2")
+        self.assertEqual(memo.stats()["entries"], 2)
+
+    def test_memory_cap(self):
+        frame = pd.DataFrame({"a": np.zeros(1000)})
+        size = estimate_size(frame)
+        memo = ViewMemo(max_entries=100, max_bytes=int(size * 2.5))
+        for i in range(5):
+            memo.get_or_compute(1, "p", i, lambda: frame)
+        self.assertEqual(memo.stats()["entries"], 2)
+        self.assertLessEqual(memo.stats()["bytes"], memo.max_bytes)
+
+        # Tek başına sınırı aşan sonuç saklanmaz
+        big = pd.DataFrame({"a": np.zeros(10000)})
+        self.assertIs(memo.get_or_compute(1, "p", "big", lambda: big), big)
+        self.assertEqual(memo.stats()["entries"], 2)
+
+    def test_new_version_drops_old_entries(self):
+        memo = ViewMemo()
+        memo.get_or_compute(1, "p", "f", self.builder("v1"))
+        self.assertEqual(memo.get_or_compute(2, "p", "f", self.builder("v2")), "v2")
+        self.assertEqual(memo.stats()["entries"], 1)
+        # Eski sürümün sonucu yeni sürümün kayıtlarını bozmaz
+        memo.get_or_compute(1, "p", "g", self.builder("old"))
+        self.assertEqual(memo.stats()["version"], 2)
+        self.assertEqual(memo.stats()["entries"], 1)
+
+    def test_builder_error_is_not_cached(self):
+        memo = ViewMemo()
+
+        def failing():
+            raise ValueError("hata")
+
+        with self.assertRaises(ValueError):
+            memo.get_or_compute(1, "p", "f", failing)
+        self.assertEqual(memo.get_or_compute(1, "p", "f", self.builder("ok")), "ok")
+
+    def test_memoize_view_skips_foreign_packet(self):
+        # Yenileyicinin yayındaki paketi olmayan paket önbelleğe girmez
+        packet = {"teklif": pd.DataFrame()}
+        self.assertIsNone(get_data_refresher().version_of(packet))
+        memoize_view(packet, "p", "f", self.builder("a"))
+        memoize_view(packet, "p", "f", self.builder("b"))
+        memoize_view(None, "p", "f", self.builder("c"))
+        self.assertEqual(self.calls, ["a", "b", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import warnings
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.query import enable_copy_on_write, row_mask, select, query
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Yil": [2024, 2025, 2025, 2025, None],
+            "Ay": [1, 1, 2, 2, 3],
+            "Teknisyen 1": ["ALİ", "VELİ", "ALİ", None, "ALİ"],
+            "Tutar": [10.0, 20.0, 30.0, 40.0, 50.0],
+        })
+
+    def test_row_mask(self):
+        self.assertEqual(row_mask(self.df, {"Yil": 2025, "Ay": 2}).tolist(), [False, False, True, True, False])
+        self.assertEqual(row_mask(self.df, {"Teknisyen 1": ["ALİ", "VELİ"]}).tolist(), [True, True, True, False, True])
+        # "Tümü" / None değerleri ve olmayan sütunlar filtre uygulamaz
+        self.assertTrue(row_mask(self.df, {"Yil": None, "Teknisyen 1": "Tümü", "Yok": 1}).all())
+        self.assertEqual(len(row_mask(self.df.iloc[0:0], {"Yil": 2025})), 0)
+
+    def test_select_without_copy(self):
+        # Filtresiz sorgu veriyi paylaşan sığ görünüm döner
+        for result in (select(self.df), query(self.df, {"Ay": "TÜMÜ"})):
+            self.assertIsNot(result, self.df)
+            self.assertTrue(np.shares_memory(result["Tutar"].to_numpy(), self.df["Tutar"].to_numpy()))
+        cols = select(self.df, np.ones(len(self.df), dtype=bool), columns=["Tutar", "Yok"])
+        self.assertEqual(cols.columns.tolist(), ["Tutar"])
+
+    def test_writes_do_not_reach_source(self):
+        enable_copy_on_write()
+        result = query(self.df, {"Yil": 2025}, columns=["Ay", "Tutar"])
+        self.assertEqual(result.index.tolist(), [1, 2, 3])
+
+        full = query(self.df, {"Yil": None})
+        full.loc[0, "Tutar"] = -1.0
+        result = result.assign(Tutar=result["Tutar"] * 2)
+        self.assertEqual(self.df["Tutar"].tolist(), [10.0, 20.0, 30.0, 40.0, 50.0])
+
+    def test_enable_copy_on_write_is_quiet(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            enable_copy_on_write()
+
+
+if __name__ == '__main__':
+    unittest.main()
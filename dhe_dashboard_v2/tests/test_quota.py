@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.quota import QuotaLimiter, QuotaExceededError, TokenBucket, is_retryable
+
+
+class FakeAPIError(Exception):
+    """gspread.exceptions.APIError gibi HTTP kodu taşıyan hata."""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class TestQuota(unittest.TestCase):
+
+    def test_is_retryable(self):
+        self.assertTrue(is_retryable(FakeAPIError(429)))
+        self.assertTrue(is_retryable(FakeAPIError(503)))
+        self.assertFalse(is_retryable(FakeAPIError(404)))
+        self.assertTrue(is_retryable(ConnectionError("reset")))
+        self.assertFalse(is_retryable(ValueError("bad")))
+
+    def test_bucket_limits_rate(self):
+        """Burst bittikten sonra çağrılar rate'e göre beklemeli."""
+        bucket = TokenBucket(rate=50, capacity=2)
+        self.assertLess(bucket.acquire(), 0.005)
+        self.assertLess(bucket.acquire(), 0.005)
+        self.assertGreater(bucket.acquire(), 0.01)
+
+    def test_bucket_timeout_rejects(self):
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+        with self.assertRaises(QuotaExceededError):
+            bucket.acquire(timeout=0.05)
+
+    def test_backoff_retries_on_429(self):
+        """429 sonrası yeniden denenmeli ve metrikler güncellenmeli."""
+        limiter = QuotaLimiter(requests_per_minute=6000, burst=5, backoff_base=0.01, backoff_max=0.02)
+        responses = [FakeAPIError(429), FakeAPIError(503), "ok"]
+
+        def api_call():
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.assertEqual(limiter.call(api_call), "ok")
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["calls"], 3)
+        self.assertEqual(metrics["retries"], 2)
+        self.assertEqual(metrics["throttled"], 2)
+
+    def test_non_retryable_fails_fast(self):
+        limiter = QuotaLimiter(requests_per_minute=6000, burst=5, backoff_base=0.01)
+        calls = []
+
+        def api_call():
+            calls.append(1)
+            raise FakeAPIError(404)
+
+        with self.assertRaises(FakeAPIError):
+            limiter.call(api_call)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(limiter.metrics()["failed"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
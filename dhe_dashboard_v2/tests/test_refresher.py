@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.refresher import DataRefresher
+
+
+class TestDataRefresher(unittest.TestCase):
+
+    def test_bootstrap_builds_once(self):
+        """Snapshot yoksa ilk paket senkron oluşturulmalı, sonraki okumalar build etmemeli."""
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return {"teklif": len(calls)}
+
+        refresher = DataRefresher(builder, background=False)
+        self.assertEqual(refresher.get_packet(), {"teklif": 1})
+        self.assertEqual(refresher.get_packet(), {"teklif": 1})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(refresher.status()["source"], "live")
+
+        # Sürüm kimlikle eşleşir: eşit içerikli başka paket yayındaki paket sayılmaz
+        self.assertEqual(refresher.version_of(refresher.get_packet()), refresher.version)
+        self.assertIsNone(refresher.version_of({"teklif": 1}))
+
+    def test_failed_refresh_keeps_last_good_packet(self):
+        """Yenileme hata verirse eski paket korunmalı."""
+        state = {"fail": False}
+
+        def builder():
+            if state["fail"]:
+                raise RuntimeError("quota")
+            return {"teklif": "ok"}
+
+        refresher = DataRefresher(builder, background=False)
+        refresher.get_packet()
+        version = refresher.version
+
+        state["fail"] = True
+        self.assertFalse(refresher.refresh_now())
+        self.assertEqual(refresher.get_packet(), {"teklif": "ok"})
+        self.assertEqual(refresher.version, version)
+        self.assertEqual(refresher.status()["last_error"], "quota")
+
+    def test_snapshot_then_background_revalidation(self):
+        """Snapshot anında dönmeli, arka plan thread'i canlı paketi yayınlamalı."""
+        refresher = DataRefresher(
+            builder=lambda: {"teklif": "live"},
+            initial_loader=lambda: {"teklif": "snapshot"},
+            interval=60, poll_interval=0.05,
+        )
+        try:
+            self.assertEqual(refresher.get_packet(), {"teklif": "snapshot"})
+            deadline = time.time() + 2
+            while refresher.get_packet()["teklif"] != "live" and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(refresher.get_packet(), {"teklif": "live"})
+            self.assertEqual(refresher.status()["source"], "live")
+        finally:
+            refresher.stop(timeout=1)
+
+    def test_source_change_triggers_refresh(self):
+        """Kaynak sürümü değişince periyot beklenmeden yenilenmeli."""
+        calls = []
+        source = {"version": "v1"}
+
+        def builder():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        refresher = DataRefresher(
+            builder, change_probe=lambda: source["version"],
+            interval=60, poll_interval=0.02,
+        )
+        try:
+            refresher.get_packet()
+            time.sleep(0.1)  # İlk sürüm okunsun
+            source["version"] = "v2"
+            deadline = time.time() + 2
+            while len(calls) < 2 and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(refresher.get_packet(), {"n": 2})
+        finally:
+            refresher.stop(timeout=1)
+
+    def test_manual_refresh_waits_for_new_packet(self):
+        """Manuel yenileme, thread'in istekten sonra başlayan yenilemesini beklemeli."""
+        state = {"n": 0, "fail": False}
+
+        def builder():
+            time.sleep(0.05)
+            if state["fail"]:
+                raise RuntimeError("quota")
+            state["n"] += 1
+            return {"n": state["n"]}
+
+        refresher = DataRefresher(builder, interval=60, poll_interval=60)
+        try:
+            refresher.get_packet()
+            version = refresher.version
+            self.assertTrue(refresher.request_refresh(timeout=2))
+            self.assertGreater(refresher.version, version)
+            self.assertEqual(refresher.get_packet(), {"n": state["n"]})
+
+            # Beklemesiz istek hemen döner; hata durumunda False
+            self.assertFalse(refresher.request_refresh())
+            state["fail"] = True
+            self.assertFalse(refresher.request_refresh(timeout=2))
+            self.assertEqual(refresher.status()["last_error"], "quota")
+        finally:
+            refresher.stop(timeout=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
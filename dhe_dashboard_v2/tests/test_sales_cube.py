@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.sales_cube import (
+    build_sales_cube, cube_years, period_totals, personnel_totals, monthly_totals, period_rows
+)
+from core.transforms import add_revision_columns, add_period_revision_columns, filter_latest_revisions
+
+
+def finance_frame(id_col, seed, n=600):
+    """Revizyonları aylara / yıllara yayılmış sentetik teklif veya sipariş tablosu."""
+    rng = np.random.default_rng(seed)
+    roots = rng.integers(1000, 1200, size=n).astype(str)
+    revs = rng.integers(0, 4, size=n)
+    numbers = [r if v == 0 else f"{r}{rng.choice(['R', '-R', ' REV'])}{v}" for r, v in zip(roots, revs)]
+    tarih = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, size=n), unit="D")
+    df = pd.DataFrame({
+        id_col: numbers,
+        "Tarih": tarih,
+        "Yil": tarih.year,
+        "Ay": tarih.month,
+        "Personel_Adi": rng.choice(["Ali", "Veli", "Ayşe", None], size=n),
+        "Musteri": rng.choice([f"M{i}" for i in range(25)], size=n),
+        "Para_Birimi": rng.choice(["EUR", "TL"], size=n),
+        "Tutar_EUR": rng.gamma(2.0, 1000.0, size=n).round(2),
+    })
+    df["Kar_EUR"] = (df["Tutar_EUR"] * 0.2).round(2)
+    df = add_revision_columns(df, id_col)
+    return add_period_revision_columns(df, id_col)
+
+
+class TestSalesCube(unittest.TestCase):
+
+    def setUp(self):
+        self.siparis = finance_frame("Siparis_No", seed=1)
+        self.teklif = finance_frame("Teklif_No", seed=2)
+        self.cube = build_sales_cube(self.siparis, self.teklif)
+
+    def legacy_slice(self, df, id_col, year, month):
+        """Eski görünüm: yıl/ay dilimi + dilim içinde filter_latest_revisions."""
+        sl = df[df["Yil"] == year]
+        if month is not None:
+            sl = sl[sl["Ay"] == month]
+        return filter_latest_revisions(sl, id_col)
+
+    def test_period_totals_match_legacy(self):
+        for year in (2024, 2025, 2026):
+            for month in (None, 1, 6, 12):
+                for source, df, id_col in (("siparis", self.siparis, "Siparis_No"), ("all_quotes", self.teklif, "Teklif_No")):
+                    expected = self.legacy_slice(df, id_col, year, month)
+                    totals = period_totals(self.cube, source, year, month)
+                    self.assertEqual(totals["Adet"], len(expected), (source, year, month))
+                    self.assertAlmostEqual(totals["Tutar_EUR"], expected["Tutar_EUR"].sum(), places=6)
+                    self.assertAlmostEqual(totals["Kar_EUR"], expected["Kar_EUR"].sum(), places=6)
+                    self.assertEqual(totals["Musteri"], expected["Musteri"].nunique())
+
+                    perf = personnel_totals(self.cube, source, year, month)
+                    legacy = expected.groupby("Personel_Adi").agg(
+                        Tutar_EUR=("Tutar_EUR", "sum"), Adet=(id_col, "count"), Musteri=("Musteri", "nunique"))
+                    self.assertEqual(perf.index.tolist(), legacy.index.tolist())
+                    np.testing.assert_allclose(perf["Tutar_EUR"], legacy["Tutar_EUR"])
+                    self.assertEqual(perf["Adet"].tolist(), legacy["Adet"].tolist())
+                    self.assertEqual(perf["Musteri"].tolist(), legacy["Musteri"].tolist())
+
+    def test_monthly_totals_and_years(self):
+        net = self.siparis[self.siparis["Is_Latest_Rev"]]
+        expected = net.groupby(["Yil", "Ay"])["Kar_EUR"].sum().unstack(fill_value=0)
+        np.testing.assert_allclose(monthly_totals(self.cube, "siparis", "Kar_EUR").to_numpy(), expected.to_numpy())
+        self.assertEqual(cube_years(self.cube), [2026, 2025, 2024])
+        self.assertEqual(period_totals(self.cube, "siparis", 2030)["Adet"], 0)
+
+    def test_period_rows(self):
+        legacy = self.legacy_slice(self.teklif, "Teklif_No", 2025, 3)
+        rows = period_rows(self.teklif, 2025, 3, "Teklif_No")
+        self.assertEqual(sorted(rows.index), sorted(legacy.index))
+
+        # Bayrak sütunları olmayan (eski snapshot) tabloda aynı sonuç
+        bare = self.teklif.drop(columns=["Is_Latest_Rev_Ay", "Is_Latest_Rev_Yil"])
+        self.assertEqual(sorted(period_rows(bare, 2025, 3, "Teklif_No").index), sorted(legacy.index))
+        cube = build_sales_cube(self.siparis.drop(columns=["Is_Latest_Rev_Ay", "Is_Latest_Rev_Yil"]), bare)
+        self.assertEqual(period_totals(cube, "all_quotes", 2025)["Adet"], period_totals(self.cube, "all_quotes", 2025)["Adet"])
+
+    def test_empty(self):
+        cube = build_sales_cube(pd.DataFrame(), pd.DataFrame())
+        self.assertEqual(cube_years(cube), [])
+        self.assertEqual(period_totals(cube, "siparis", 2025, 1)["Adet"], 0)
+        self.assertTrue(personnel_totals(cube, "siparis", 2025).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
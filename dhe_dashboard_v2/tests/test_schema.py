@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from core.schema import (to_categorical, categorize_packet, packet_memory_usage, enforce_schema,
+                         apply_packet_schema, STRING_DTYPE)
+
+
+class TestCategoricalSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Para_Birimi": ["EUR", "USD", "EUR", None] * 50,
+            "Teklif_No": [str(i) for i in range(200)],
+            "Tutar": range(200),
+        })
+
+    def test_low_cardinality_columns_only(self):
+        result = to_categorical(self.df, ["Para_Birimi", "Teklif_No", "Tutar", "Yok"])
+        self.assertIsInstance(result["Para_Birimi"].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(result["Teklif_No"].dtype, pd.CategoricalDtype)  # Benzersiz -> metin kalır
+        self.assertEqual(result["Tutar"].dtype, self.df["Tutar"].dtype)
+
+        # Değerler ve karşılaştırmalar aynı, girdi değişmez
+        self.assertEqual(result["Para_Birimi"].tolist()[:3], ["EUR", "USD", "EUR"])
+        self.assertTrue(pd.isna(result["Para_Birimi"].iloc[3]))
+        self.assertTrue(((result["Para_Birimi"] == "EUR") == (self.df["Para_Birimi"] == "EUR")).all())
+        self.assertNotIsInstance(self.df["Para_Birimi"].dtype, pd.CategoricalDtype)
+
+    def test_packet(self):
+        packet = {"teklif": self.df, "holidays": {"2025-01-01"}, "saha": pd.DataFrame()}
+        result = categorize_packet(packet)
+        self.assertIsInstance(result["teklif"]["Para_Birimi"].dtype, pd.CategoricalDtype)
+        self.assertIs(result["holidays"], packet["holidays"])
+        self.assertTrue(result["saha"].empty)
+        self.assertIs(categorize_packet(result)["teklif"], result["teklif"])  # Tekrar çağrı -> değişiklik yok
+
+        usage = packet_memory_usage(result)
+        self.assertEqual(set(usage), {"teklif", "saha"})
+        self.assertLess(usage["teklif"], packet_memory_usage(packet)["teklif"])
+
+
+class TestSheetSchema(unittest.TestCase):
+
+    def test_enforce_sheet_schema(self):
+        raw = pd.DataFrame({
+            "Teklif_No": [100, "100R1", "200"],
+            "Tarih": ["05.01.2025", "2025-01-06", ""],
+            "Tutar_Ham": ["1.000,50", "1,200.00", ""],
+            "Para_Birimi": ["EUR", None, "USD"],
+            "Ekstra": ["a", "b", "c"],
+        })
+        df = enforce_schema(raw, "teklif")
+        self.assertEqual(df["Teklif_No"].tolist(), ["100", "100R1", "200"])
+        self.assertEqual(str(df["Tarih"].dtype), "datetime64[us]")
+        self.assertEqual(df["Tarih"].iloc[0], pd.Timestamp("2025-01-05"))
+        self.assertTrue(df["Tarih"].iloc[1:].isna().all())  # Katı GG.AA.YYYY
+        self.assertEqual(df["Tutar_Ham"].tolist(), [1000.5, 1200.0, 0.0])
+        self.assertTrue(pd.isna(df["Para_Birimi"].iloc[1]))
+        self.assertIs(df["Ekstra"].dtype, raw["Ekstra"].dtype)
+        self.assertEqual(raw["Tarih"].iloc[0], "05.01.2025")  # Girdi değişmez
+
+        # İkinci çağrı: her şey tipli -> aynı nesne
+        self.assertIs(enforce_schema(df, "teklif"), df)
+        self.assertIs(enforce_schema(raw, "kurlar"), raw)  # Şeması olmayan sekme
+
+    def test_missing_text_stays_missing(self):
+        # Boş Sorumlu 'None' / 'nan' metnine dönüşmemeli (pandas 2.x astype("str"))
+        df = enforce_schema(pd.DataFrame({
+            "Musteri_No": [101, "102", None], "Sorumlu": ["ALİ", None, float("nan")],
+        }), "musteri")
+        self.assertEqual(df["Musteri_No"].tolist()[:2], ["101", "102"])
+        self.assertTrue(df["Musteri_No"].iloc[2:].isna().all())
+        self.assertEqual(df["Sorumlu"].isna().tolist(), [False, True, True])
+        self.assertIs(enforce_schema(df, "musteri"), df)
+
+    def test_string_columns_are_arrow_backed(self):
+        df = enforce_schema(pd.DataFrame({"Para_Birimi": ["EUR", None]}), "teklif")
+        self.assertEqual(df["Para_Birimi"].dtype, STRING_DTYPE)
+        self.assertIsInstance(df["Para_Birimi"].dtype, pd.StringDtype)
+        self.assertTrue(df["Para_Birimi"].dtype.storage.startswith("pyarrow"))
+        self.assertTrue(pd.isna(df["Para_Birimi"].iloc[1]))
+
+    def test_personel_and_sehirler(self):
+        personel = enforce_schema(pd.DataFrame({
+            "Ad_Soyad": ["ALİ"], "Ise_Giris": ["01.03.2020"], "Isten_Cikis": [""],
+        }), "personel")
+        self.assertEqual(personel["Ise_Giris"].iloc[0], pd.Timestamp("2020-03-01"))  # Gün önce
+        self.assertTrue(pd.isna(personel["Isten_Cikis"].iloc[0]))
+
+        sehirler = enforce_schema(pd.DataFrame({"Sehir_Ad": ["ADANA", "X"], "Bolge_Id": ["3", ""]}), "sehirler")
+        self.assertEqual(sehirler["Bolge_Id"].tolist(), [3, 0])
+
+    def test_packet_contract(self):
+        packet = {
+            "saha_personel": pd.DataFrame({"Ad_Soyad": ["ALİ"], "Ise_Giris": ["01.03.2020"]}),
+            "sehirler": pd.DataFrame({"Sehir_Ad": ["ADANA"], "Bolge_Id": ["3"]}),
+            "holidays": set(),
+        }
+        result = apply_packet_schema(packet)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result["saha_personel"]["Ise_Giris"]))
+        self.assertEqual(result["sehirler"]["Bolge_Id"].dtype, "int64")
+        self.assertIsNone(apply_packet_schema(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
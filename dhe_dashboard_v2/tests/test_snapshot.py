@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date
+from unittest.mock import patch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from core import snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch.object(snapshot, "get_snapshot_dir", return_value=self.tmp.name)
+        self.dir_patch.start()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Kaydedilen paket aynı içerikle geri okunmalı."""
+        packet = {
+            "teklif": pd.DataFrame({
+                "Musteri": ["A", "B"],
+                "Tutar": [100.0, 250.5],
+                "Tarih": pd.to_datetime(["2025-01-05", "2025-02-10"]),
+            }),
+            "sehirler": pd.DataFrame(),
+            "holidays": {date(2025, 1, 1), date(2025, 4, 23)},
+        }
+        self.assertIsNotNone(snapshot.save_snapshot(packet))
+
+        loaded = snapshot.load_latest_snapshot()
+        pd.testing.assert_frame_equal(loaded["teklif"], packet["teklif"], check_dtype=False)
+        self.assertEqual(loaded["holidays"], packet["holidays"])
+        self.assertTrue(loaded["sehirler"].empty)
+        self.assertEqual(snapshot.get_latest_manifest()["tables"]["teklif"]["rows"], 2)
+
+    def test_snapshot_is_per_source(self):
+        """Sentetik kaynakla yazılan snapshot canlı kaynakla açılmamalı."""
+        from core.data_sources import GSpreadSource, SyntheticSource, set_data_source
+        self.dir_patch.stop()
+        packet = {"teklif": pd.DataFrame({"Musteri": ["SENTETİK"]})}
+        try:
+            with patch.dict(snapshot.SNAPSHOT_CONFIG, {"DIR": self.tmp.name}):
+                set_data_source(SyntheticSource(seed=1))
+                self.assertIsNotNone(snapshot.save_snapshot(packet))
+                self.assertEqual(snapshot.get_latest_manifest()["source"], "synthetic_1_1.0")
+
+                set_data_source(GSpreadSource())
+                self.assertIsNone(snapshot.load_latest_snapshot())
+
+                set_data_source(SyntheticSource(seed=1))
+                self.assertEqual(snapshot.load_latest_snapshot()["teklif"]["Musteri"].tolist(), ["SENTETİK"])
+        finally:
+            set_data_source(None)
+            self.dir_patch.start()
+
+    def test_missing_snapshot(self):
+        """Snapshot yoksa None dönmeli."""
+        self.assertIsNone(snapshot.load_latest_snapshot())
+
+    def test_prune_keeps_last(self):
+        """KEEP_LAST'ten eski snapshot'lar silinmeli."""
+        packet = {"urun": pd.DataFrame({"Musteri": ["A"]})}
+        with patch.dict(snapshot.SNAPSHOT_CONFIG, {"KEEP_LAST": 2}):
+            for _ in range(4):
+                snapshot.save_snapshot(packet)
+        dirs = [d for d in os.listdir(self.tmp.name) if os.path.isdir(os.path.join(self.tmp.name, d))]
+        self.assertEqual(len(dirs), 2)
+        self.assertIsNotNone(snapshot.load_latest_snapshot())
+
+    def test_frozen_tab_keeps_duplicate_headers(self):
+        """Arşivlenen ham sekme tekrar eden / boş başlıklarıyla geri okunmalı."""
+        df = pd.DataFrame([["01.01.2024", "ALİ", "", "x"]], columns=["Tarih", "Teknisyen 1", "", ""])
+        path = os.path.join(self.tmp.name, "archive", "saha_2024.arrow")
+        self.assertTrue(snapshot.save_frozen_tab(path, df))
+
+        loaded = snapshot.load_frozen_tab(path)
+        self.assertEqual(list(loaded.columns), ["Tarih", "Teknisyen 1", "", ""])
+        self.assertEqual(loaded.iloc[0].tolist(), ["01.01.2024", "ALİ", "", "x"])
+        self.assertIsNone(snapshot.load_frozen_tab(os.path.join(self.tmp.name, "yok.arrow")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from core.sync import SheetSyncState, frame_checksum
+
+
+class TestSheetSync(unittest.TestCase):
+
+    def test_frame_checksum(self):
+        """Aynı içerik aynı checksum'ı, farklı içerik farklı checksum'ı üretmeli."""
+        df1 = pd.DataFrame({"A": ["1", "2"], "B": ["x", "y"]})
+        df2 = pd.DataFrame({"A": ["1", "2"], "B": ["x", "y"]})
+        df3 = pd.DataFrame({"A": ["1", "2"], "B": ["x", "z"]})
+        self.assertEqual(frame_checksum(df1), frame_checksum(df2))
+        self.assertNotEqual(frame_checksum(df1), frame_checksum(df3))
+        self.assertEqual(frame_checksum(pd.DataFrame()), "empty")
+
+    def test_update_tab_change_detection(self):
+        """Sekme içeriği değişmedikçe değişiklik raporlanmamalı."""
+        sync = SheetSyncState()
+        df = pd.DataFrame({"A": ["1"]})
+        self.assertTrue(sync.update_tab("DHE_Data", "teklif", df))
+        self.assertFalse(sync.update_tab("DHE_Data", "teklif", df.copy()))
+        self.assertTrue(sync.update_tab("DHE_Data", "teklif", pd.DataFrame({"A": ["2"]})))
+
+    def test_file_version(self):
+        """Dosya sürümü aynıysa ve sekmeler elimizdeyse çekme atlanabilir."""
+        sync = SheetSyncState()
+        self.assertFalse(sync.is_file_unchanged("DHE_Data", "v1"))
+        sync.update_tab("DHE_Data", "teklif", pd.DataFrame({"A": ["1"]}))
+        sync.mark_file_synced("DHE_Data", "v1")
+        self.assertTrue(sync.is_file_unchanged("DHE_Data", "v1"))
+        self.assertFalse(sync.is_file_unchanged("DHE_Data", "v2"))
+        # Sürüm okunamadıysa her zaman çekilmeli
+        self.assertFalse(sync.is_file_unchanged("DHE_Data", None))
+
+    def test_run_stage_reuses_result(self):
+        """Girdi sekmeleri değişmediyse aşama tekrar çalışmamalı."""
+        sync = SheetSyncState()
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return len(calls)
+
+        sync.update_tab("DHE_Data", "kurlar", pd.DataFrame({"A": ["1"]}))
+        self.assertEqual(sync.run_stage("kurlar", [("DHE_Data", "kurlar")], builder), 1)
+        self.assertEqual(sync.run_stage("kurlar", [("DHE_Data", "kurlar")], builder), 1)
+
+        sync.update_tab("DHE_Data", "kurlar", pd.DataFrame({"A": ["2"]}))
+        self.assertEqual(sync.run_stage("kurlar", [("DHE_Data", "kurlar")], builder), 2)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
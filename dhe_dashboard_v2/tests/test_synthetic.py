@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from config.constants import EXCEL_CONFIG
+from core.synthetic import generate_workbooks, DHE_FILE_NAME, SAHA_FILE_NAME, SAHA_HEADERS
+from core.transforms import filter_latest_revisions
+from core.utils import clean_money_series
+
+
+class TestSyntheticGenerator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wb = generate_workbooks(seed=3, scale=0.2, years=(2025,))
+        cls.dhe = cls.wb[DHE_FILE_NAME]
+
+    def test_seeded(self):
+        again = generate_workbooks(seed=3, scale=0.2, years=(2025,))
+        self.assertEqual(self.wb, again)
+        other = generate_workbooks(seed=4, scale=0.2, years=(2025,))
+        self.assertNotEqual(self.dhe["teklif"], other[DHE_FILE_NAME]["teklif"])
+
+    def test_headers_match_column_mappings(self):
+        sheets = EXCEL_CONFIG["SHEETS"]
+        for key in ("TEKLIF", "SIPARIS", "MUSTERI", "URUN", "PERSONEL", "TATILLER", "SEHIRLER"):
+            self.assertEqual(self.dhe[sheets[key]][0], list(EXCEL_CONFIG["COLUMN_MAPPINGS"][key].keys()))
+
+    def test_saha_layout(self):
+        grid = self.wb[SAHA_FILE_NAME]["2025"]
+        self.assertEqual(grid[1], SAHA_HEADERS)  # Başlık 2. satırda
+        customers = {row[3] for row in grid[2:]}
+        self.assertIn("İZİNLİ", customers)
+        self.assertIn("DHE ENDÜSTRİYEL", customers)
+
+    def test_quotes_have_revisions_and_mixed_money(self):
+        df = pd.DataFrame(self.dhe["teklif"][1:], columns=["Teklif_No", "Musteri", "Personel", "Tarih",
+                                                           "Tutar", "Maliyet", "Isaret", "Para_Birimi"])
+        self.assertTrue(df["Teklif_No"].str.contains("R").any())
+        latest = filter_latest_revisions(df, "Teklif_No")
+        self.assertLess(len(latest), len(df))
+
+        # Hem TR hem US formatı bulunmalı ve hepsi pozitif sayıya çevrilmeli
+        self.assertTrue(df["Tutar"].str.match(r"^\d{1,3}(\.\d{3})+,\d{2}$").any())
+        self.assertTrue(df["Tutar"].str.match(r"^\d{1,3}(,\d{3})+\.\d{2}$").any())
+        self.assertTrue((clean_money_series(df["Tutar"]) > 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.transforms import (
+    determine_saha_status, determine_saha_status_series, filter_latest_revisions, parse_revisions,
+    add_revision_columns, latest_revision_mask
+)
+from core.synthetic import generate_workbooks, SAHA_FILE_NAME
+from core.data_loader import clean_saha
+from benchmarks.bench_revisions import legacy_filter_latest_revisions, quotes_frame
+
+
+class TestSahaStatusSeries(unittest.TestCase):
+
+    def assert_parity(self, df):
+        expected = df.apply(determine_saha_status, axis=1) if not df.empty else pd.Series(dtype=object)
+        result = determine_saha_status_series(df)
+        self.assertEqual(result.tolist(), expected.tolist())
+        self.assertTrue(result.index.equals(df.index))
+
+    def test_edge_cases(self):
+        """Satır bazlı fonksiyonun tüm dalları ve kirli değerler."""
+        df = pd.DataFrame({
+            'Tarih': pd.to_datetime(['2025-01-04', '2025-01-06', None, '2025-01-05', '2025-01-06',
+                                     '2025-01-06', '2025-01-06', '2025-01-06', '2025-01-06', '2025-01-06']),
+            'Teknisyen 1': ['ALİ', 'ALİ', 'ALİ', '', 'VELİ', 'nan', None, ' ', 'ALİ', 'ALİ'],
+            'Teknisyen 2': ['', '', '', '', '', 'AHMET', '', '', np.nan, ''],
+            'Müşteri': ['dhe endüstriyel', 'DHE ENDÜSTRİYEL LTD', 'DHE ENDÜSTRİYEL', 'izinli', 'İZİNLİ',
+                        'ABC', 'ABC', 'ABC', '', ' NaN '],
+            'Servis Ürünü': ['', '', '', '', '', '', '', '', 'Filtre', ''],
+            'Sorumlu': ['', '', '', '', '', '', '', '', '', ''],
+        }, index=range(10, 20))
+        self.assert_parity(df)
+        self.assertEqual(determine_saha_status_series(df).tolist()[:5], ['AKTİF', 'ATÖLYE', 'ATÖLYE', 'İZİNLİ', 'İZİNLİ'])
+
+    def test_string_dates_and_missing_columns(self):
+        """Tarih metin olarak gelirse (load_saha_data öncesi) ve bazı sütunlar yoksa."""
+        df = pd.DataFrame({
+            'Tarih': ['04.01.2025', '06.01.2025', '31.02.2025', '', None],
+            'Teknisyen 1': ['ALİ'] * 5,
+            'Müşteri': ['DHE ENDÜSTRİYEL'] * 4 + ['XYZ'],
+        })
+        self.assert_parity(df)
+        self.assert_parity(df.drop(columns=['Tarih']))
+        self.assert_parity(df.iloc[0:0])
+
+    def test_synthetic_parity(self):
+        """Üretim benzeri sentetik veride satır bazlı sonuçla birebir aynı olmalı."""
+        grids = generate_workbooks(seed=5, scale=0.3, years=(2025,))[SAHA_FILE_NAME]
+        frames = [pd.DataFrame(g[2:], columns=g[1]) for g in grids.values()]
+        df = clean_saha(frames)
+        self.assertGreater(len(df), 500)
+        self.assert_parity(df)
+        self.assertEqual(set(determine_saha_status_series(df)), {'AKTİF', 'ATÖLYE', 'İZİNLİ'})
+
+
+class TestLatestRevisions(unittest.TestCase):
+
+    def test_parse_revisions(self):
+        values = pd.Series(["100", "100R1", "100-R2", " 100 r3", "100REV4", "R1", "-R1", "100R",
+                            "ARR1", "100R1A2", "1R2R3", "", None, "X REV"], index=range(5, 19))
+        root, rev = parse_revisions(values)
+        self.assertEqual(root.tolist(), ["100", "100", "100", "100", "100", "R1", "-R1", "100R",
+                                         "AR", "100R1A2", "1R2", "", "", "X REV"])
+        self.assertEqual(rev.tolist(), [0, 1, 2, 3, 4, 0, 0, 0, 1, 0, 3, -1, -1, 0])
+        self.assertTrue(root.index.equals(values.index))
+
+    def test_keeps_latest_per_root(self):
+        df = pd.DataFrame({"Teklif_No": ["200", "100", "100R2", "100-R1", "200 R1", "300"],
+                           "Tutar": [1, 2, 3, 4, 5, 6]}, index=[9, 8, 7, 6, 5, 4])
+        result = filter_latest_revisions(df, "Teklif_No")
+        self.assertEqual(result["Teklif_No"].tolist(), ["100R2", "200 R1", "300"])
+        self.assertEqual(result.index.tolist(), [7, 5, 4])
+        self.assertIs(filter_latest_revisions(df, "Yok"), df)
+
+    def test_parity_with_legacy(self):
+        """Üretim benzeri revizyonlu veride önceki uygulama ile birebir aynı sonuç."""
+        df = quotes_frame(0.3, seed=11)
+        self.assertGreater(len(df), 2000)
+        self.assertTrue(filter_latest_revisions(df).equals(legacy_filter_latest_revisions(df)))
+
+    def test_precomputed_revision_columns(self):
+        """Yüklemede eklenen sütunlar: tam tabloda maske = filtre, dilimlerde ayrıştırmasız aynı sonuç."""
+        raw = quotes_frame(0.3, seed=12)
+        df = add_revision_columns(raw.copy(), "Teklif_No")
+        self.assertEqual(df["Is_Latest_Rev"].sum(), df["Kok_No"].nunique())
+
+        expected = filter_latest_revisions(raw)
+        masked = df[latest_revision_mask(df, "Teklif_No")]
+        self.assertEqual(sorted(masked.index), sorted(expected.index))
+        self.assertEqual(sorted(raw[latest_revision_mask(raw, "Teklif_No")].index), sorted(expected.index))
+
+        # Dönem dilimi: Kok_No/Rev_No ile hızlı yol, ayrıştırmalı yol ile aynı satırlar
+        piece = df[df["Tarih"].str.endswith(".2025")]
+        fast = filter_latest_revisions(piece, "Teklif_No")
+        slow = filter_latest_revisions(piece.drop(columns=["Kok_No", "Rev_No", "Is_Latest_Rev"]), "Teklif_No")
+        self.assertEqual(fast.index.tolist(), slow.index.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
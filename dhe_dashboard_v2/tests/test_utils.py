@@ -11,8 +11,19 @@ from core.utils import (
     tr_upper, 
     tr_lower,
     get_exchange_rate,
-    calculate_delta
+    calculate_delta,
+    parse_rate_table,
+    rate_table_from_map,
+    lookup_rates,
+    tr_upper_series,
+    tr_lower_series,
+    collapse_spaces_series,
+    normalize_name_series
 )
+from core.transforms import normalize_personel_name
+from core.bellis_loader import normalize_city_name, normalize_city_names
+import numpy as np
+import pandas as pd
 
 class TestUtils(unittest.TestCase):
     
@@ -46,6 +57,21 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(tr_lower("İSTANBUL"), "istanbul")
         self.assertEqual(tr_lower("ÇORUM"), "çorum")
 
+    def test_turkish_series_parity(self):
+        """Vektörize Türkçe işlemler tekil fonksiyonlarla aynı sonucu vermeli."""
+        values = pd.Series(["izmir", "IĞDIR", "İstanbul", "ışık", "çanakkale", "Şule öz",
+                            "  ali   veli ", "ali\u00a0veli", "nan", "", None, np.nan, 12],
+                           index=range(3, 16))
+        texts = ["" if pd.isna(v) else str(v) for v in values]
+        self.assertEqual(tr_upper_series(values).tolist(), [tr_upper(t) for t in texts])
+        self.assertEqual(tr_lower_series(values).tolist(), [tr_lower(t) for t in texts])
+        self.assertEqual(collapse_spaces_series(values).tolist(), [" ".join(t.split()) for t in texts])
+        self.assertEqual(normalize_name_series(values).tolist(), [normalize_personel_name(v) for v in values])
+        self.assertTrue(tr_upper_series(values).index.equals(values.index))
+
+        cities = pd.Series(["mersın", "Mersin ", "istanbul", "IZMIR", "afyon", None])
+        self.assertEqual(normalize_city_names(cities).tolist(), [normalize_city_name(c) for c in cities])
+
     def test_calculate_delta(self):
         """Yüzdesel değişim hesaplamasını test eder."""
         self.assertEqual(calculate_delta(150, 100), 50.0)   # %50 Artış
@@ -68,5 +94,34 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(get_exchange_rate("XYZ", 2024), 0.0)
         self.assertEqual(get_exchange_rate(None, 2024), 0.0)
 
+    def test_parse_rate_table(self):
+        """kurlar sekmesi: virgüllü değerler, alternatif sütun adları, boş/bozuk hücreler."""
+        df = pd.DataFrame({
+            " Yıl ": ["2024", "2024", "2024", "", "2024", "2024"],
+            "AY": ["1", "2", "3", "4", "5", "2"],
+            "EUR": ["1", "1", "1", "1", "1", "1"],
+            "USD": ["0,92", "", "abc", "0,9", "0.91", "0,95"],
+            "Sterlin": ["1,17", "1,18", "1,18", "1,18", "1,19", "1,18"],
+            "TL": ["0,029", "0,028", "0,027", "0,026", " 0,025 ", "0,028"],
+        })
+        table = parse_rate_table(df)
+        self.assertEqual(table[(2024, 1, "USD")], 0.92)
+        self.assertEqual(table[(2024, 1, "GBP")], 1.17)
+        self.assertEqual(table[(2024, 2, "USD")], 0.95)  # Tekrar eden ay: sonuncusu
+        self.assertEqual(table[(2024, 5, "TRY")], 0.025)  # TRY = TL
+        self.assertNotIn((2024, 3, "USD"), table.index)  # Bozuk satır atlanır
+        self.assertEqual(len(table), 3 * 5)
+        self.assertTrue(parse_rate_table(pd.DataFrame()).empty)
+
+    def test_lookup_rates(self):
+        """Aylık kur, yoksa yıllık ortalama (bilinmeyen yıl -> son yıl)."""
+        table = rate_table_from_map({(2024, 1, "USD"): 0.5})
+        rates = lookup_rates(pd.Series([2024, 2024, 1990, 2024]), pd.Series([1, 2, 1, 1]),
+                             pd.Series(["USD", "USD", "GBP", "EUR"]), table)
+        self.assertEqual(rates.tolist(), [0.5, get_exchange_rate("USD", 2024), get_exchange_rate("GBP", 1990), 1.0])
+        # Boş tablo -> tamamen yıllık ortalama
+        empty = lookup_rates(pd.Series([2025]), pd.Series([3]), pd.Series(["TL"]), rate_table_from_map({}))
+        self.assertEqual(empty.tolist(), [get_exchange_rate("TL", 2025)])
+
 if __name__ == '__main__':
     unittest.main()
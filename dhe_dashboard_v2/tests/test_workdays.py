@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from core.workdays import WorkdayCalendar, get_workday_calendar, normalize_holidays, period_bounds
+
+
+def brute_count(start, end, holidays):
+    """Gün gün sayım (referans)."""
+    days = pd.date_range(start, end)
+    return sum(1 for d in days if d.dayofweek < 5 and d.date() not in holidays)
+
+
+class TestWorkdayCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.holidays = {date(2025, 1, 1), date(2025, 4, 23), date(2025, 5, 1), date(2025, 10, 29)}
+        self.calendar = WorkdayCalendar(self.holidays, start="2024-01-01", end="2026-12-31")
+
+    def test_range_counts(self):
+        self.assertEqual(self.calendar.count(date(2025, 1, 1), date(2025, 1, 31)), 22)  # 23 hafta içi - 1 Ocak
+        self.assertEqual(self.calendar.count("2025-01-04", "2025-01-05"), 0)  # Hafta sonu
+        self.assertEqual(self.calendar.count("2025-01-31", "2025-01-01"), 0)  # Ters aralık
+        self.assertEqual(self.calendar.count(None, "2025-01-31"), 0)
+
+        rng = random.Random(7)
+        for _ in range(200):
+            start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 1000))
+            end = start + timedelta(days=rng.randint(0, 120))
+            self.assertEqual(self.calendar.count(start, end), brute_count(start, end, self.holidays))
+
+    def test_span_extends(self):
+        self.assertEqual(self.calendar.count("2030-03-01", "2030-03-31"),
+                         brute_count("2030-03-01", "2030-03-31", self.holidays))
+        self.assertEqual(self.calendar.span, (date(2024, 1, 1), date(2030, 3, 31)))
+        self.assertEqual(self.calendar.count("2025-01-01", "2025-01-31"), 22)  # Eski aralık değişmez
+
+    def test_vectorized_effective_workdays(self):
+        starts = pd.Series(pd.to_datetime(["2025-01-15", None, "2024-06-01", "2025-03-01"]))
+        ends = [None, "2025-01-10", None, "2025-02-01"]  # Son kişi dönem bitmeden başlamamış -> 0
+        result = self.calendar.effective_workdays(2025, 1, starts, ends, until_today=False)
+        self.assertEqual(result.tolist(), [
+            brute_count("2025-01-15", "2025-01-31", self.holidays),
+            brute_count("2025-01-01", "2025-01-10", self.holidays),
+            22, 0,
+        ])
+        self.assertEqual(self.calendar.period_workdays(2025, until_today=False),
+                         brute_count("2025-01-01", "2025-12-31", self.holidays))
+
+    def test_helpers(self):
+        holidays = normalize_holidays([date(2025, 5, 1), "01.05.2025", "2025-01-01", pd.Timestamp("2025-04-23"), "x", None])
+        self.assertEqual(holidays.tolist(), [date(2025, 1, 1), date(2025, 4, 23), date(2025, 5, 1)])
+        self.assertEqual(period_bounds(2024, 2, until_today=False),
+                         (np.datetime64("2024-02-01"), np.datetime64("2024-02-29")))
+        self.assertEqual(self.calendar.is_workday(["2025-01-01", "2025-01-02", "2025-01-04", None]).tolist(),
+                         [False, True, False, False])
+
+        # Aynı tatil seti -> aynı takvim nesnesi
+        self.assertIs(get_workday_calendar(self.holidays), get_workday_calendar(set(self.holidays)))
+
+
+if __name__ == '__main__':
+    unittest.main()
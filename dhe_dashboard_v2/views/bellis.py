@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 from typing import Dict
 
 from core.bellis_loader import load_bellis_data, load_sehirler_data, prepare_bellis_summary
+from core.query import query
 from config.city_coordinates import SERVICE_PROVIDER_COLORS, TURKEY_REGIONS
 from components.cards import render_kpi_card
 
@@ -261,7 +262,7 @@ def render_region_chart(df: pd.DataFrame):
         return
     
     # Bölge özeti
-    region_summary = df.groupby("Bolge_Ad").agg(
+    region_summary = df.groupby("Bolge_Ad", observed=True).agg(
         Toplam=("Musteri", "count"),
         DHE=("Servisci", lambda x: (x == "DHE").sum())
     ).reset_index()
@@ -364,13 +365,7 @@ def render_detail_table(df: pd.DataFrame):
         search_term = st.text_input("Müşteri Ara", key="bellis_search")
     
     # Filtreleme
-    df_filtered = df.copy()
-    
-    if selected_servisci != "Tümü":
-        df_filtered = df_filtered[df_filtered["Servisci"] == selected_servisci]
-    
-    if selected_bolge != "Tümü":
-        df_filtered = df_filtered[df_filtered["Bolge_Ad"] == selected_bolge]
+    df_filtered = query(df, {"Servisci": selected_servisci, "Bolge_Ad": selected_bolge})
     
     if search_term:
         df_filtered = df_filtered[
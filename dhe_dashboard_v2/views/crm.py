@@ -5,18 +5,23 @@ Tab yapısı ile dönem bazlı müşteri analizi.
 """
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 from components.cards import render_kpi_card
 from components.layout import spacer, section_title
-from config.constants import COLORS
+from config.constants import COLORS, CUSTOMER_ANALYTICS_CONFIG
+from core.memo import memoize_view
 
-def render_crm_page(df_crm: pd.DataFrame, df_teklif: pd.DataFrame, df_siparis: pd.DataFrame):
-    """Müşteri Takip - Tab yapısı ile dönem bazlı görünüm."""
+def render_crm_page(df_analiz: pd.DataFrame, df_teklif: pd.DataFrame, df_siparis: pd.DataFrame,
+                    data_packet: dict = None):
+    """
+    Müşteri Takip - Tab yapısı ile dönem bazlı görünüm.
+    df_analiz: Müşteri analitik tablosu (data_packet["musteri_analiz"], core.customer_analytics).
+    Sekme tabloları (paket sürümü, sekme, arama, personel) anahtarıyla önbellekten gelir (core.memo).
+    """
     
     # HEADER
     section_title("MÜŞTERİ TAKİP", margin_top="0rem", show_border=False, margin_bottom="0.5rem")
     
-    if df_crm.empty:
+    if df_analiz.empty:
         st.warning("Müşteri verileri yüklenemedi.")
         return
 
@@ -24,66 +29,15 @@ def render_crm_page(df_crm: pd.DataFrame, df_teklif: pd.DataFrame, df_siparis: p
     # VERİ HESAPLAMALARI
     # =========================================================================
     
-    # Segment güncelleme - emoji yerine temiz metin
-    def clean_segment(seg):
-        if pd.isna(seg):
-            return "Diğer"
-        seg = str(seg)
-        if "VIP" in seg:
-            return "Öncelikli"
-        elif "Gold" in seg:
-            return "Düzenli"
-        elif "Standart" in seg:
-            return "Ara Sıra"
-        elif "Potansiyel" in seg:
-            return "Potansiyel"
-        elif "Pasif" in seg:
-            return "Uyuyan"
-        return "Diğer"
-    
-    df_crm = df_crm.copy()
-    df_crm["Segment_Clean"] = df_crm["Segment"].apply(clean_segment)
-    
-    # Müşterileri 4 gruba ayır - SADECE AY BAZLI
-    # Kritik: 24+ ay (730+ gün)
-    # Pasife Dönük: 12-24 ay (365-730 gün)
-    # İzlemede: 6-12 ay (180-365 gün)
-    # Aktif: 0-6 ay (0-180 gün)
-
-    # 1. Kritik (24+ Ay)
-    df_kritik = df_crm[
-        (df_crm["Recency_Days"] >= 730) & 
-        (df_crm["Total_Teklif_EUR"] > 0)
-    ].copy()
-    
-    # 2. Pasife Dönük (12-24 Ay)
-    df_pasif = df_crm[
-        (df_crm["Recency_Days"] >= 365) & 
-        (df_crm["Recency_Days"] < 730) &
-        (df_crm["Total_Teklif_EUR"] > 0)
-    ].copy()
-    
-    # 3. İzlemede (6-12 Ay)
-    df_izleme = df_crm[
-        (df_crm["Recency_Days"] >= 180) & 
-        (df_crm["Recency_Days"] < 365) &
-        (df_crm["Total_Teklif_EUR"] > 0)
-    ].copy()
-    
-    # 4. Aktif (0-6 Ay)
-    df_aktif = df_crm[
-        (df_crm["Recency_Days"] < 180) &
-        (df_crm["Total_Teklif_EUR"] > 0)
-    ].copy()
-    
-    # Sıralama
-    df_kritik = df_kritik.sort_values("Total_Teklif_EUR", ascending=False)
-    df_pasif = df_pasif.sort_values("Total_Teklif_EUR", ascending=False)
-    df_izleme = df_izleme.sort_values("Total_Teklif_EUR", ascending=False)
-    df_aktif = df_aktif.sort_values("Total_Teklif_EUR", ascending=False)
+    # Recency grupları paketle birlikte hesaplanır (SADECE AY BAZLI, teklif hacmi olan müşteriler):
+    # Aktif: 0-6 ay | İzlemede: 6-12 ay | Pasife Dönük: 12-24 ay | Kritik: 24+ ay
+    # Tablo teklif hacmine göre azalan sıralıdır; burada sadece maske ile bölünür.
+    recency_labels = CUSTOMER_ANALYTICS_CONFIG["RECENCY_LABELS"]
+    grup = df_analiz["Recency_Grubu"]
+    df_aktif, df_izleme, df_pasif, df_kritik = (df_analiz[grup == label] for label in recency_labels)
     
     # KPI Kartları
-    toplam_musteri = len(df_crm[df_crm["Total_Teklif_EUR"] > 0])
+    toplam_musteri = int(grup.notna().sum())
     # Aktif müşteri: Son 1 yıl (0-6 + 6-12 ay)
     aktif_musteri_sayisi = len(df_aktif) + len(df_izleme)
     
@@ -112,12 +66,7 @@ def render_crm_page(df_crm: pd.DataFrame, df_teklif: pd.DataFrame, df_siparis: p
     # =========================================================================
     # TAB YAPISI
     # =========================================================================
-    tab_aktif, tab_izleme, tab_pasif, tab_kritik = st.tabs([
-        "0-6 AY", 
-        "6-12 AY", 
-        "12-24 AY",
-        "24+ AY"
-    ])
+    tab_aktif, tab_izleme, tab_pasif, tab_kritik = st.tabs(recency_labels)
     
     # Tab CSS
     # Tab CSS Injection
@@ -159,50 +108,46 @@ def render_crm_page(df_crm: pd.DataFrame, df_teklif: pd.DataFrame, df_siparis: p
             st.info("Bu dönemde müşteri bulunamadı.")
             return
             
-        # Arama filtresi
-        df_filtered = df.copy()
-        
-        if search_term:
-            df_filtered = df_filtered[df_filtered["Musteri"].str.contains(search_term, case=False, na=False)]
-            
-        # Personel Filtresi
-        if selected_personnel != "Tümü" and "Sorumlu_Clean" in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered["Sorumlu_Clean"] == selected_personnel]
+        def build_display():
+            # Arama filtresi (maskeler birleştirilir, ara kopya yok)
+            mask = pd.Series(True, index=df.index)
+            if search_term:
+                mask &= df["Musteri"].str.contains(search_term, case=False, na=False)
+                
+            # Personel Filtresi
+            if selected_personnel != "Tümü":
+                mask &= df["Sorumlu_Clean"] == selected_personnel
+                
+            df_filtered = df[mask]
             
-        if df_filtered.empty:
+            # Tablo formatında göster (RFM / dönüşüm / CLV paketle birlikte hesaplı)
+            return df_filtered[["Musteri", "Sorumlu_Clean", "Son_Teklif_No", "Son_Teklif_Tutar", "RFM_Kod", "CLV_Tahmini"]].assign(
+                Son_Islem=df_filtered["Son_Teklif_Tarihi"].dt.strftime("%d.%m.%Y"),
+                Donusum=df_filtered["Donusum_Orani"] * 100,
+            )[["Musteri", "Sorumlu_Clean", "Son_Teklif_No", "Son_Teklif_Tutar", "Son_Islem", "RFM_Kod", "Donusum", "CLV_Tahmini"]]
+        
+        df_display = memoize_view(data_packet, "crm_tablo", (period_label, search_term, selected_personnel), build_display)
+        if df_display.empty:
             st.info("Arama kriterlerine uygun müşteri bulunamadı.")
             return
         
-        count = len(df_filtered)
+        count = len(df_display)
         
         # Başlık
         st.markdown(f'<div style="font-size:1rem; font-weight:600; margin-bottom:12px; color:{color};">{count} Müşteri Listeleniyor</div>', unsafe_allow_html=True)
-        
-        # Tablo formatında göster
-        df_display = df_filtered.copy()
-        
-        df_display["Son_Islem"] = df_display["Son_Teklif_Tarihi"].dt.strftime("%d.%m.%Y")
-        
-        # Son Teklif Detayları (NaN kontrolü)
-        if "Son_Teklif_No" not in df_display.columns:
-            df_display["Son_Teklif_No"] = "-"
-            df_display["Son_Teklif_Tutar"] = 0
-            
-        df_display["Teklif_Fmt"] = df_display["Total_Teklif_EUR"]
-        
-        if "Sorumlu_Clean" in df_display.columns:
-            df_display["Sorumlu_Display"] = df_display["Sorumlu_Clean"]
-        else:
-            df_display["Sorumlu_Display"] = "-"
             
         st.dataframe(
-            df_display[["Musteri", "Sorumlu_Display", "Son_Teklif_No", "Son_Teklif_Tutar", "Son_Islem"]],
+            df_display,
             column_config={
                 "Musteri": st.column_config.TextColumn("Firma Ünvanı", width="large"),
-                "Sorumlu_Display": st.column_config.TextColumn("Sorumlu", width="small"),
+                "Sorumlu_Clean": st.column_config.TextColumn("Sorumlu", width="small"),
                 "Son_Teklif_No": st.column_config.TextColumn("Son Teklif No", width="small"),
                 "Son_Teklif_Tutar": st.column_config.NumberColumn("Son Tutar", format="€%.0f", width="small"),
                 "Son_Islem": st.column_config.TextColumn("Son Tarih", width="small"),
+                "RFM_Kod": st.column_config.TextColumn("RFM", width="small", help="Recency / Frequency / Monetary (1-5)"),
+                "Donusum": st.column_config.NumberColumn("Dönüşüm", format="%.0f%%", width="small"),
+                "CLV_Tahmini": st.column_config.NumberColumn("CLV", format="€%.0f", width="small",
+                                                             help=f"{CUSTOMER_ANALYTICS_CONFIG['CLV_YEARS']} yıllık değer projeksiyonu"),
             },
             hide_index=True,
             height=350,
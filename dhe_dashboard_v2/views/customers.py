@@ -11,9 +11,9 @@ def render_musteri(df_musteri: pd.DataFrame, df_all_quotes: pd.DataFrame = None,
         return
 
     # Veri Tutarlılığı: Sahipsiz müşteri analizinde de NET teklif sayısını baz alalım
-    from core.transforms import filter_latest_revisions
+    from core.transforms import latest_revision_mask
     if df_all_quotes is not None and not df_all_quotes.empty:
-         df_all_quotes = filter_latest_revisions(df_all_quotes, "Teklif_No")
+         df_all_quotes = df_all_quotes[latest_revision_mask(df_all_quotes, "Teklif_No")]
     
     # Tema Kontrolü
     theme = st.session_state.get("theme", "light")
@@ -4,25 +4,36 @@ import pandas as pd
 from datetime import datetime
 from config.constants import AY_MAP, PERSONEL_MAP
 from core.utils import get_exchange_rate
-from core.transforms import filter_latest_revisions
+from core.memo import memoize_view
+from core.sales_cube import (
+    build_sales_cube, cube_years, period_totals, personnel_totals, period_rows
+)
 from components.layout import spacer
 from components.dashboard_financials import render_financial_summary_tab, render_conversion_analysis_tab
 from components.dashboard_charts import render_yearly_performance_chart
 
-def render_integrated_dashboard(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_all_quotes: pd.DataFrame = None):
+def render_integrated_dashboard(df_teklif: pd.DataFrame, df_siparis: pd.DataFrame, df_all_quotes: pd.DataFrame = None,
+                                data_packet: dict = None):
     """
     Birleştirilmiş Teknik Ofis Performansı ve Detaylı Analiz Sayfası.
     Tab yapısı ile Özet ve Detay görünümlerini ayırır.
+    Kartlar ve yıllık grafik yüklemede hazırlanan satış küpünden (data_packet["satis_kupu"]) okunur.
+    Dönem toplamları ve detay tablosu (paket sürümü, filtre) anahtarıyla önbellekten gelir (core.memo).
     """
     if df_all_quotes is None:
-        df_all_quotes = df_teklif.copy() # Fallback
+        df_all_quotes = df_teklif # Fallback
+
+    # Satış küpü (eski snapshot'ta yoksa burada kurulur)
+    cube = (data_packet or {}).get("satis_kupu")
+    if cube is None:
+        cube = memoize_view(data_packet, "servis_kupu", (), lambda: build_sales_cube(df_siparis, df_all_quotes))
 
     # --- ORTAK FİLTRE VE AYARLAR ---
     now = datetime.now()
     current_year = now.year
     current_month = now.month
     
-    available_years = sorted(df_siparis["Yil"].dropna().unique().astype(int).tolist(), reverse=True)
+    available_years = cube_years(cube, "siparis")
     if not available_years: available_years = [current_year]
     available_years = [y for y in available_years if 2017 <= y <= 2030]
     if not available_years: available_years = [current_year]
@@ -46,51 +57,33 @@ def render_integrated_dashboard(df_teklif: pd.DataFrame, df_siparis: pd.DataFram
         target_currency = st.radio("PARA BİRİMİ", ["EUR", "GBP", "TL"], index=0, horizontal=True, key="int_dash_pb")
 
     with c_view:
-        # view_mode = st.radio("VERİ DURUMU", ["Net", "Tümü"], index=0, horizontal=True, key="int_dash_view_mode", help="Net: Sadece en güncel revizyonları gösterir.\nTümü: Tüm revizyonları dahil eder.")
         # ARTIK DEFAULT OLARAK HER ZAMAN NET (REVİZYONSUZ/GÜNCEL) GÖSTERİYORUZ
         st.markdown("<div style='padding-top: 10px; font-size: 0.8rem; color: gray;'>*Sadece en güncel revizyonlar gösterilmektedir.</div>", unsafe_allow_html=True)
-        view_mode = "Net" # Sabitliyoruz
-
-    # --- FİLTRELEME MANTIĞI (GLOBA REVİZYON - İPTAL) ---
-    # Eski mantık: Tüm datada en son revizyonu alıyordu. Bu da Ocak ayındaki teklifin Şubat revizyonu varsa Ocak'ta görünmemesine yol açıyordu.
-    # Yeni mantık: Revizyon filtresini dönem bazlı uygulayacağız.
-    # if view_mode == "Net":
-    #     df_siparis = filter_latest_revisions(df_siparis, "Siparis_No")
-    #     df_teklif = filter_latest_revisions(df_teklif, "Teklif_No")
-    #     df_all_quotes = filter_latest_revisions(df_all_quotes, "Teklif_No")
-    
-    # Chart İçin Global Net Data (Grafiklerde "şu anki durum" mantığı devam edebilir veya değişebilir)
-    # Şimdilik grafik için ayrı bir set tutalım:
-    df_siparis_chart = df_siparis.copy()
-    if view_mode == "Net":
-        df_siparis_chart = filter_latest_revisions(df_siparis_chart, "Siparis_No")
 
-    # Veri Hazırlığı
-    df_sip_years = df_siparis[df_siparis["Yil"].isin(selected_years)].copy()
-    df_tek_years = df_teklif[df_teklif["Yil"].isin(selected_years)].copy()
-    df_all_years = df_all_quotes[df_all_quotes["Yil"].isin(selected_years)].copy()
-    
+    # --- DÖNEM VE REVİZYON MANTIĞI ---
+    # "Net" görünümde revizyonlar SEÇİLİ DÖNEM içinde tekilleştirilir (küpte _Net_Ay / _Net_Yil kapsamları):
+    # Ocak ayında Teklif A, Şubat'ta A-R1 varsa Ocak seçildiğinde A görünür ("o tarihteki görüntü").
+    # Yıllık grafik tüm geçmişe göre net kapsamı (_Net) kullanır.
+    month = None
     if selected_period != "Tüm Yıl":
-        months = [[k for k, v in AY_MAP.items() if v == selected_period][0]]
-        df_sip_filtered = df_sip_years[df_sip_years["Ay"].isin(months)].copy()
-        df_tek_filtered = df_tek_years[df_tek_years["Ay"].isin(months)].copy()
-        df_all_filtered = df_all_years[df_all_years["Ay"].isin(months)].copy()
+        month = [k for k, v in AY_MAP.items() if v == selected_period][0]
         filter_label = f"{selected_period} ({', '.join(map(str, sorted(selected_years)))})"
     else:
-        df_sip_filtered = df_sip_years.copy()
-        df_tek_filtered = df_tek_years.copy()
-        df_all_filtered = df_all_years.copy()
         filter_label = f"Tüm Dönem ({', '.join(map(str, sorted(selected_years)))})"
 
-    # --- REVİZYON FİLTRESİ (LOCAL - SEÇİLİ DÖNEM İÇİN) ---
-    # "Net" modunda, SADECE o dönem içinde tekrarlayan revizyonları temizle.
-    # Böylece Ocak ayında Teklif A varsa ve Şubat'ta A-R1 varsa:
-    # Ocak seçildiğinde: A görünür (Çünkü o dönemde tek).
-    # Bu mantık "O tarihteki görüntü"yü verir.
-    if view_mode == "Net":
-        df_sip_filtered = filter_latest_revisions(df_sip_filtered, "Siparis_No")
-        df_tek_filtered = filter_latest_revisions(df_tek_filtered, "Teklif_No")
-        df_all_filtered = filter_latest_revisions(df_all_filtered, "Teklif_No")
+    # Seçili ve bir önceki yılın aynı dönemi (delta kartları) tek önbellek kaydında
+    def build_period():
+        return {
+            "siparis_totals": period_totals(cube, "siparis", selected_year_val, month),
+            "teklif_totals": period_totals(cube, "all_quotes", selected_year_val, month),
+            "siparis_perf": personnel_totals(cube, "siparis", selected_year_val, month),
+            "teklif_perf": personnel_totals(cube, "all_quotes", selected_year_val, month),
+            "prev_siparis": period_totals(cube, "siparis", selected_year_val - 1, month),
+            "prev_teklif": period_totals(cube, "all_quotes", selected_year_val - 1, month),
+        }
+    period = memoize_view(data_packet, "servis_donem", (selected_year_val, month), build_period)
+    siparis_totals, teklif_totals = period["siparis_totals"], period["teklif_totals"]
+    siparis_perf, teklif_perf = period["siparis_perf"], period["teklif_perf"]
 
     # Kur Dönüşümü
     max_selected_year = max(selected_years) if selected_years else 2025
@@ -106,46 +99,24 @@ def render_integrated_dashboard(df_teklif: pd.DataFrame, df_siparis: pd.DataFram
     # --- TAB YAPISI ---
     tab_finansal, tab_teklif_siparis, tab_detay = st.tabs(["FİNANSAL", "SİPARİŞ / TEKLİF", "DETAYLI İŞLEM KAYITLARI"])
     
-    # Geçmiş Veri (Delta Hesaplaması)
-    previous_values = None
-    if len(selected_years) == 1:
-        current_sel_year = selected_years[0]
-        prev_year = current_sel_year - 1
-        
-        # Sadece bir önceki yılın verisini al
-        df_sip_prev = df_siparis[df_siparis["Yil"] == prev_year].copy()
-        # df_tek_prev = df_teklif[df_teklif["Yil"] == prev_year].copy() # Old: Open quotes
-        df_all_prev = df_all_quotes[df_all_quotes["Yil"] == prev_year].copy() # New: All quotes
-        
-        # Eğer spesifik bir ay seçiliyse, o ayın önceki yılına bak
-        if selected_period != "Tüm Yıl":
-             months = [[k for k, v in AY_MAP.items() if v == selected_period][0]]
-             df_sip_prev = df_sip_prev[df_sip_prev["Ay"].isin(months)]
-             # df_tek_prev = df_tek_prev[df_tek_prev["Ay"].isin(months)]
-             df_all_prev = df_all_prev[df_all_prev["Ay"].isin(months)]
-        
-        # Delta için de filtre (Mevcut dönem "Net" ise geçmiş dönem de "Net" olmalı ki elma-elma kıyaslansın)
-        if view_mode == "Net":
-            df_sip_prev = filter_latest_revisions(df_sip_prev, "Siparis_No")
-            df_all_prev = filter_latest_revisions(df_all_prev, "Teklif_No")
-
-        previous_values = {
-            "total_ciro": df_sip_prev["Tutar_EUR"].sum(),
-            "total_kar": df_sip_prev["Kar_EUR"].sum(),
-            "total_siparis": len(df_sip_prev),
-            "total_teklif": len(df_all_prev) # Using total quotes for comparison
-        }
+    # Geçmiş Veri (Delta Hesaplaması): bir önceki yılın aynı dönemi, aynı "Net" kapsamıyla
+    prev_siparis, prev_teklif = period["prev_siparis"], period["prev_teklif"]
+    previous_values = {
+        "total_ciro": prev_siparis["Tutar_EUR"],
+        "total_kar": prev_siparis["Kar_EUR"],
+        "total_siparis": prev_siparis["Adet"],
+        "total_teklif": prev_teklif["Adet"] # Using total quotes for comparison
+    }
 
     with tab_finansal:
-        render_financial_summary_tab(df_sip_filtered, df_tek_filtered, selected_years, selected_period, sym, conversion_factor, previous_values, df_all_filtered=df_all_filtered)
+        render_financial_summary_tab(siparis_totals, teklif_totals, siparis_perf, sym, conversion_factor, previous_values)
         
         # Grafikler (Tüm yıllar)
-        all_available_years = sorted(df_siparis["Yil"].dropna().unique().astype(int).tolist(), reverse=True)
-        all_available_years = [y for y in all_available_years if 2017 <= y <= 2030]
-        render_yearly_performance_chart(df_siparis_chart, all_available_years, conversion_factor, sym)
+        all_available_years = [y for y in cube_years(cube, "siparis") if 2017 <= y <= 2030]
+        render_yearly_performance_chart(cube, all_available_years, conversion_factor, sym, data_packet=data_packet)
 
     with tab_teklif_siparis:
-        render_conversion_analysis_tab(df_sip_filtered, df_tek_filtered, filter_label, df_all_filtered=df_all_filtered)
+        render_conversion_analysis_tab(siparis_totals, teklif_totals, siparis_perf, teklif_perf, filter_label)
 
     with tab_detay:
         spacer(16)
@@ -164,22 +135,36 @@ def render_integrated_dashboard(df_teklif: pd.DataFrame, df_siparis: pd.DataFram
         
         spacer(10)
         
-        df_table = df_sip_filtered.copy() if durum_secimi == "Sipariş" else df_tek_filtered.copy()
-        
-        if secilen_personel != "Tümü":
-            df_table = df_table[df_table["Personel_Adi"] == secilen_personel]
+        # Kayıt tablosu satır düzeyinde: dönem dilimi + yüklemede hesaplanan dönem revizyon bayrağı
+        def build_table():
+            if durum_secimi == "Sipariş":
+                df_table = period_rows(df_siparis, selected_year_val, month, "Siparis_No")
+            else:
+                df_table = period_rows(df_teklif, selected_year_val, month, "Teklif_No")
             
-        if arama_metni:
-            df_table = df_table[df_table["Musteri"].str.lower().str.contains(arama_metni.lower(), na=False)]
+            if secilen_personel != "Tümü":
+                df_table = df_table[df_table["Personel_Adi"] == secilen_personel]
+                
+            if arama_metni:
+                df_table = df_table[df_table["Musteri"].str.lower().str.contains(arama_metni.lower(), na=False)]
+                
+            if df_table.empty:
+                return df_table
+            df_table = df_table.sort_values("Tarih", ascending=False, kind="stable")
+            return df_table.assign(
+                Tarih_Str=df_table["Tarih"].dt.strftime("%d.%m.%Y"),
+                Gosterim_Tutar=df_table["Tutar_EUR"] * conversion_factor,
+                Gosterim_Maliyet=df_table["Maliyet_EUR"] * conversion_factor,
+            )[["Tarih_Str", "Teklif_No", "Musteri", "Personel_Adi", "Gosterim_Tutar", "Gosterim_Maliyet"]]
+        
+        df_table = memoize_view(
+            data_packet, "servis_detay",
+            (durum_secimi, selected_year_val, month, secilen_personel, arama_metni, conversion_factor),
+            build_table)
             
         if not df_table.empty:
-            df_table = df_table.sort_values("Tarih", ascending=False)
-            df_table["Tarih_Str"] = df_table["Tarih"].dt.strftime("%d.%m.%Y")
-            df_table["Gosterim_Tutar"] = df_table["Tutar_EUR"] * conversion_factor
-            df_table["Gosterim_Maliyet"] = df_table["Maliyet_EUR"] * conversion_factor
-            
             st.dataframe(
-                df_table[["Tarih_Str", "Teklif_No", "Musteri", "Personel_Adi", "Gosterim_Tutar", "Gosterim_Maliyet"]],
+                df_table,
                 column_config={
                     "Tarih_Str": "Tarih",
                     "Teklif_No": "Belge No",
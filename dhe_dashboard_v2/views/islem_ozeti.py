@@ -1,7 +1,7 @@
 
 import streamlit as st
 import pandas as pd
-from core.utils import tr_upper
+from core.utils import tr_upper, tr_upper_series
 from components import styles
 from components.layout import section_title
 from components.charts import render_chartjs
@@ -50,9 +50,9 @@ def prepare_islem_ozeti_data(df_saha, personnel_name="YÜKSEL"):
         # tr_upper kullanarak Türkçe karakter uyumlu filtreleme
         search_term = tr_upper(personnel_name)
         
-        # Lambda fonksiyonu ile her satırı kontrol et
-        mask = df_saha[target_col].astype(str).apply(lambda x: search_term in tr_upper(x))
-        filtered_df = df_saha[mask].copy()
+        # Sütun bazlı (vektörize) içerir kontrolü
+        mask = tr_upper_series(df_saha[target_col]).str.contains(search_term, regex=False)
+        filtered_df = df_saha[mask]
     else:
         return pd.DataFrame() # Hata durumunda boş dön
 
@@ -70,15 +70,12 @@ def prepare_islem_ozeti_data(df_saha, personnel_name="YÜKSEL"):
     if not process_col:
         return pd.DataFrame()
 
-    filtered_df['Kategori'] = filtered_df[process_col].apply(clean_action_type)
-    
-    # Tarih formatlama
-    if 'Tarih' in filtered_df.columns:
-        filtered_df['Tarih'] = pd.to_datetime(filtered_df['Tarih'], dayfirst=True)
+    # Yeni sütunlar assign ile: süzülen dilim paket tablosunu kopyalamadan genişletilir
+    filtered_df = filtered_df.assign(Kategori=filtered_df[process_col].apply(clean_action_type))
     
     # Yıl Kolonu (Yoksa oluştur)
     if 'Yil' not in filtered_df.columns:
-        filtered_df['Yil'] = filtered_df['Tarih'].dt.year
+        filtered_df = filtered_df.assign(Yil=filtered_df['Tarih'].dt.year)
 
     # 4. GRUPLAMA (TÜM VERİ İÇİN)
     grouped_rows = []
@@ -86,7 +83,7 @@ def prepare_islem_ozeti_data(df_saha, personnel_name="YÜKSEL"):
     # Sıralama: Müşteri, Kategori, Tarih
     filtered_df = filtered_df.sort_values(by=['Müşteri', 'Kategori', 'Tarih'])
 
-    for (musteri, kategori), group in filtered_df.groupby(['Müşteri', 'Kategori']):
+    for (musteri, kategori), group in filtered_df.groupby(['Müşteri', 'Kategori'], observed=True):
         group = group.sort_values('Tarih')
         
         group['prev_date'] = group['Tarih'].shift(1)
@@ -240,7 +237,7 @@ def render_islem_ozeti_page(data_packet=None):
         datasets_days = []
         for idx, year in enumerate(sorted(target_years)):
             color_set = year_colors[idx % len(year_colors)]
-            df_year = grouped_df[grouped_df["Yil"] == year].copy()
+            df_year = grouped_df[grouped_df["Yil"] == year]
             
             if df_year.empty:
                 year_values = [0] * 12